@@ -0,0 +1,274 @@
+"""
+Benchmarks del motor del tablero con archivos sintéticos (generador_datos.py).
+
+Para cada escala (filas del archivo de stock) mide en frío, con los caches vacíos, el tiempo
+de cada etapa:
+    ingesta_stock        lectura, limpieza y filtrado del CSV de stock
+    ingesta_stock_cache  la misma carga desde el cache en disco (Parquet)
+    ingesta_ventas       lectura del CSV de ventas
+    consolidacion        tabla consolidada de todas las ligas, sin ventas
+    cruce_ventas         columnas de ventas sobre la tabla ya consolidada (totales y formato)
+    mvp                  tabla de MVPs real vs óptimo
+    excel_consolidado, excel_distribuciones, excel_mvp   exportaciones a Excel
+    region_secuencial    vista regional (todos los países a la misma escala), un país tras otro
+    region_paralelo      la misma vista con procesar_region (un proceso por país)
+
+Cada etapa se repite --repeticiones veces y se reporta la mediana. Los archivos generados
+se guardan en .benchmark/datos y se reutilizan; los caches en disco del motor se redirigen
+a una carpeta temporal, así que el benchmark no toca los del tablero.
+
+Uso:
+    python benchmark.py [--filas 10000 100000 1000000] [--pais Guatemala] [--repeticiones 3]
+        [--linea-base .benchmark/linea_base.json] [--guardar-linea-base] [--tolerancia 0.20] [--sin-region]
+
+Cada ejecución se agrega a .benchmark/historial.jsonl. Si existe la línea base, se compara
+etapa por etapa y el proceso termina con código 1 cuando alguna es más lenta que la línea
+base por encima de la tolerancia (y de MARGEN_MINIMO_SEGUNDOS, para no marcar ruido).
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import generador_datos
+import motor
+
+logger = logging.getLogger("benchmark")
+
+DIRECTORIO_BENCHMARK = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".benchmark")
+ESCALAS_PREDETERMINADAS = [10_000, 100_000, 1_000_000]
+# Diferencias menores que esto no cuentan como regresión aunque superen la tolerancia relativa
+MARGEN_MINIMO_SEGUNDOS = 0.05
+
+def _medir(funcion, *args) -> Tuple[float, Any]:
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return time.perf_counter() - inicio, resultado
+
+def archivos_de_prueba(pais: str, filas: int, semilla: int) -> Dict[str, str]:
+    """Rutas de los CSV sintéticos del país y la escala; se generan la primera vez"""
+    carpeta = os.path.join(DIRECTORIO_BENCHMARK, "datos",
+                           f"{pais.replace(' ', '_')}_{filas}_s{semilla}_v{generador_datos.VERSION_DATOS}")
+    marca = os.path.join(carpeta, "completo.json")
+    if os.path.exists(marca):
+        with open(marca, encoding='utf-8') as archivo:
+            return json.load(archivo)
+
+    logger.info("Generando %s filas de %s en %s", f"{filas:,}", pais, carpeta)
+    rutas = generador_datos.generar_pais(pais, carpeta, filas, semilla=semilla)
+    with open(marca, 'w', encoding='utf-8') as archivo:
+        json.dump(rutas, archivo)
+    return rutas
+
+def ejecutar_repeticion(rutas: Dict[str, str], pais: str, directorio_cache: str) -> Dict[str, float]:
+    """Una pasada por todas las etapas con los caches en memoria y en disco vacíos"""
+    motor.limpiar_caches_procesamiento()
+    shutil.rmtree(directorio_cache, ignore_errors=True)
+    datos = motor.PAISES_MOTOR[pais]
+    tiempos = {}
+
+    tiempos['ingesta_stock'], df_stock = _medir(motor.data_loader.procesar_archivo_stock, rutas['stock'], datos['archivo'])
+    tiempos['ingesta_stock_cache'], _ = _medir(motor.data_loader.procesar_archivo_stock, rutas['stock'], datos['archivo'])
+
+    df_ventas = None
+    if 'ventas' in rutas:
+        tiempos['ingesta_ventas'], df_ventas = _medir(motor.data_loader.procesar_archivo_ventas, rutas['ventas'], datos['ventas'])
+
+    # Solo los países con pestaña consolidada (los que tienen archivo de ventas) la generan
+    tabla = None
+    if datos['ventas'] is not None:
+        tiempos['consolidacion'], tabla = _medir(motor.tabla_consolidada, df_stock, pais)
+        if df_ventas is not None:
+            # La tabla base ya quedó en cache: aquí solo se mide lo que agrega el archivo de ventas
+            tiempos['cruce_ventas'], tabla = _medir(motor.tabla_consolidada, df_stock, pais, None, df_ventas)
+
+    tiempos['mvp'], tabla_mvp = _medir(motor.tabla_mvps, df_stock, pais)
+
+    if tabla is not None:
+        tiempos['excel_consolidado'], _ = _medir(motor.construir_excel_consolidado, tabla,
+                                                 os.path.basename(rutas['stock']), pais)
+        exportacion = motor.calcular_tablas_exportacion_distribuciones(tabla, pais)
+        if exportacion is not None:
+            tablas_distribucion, tiene_ventas = exportacion
+            tiempos['excel_distribuciones'], _ = _medir(motor.construir_excel_distribuciones_reales,
+                                                        tablas_distribucion, pais, tiene_ventas)
+    if not tabla_mvp.empty:
+        columnas_real = [col for col in tabla_mvp.columns if col.startswith('Real ')]
+        columnas_optimo = [col for col in tabla_mvp.columns if col.startswith('Óptimo ')]
+        tiempos['excel_mvp'], _ = _medir(motor.exportar_mvp_excel_con_colores, tabla_mvp, columnas_real,
+                                         columnas_optimo, datos['etiqueta_mvp'])
+    return tiempos
+
+def ejecutar_region(filas: int, semilla: int, directorio_cache: str) -> Dict[str, float]:
+    """
+    Vista regional de todos los países: primero uno tras otro en este proceso y luego con
+    procesar_region, para medir lo que aporta el paralelismo (incluido el arranque del pool)
+    """
+    entradas = {}
+    for pais in motor.PAISES_MOTOR:
+        rutas = archivos_de_prueba(pais, filas, semilla)
+        entradas[pais] = (rutas['stock'], rutas.get('ventas'))
+    tiempos = {}
+
+    motor.limpiar_caches_procesamiento()
+    shutil.rmtree(directorio_cache, ignore_errors=True)
+    inicio = time.perf_counter()
+    for pais, archivos in entradas.items():
+        motor._procesar_pais_regional(pais, *archivos)
+    tiempos['region_secuencial'] = time.perf_counter() - inicio
+
+    motor.limpiar_caches_procesamiento()
+    shutil.rmtree(directorio_cache, ignore_errors=True)
+    tiempos['region_paralelo'], (_, resultados) = _medir(motor.procesar_region, entradas)
+    errores = {pais: resultado['error'] for pais, resultado in resultados.items() if resultado['error']}
+    if errores:
+        logger.warning("Errores en la vista regional: %s", errores)
+    return tiempos
+
+def ejecutar_escala(pais: str, filas: int, repeticiones: int, semilla: int, region: bool = True) -> Dict[str, Dict[str, float]]:
+    """Mediana y mínimo de cada etapa en una escala"""
+    rutas = archivos_de_prueba(pais, filas, semilla)
+    medidas: Dict[str, List[float]] = {}
+
+    directorio_cache = tempfile.mkdtemp(prefix="benchmark_cache_")
+    directorios_originales = (motor.DIRECTORIO_CACHE_CARGAS, motor.DIRECTORIO_TABLAS_PRECALCULADAS)
+    motor.DIRECTORIO_CACHE_CARGAS = directorio_cache
+    motor.DIRECTORIO_TABLAS_PRECALCULADAS = os.path.join(directorio_cache, "tablas")
+    try:
+        for repeticion in range(repeticiones):
+            tiempos = ejecutar_repeticion(rutas, pais, directorio_cache)
+            if region:
+                tiempos.update(ejecutar_region(filas, semilla, directorio_cache))
+            for etapa, segundos in tiempos.items():
+                medidas.setdefault(etapa, []).append(segundos)
+            logger.info("%s filas, repetición %s/%s: %.2fs", f"{filas:,}", repeticion + 1, repeticiones, sum(tiempos.values()))
+    finally:
+        motor.DIRECTORIO_CACHE_CARGAS, motor.DIRECTORIO_TABLAS_PRECALCULADAS = directorios_originales
+        shutil.rmtree(directorio_cache, ignore_errors=True)
+        motor.limpiar_caches_procesamiento()
+
+    return {
+        etapa: {'mediana': round(statistics.median(valores), 4), 'minimo': round(min(valores), 4)}
+        for etapa, valores in medidas.items()
+    }
+
+def entorno() -> Dict[str, Any]:
+    """Datos de la máquina y las librerías: las comparaciones solo valen en el mismo entorno"""
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'pyarrow': motor.pa.__version__ if motor.pa is not None else None,
+        'procesadores': os.cpu_count(),
+        'plataforma': platform.platform(),
+        'lector_csv': motor.config.motor_lectura_csv,
+    }
+
+def comparar_con_linea_base(actual: Dict[str, Any], base: Dict[str, Any], tolerancia: float) -> pd.DataFrame:
+    """Tabla etapa por etapa con la mediana actual, la de la línea base y si es una regresión"""
+    filas = []
+    for escala, etapas in actual['resultados'].items():
+        etapas_base = base.get('resultados', {}).get(escala, {})
+        for etapa, medida in etapas.items():
+            mediana = medida['mediana']
+            mediana_base = etapas_base.get(etapa, {}).get('mediana')
+            if mediana_base is None:
+                variacion, estado = None, "nueva"
+            else:
+                variacion = (mediana / mediana_base - 1) * 100 if mediana_base > 0 else 0.0
+                if mediana > mediana_base * (1 + tolerancia) and mediana - mediana_base > MARGEN_MINIMO_SEGUNDOS:
+                    estado = "REGRESIÓN"
+                elif mediana < mediana_base * (1 - tolerancia) and mediana_base - mediana > MARGEN_MINIMO_SEGUNDOS:
+                    estado = "mejora"
+                else:
+                    estado = "ok"
+            filas.append({
+                'Filas': int(escala), 'Etapa': etapa, 'Mediana (s)': mediana, 'Base (s)': mediana_base,
+                'Variación (%)': None if variacion is None else round(variacion, 1), 'Estado': estado
+            })
+    return pd.DataFrame(filas)
+
+def _leer_json(ruta: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta, encoding='utf-8') as archivo:
+        return json.load(archivo)
+
+def main(argumentos: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Mide las etapas del motor con archivos sintéticos y las compara con una línea base")
+    parser.add_argument("--filas", type=int, nargs="+", default=ESCALAS_PREDETERMINADAS,
+                        help="Escalas (filas del archivo de stock), de 10 mil a 5 millones")
+    parser.add_argument("--pais", choices=list(motor.PAISES_MOTOR), default="Guatemala", help="País de los archivos")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Repeticiones por escala (se reporta la mediana)")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla del generador de datos")
+    parser.add_argument("--linea-base", default=os.path.join(DIRECTORIO_BENCHMARK, "linea_base.json"),
+                        help="Archivo JSON con la línea base")
+    parser.add_argument("--guardar-linea-base", action="store_true", help="Guarda esta ejecución como nueva línea base")
+    parser.add_argument("--tolerancia", type=float, default=0.20,
+                        help="Aumento relativo de la mediana que cuenta como regresión (0.20 = 20%%)")
+    parser.add_argument("--sin-region", action="store_true",
+                        help="No mide la vista regional (genera y procesa los archivos de todos los países)")
+    args = parser.parse_args(argumentos)
+
+    # Los mensajes del motor se silencian para que no ensucien el reporte
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger.setLevel(logging.INFO)
+
+    escalas_invalidas = [filas for filas in args.filas
+                         if not generador_datos.FILAS_MINIMAS <= filas <= generador_datos.FILAS_MAXIMAS]
+    if escalas_invalidas:
+        logger.error("Escalas fuera de rango (%s a %s filas): %s", f"{generador_datos.FILAS_MINIMAS:,}",
+                     f"{generador_datos.FILAS_MAXIMAS:,}", escalas_invalidas)
+        return 2
+
+    actual = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'pais': args.pais,
+        'semilla': args.semilla,
+        'repeticiones': args.repeticiones,
+        'entorno': entorno(),
+        'resultados': {
+            str(filas): ejecutar_escala(args.pais, filas, max(1, args.repeticiones), args.semilla, not args.sin_region)
+            for filas in args.filas
+        },
+    }
+
+    os.makedirs(DIRECTORIO_BENCHMARK, exist_ok=True)
+    with open(os.path.join(DIRECTORIO_BENCHMARK, "historial.jsonl"), 'a', encoding='utf-8') as archivo:
+        archivo.write(json.dumps(actual, ensure_ascii=False) + "\n")
+
+    base = _leer_json(args.linea_base)
+    if base is not None and base.get('pais') != args.pais:
+        logger.warning("La línea base es de %s, no de %s: no se compara", base.get('pais'), args.pais)
+        base = None
+    if base is not None and base.get('entorno') != actual['entorno']:
+        logger.warning("La línea base se midió en otro entorno: %s", base.get('entorno'))
+
+    comparacion = comparar_con_linea_base(actual, base or {}, args.tolerancia)
+    logger.info("Resultados (%s, mediana de %s repeticiones):\n%s", args.pais, args.repeticiones, comparacion.to_string(index=False))
+
+    if args.guardar_linea_base:
+        os.makedirs(os.path.dirname(os.path.abspath(args.linea_base)), exist_ok=True)
+        with open(args.linea_base, 'w', encoding='utf-8') as archivo:
+            json.dump(actual, archivo, ensure_ascii=False, indent=2)
+        logger.info("Línea base guardada en %s", args.linea_base)
+
+    regresiones = comparacion[comparacion['Estado'] == "REGRESIÓN"]
+    if base is not None and not regresiones.empty:
+        logger.error("%s etapas más lentas que la línea base (tolerancia %.0f%%)", len(regresiones), args.tolerancia * 100)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,414 @@
+"""
+Arnés de equivalencia entre el procesamiento original del tablero y el del motor.
+
+Corre la versión de referencia (por defecto el ppp.py del commit base, antes de las
+optimizaciones) y el motor actual sobre los mismos archivos sintéticos (generador_datos.py)
+y exige que den exactamente lo mismo:
+    consolidado            tabla consolidada con ventas, por cada opción de liga
+    consolidado_sin_ventas tabla consolidada solo con el archivo de stock, por liga
+    solo_ventas            tabla de cantidades vendidas cuando no hay stock, por liga
+    mvp                    tabla de MVPs real vs óptimo y el conteo de celdas del semáforo
+Las filas TOTAL se comparan aparte para que un descuadre de totales se vea como tal.
+Cada camino carga los CSV con su propio cargador, así que la limpieza y el filtrado quedan
+cubiertos también (ingesta_stock e ingesta_ventas solo se miden: el motor compacta los tipos).
+
+Además reporta el tiempo de cada componente en ambos caminos (en frío, con los caches
+vacíos) y la aceleración. Los resultados de la referencia son lentos de calcular: se
+guardan en .benchmark/golden por revisión, país, filas, semilla y versión de los datos
+sintéticos, y se reutilizan.
+
+Uso:
+    python equivalencia.py [--filas 10000] [--paises "Guatemala" "PANAMA" ...] [--semilla 0]
+        [--referencia 46c756c | --referencia ruta/a/ppp.py] [--regenerar]
+
+Termina con código 1 si algún componente difiere de la referencia.
+"""
+import argparse
+import contextlib
+import hashlib
+import importlib.util
+import inspect
+import io
+import logging
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from io import BytesIO
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+import benchmark
+import motor
+
+logger = logging.getLogger("equivalencia")
+
+DIRECTORIO_GOLDEN = os.path.join(benchmark.DIRECTORIO_BENCHMARK, "golden")
+# Commit base del repositorio: el ppp.py con el procesamiento original, antes de las optimizaciones
+REFERENCIA_PREDETERMINADA = "46c756c"
+VERSION_GOLDEN = 1
+
+# Opciones del selector de liga (None = "Todas"); ACCESSORIES tiene sus propias reglas de Stock vs Ventas
+LIGAS_EQUIVALENCIA = [None, "MLB", "NBA", "NFL", "MOTORSPORT", "ENTERTAINMENT", "ACCESSORIES"]
+
+# Tolerancia relativa para los flotantes: los totales USD pueden sumarse en otro orden
+TOLERANCIA_RELATIVA = 1e-9
+
+# Nombre del método solo-ventas de cada país en DataProcessor (igual en ambas versiones)
+SUFIJOS_SOLO_VENTAS = {
+    "Guatemala": "guatemala", "El Salvador": "el_salvador", "Honduras": "honduras",
+    "Costa Rica": "costa_rica", "PANAMA": "panama",
+}
+
+class Referencia:
+    """
+    Versión de referencia del tablero cargada como módulo aparte. Funciona tanto con el ppp.py
+    original (todo en un archivo, tablas a partir de registros) como con una revisión que ya
+    tenga motor.py (en ese caso se usa su motor, con sus caches en disco en una carpeta temporal).
+    """
+
+    def __init__(self, revision: str):
+        self.revision = revision
+        self.directorio = tempfile.mkdtemp(prefix="equivalencia_referencia_")
+        self.ppp, self.motor = self._importar()
+        self.modulos = [modulo for modulo in (self.motor, self.ppp) if modulo is not None]
+        self.data_loader = self._atributo('data_loader')
+        self.data_processor = self._atributo('data_processor')
+        # El ppp.py original recibe los DataFrames como listas de registros (to_dict('records'))
+        self.con_registros = 'df_hash' in str(inspect.signature(self.data_processor.procesar_datos_consolidados))
+        if self.motor is not None:
+            self.motor.DIRECTORIO_CACHE_CARGAS = os.path.join(self.directorio, "cache")
+            self.motor.DIRECTORIO_TABLAS_PRECALCULADAS = os.path.join(self.directorio, "cache", "tablas")
+
+    def _copiar_archivos(self) -> str:
+        """Deja ppp.py (y motor.py y optimos_mvp.json si existen) de la revisión en la carpeta temporal"""
+        if os.path.isfile(self.revision):
+            origen = os.path.dirname(os.path.abspath(self.revision))
+            for nombre in ("motor.py", "optimos_mvp.json"):
+                if os.path.exists(os.path.join(origen, nombre)):
+                    shutil.copy(os.path.join(origen, nombre), self.directorio)
+            shutil.copy(self.revision, os.path.join(self.directorio, "ppp.py"))
+        else:
+            raiz = os.path.dirname(os.path.abspath(__file__))
+            for nombre in ("ppp.py", "motor.py", "optimos_mvp.json"):
+                resultado = subprocess.run(["git", "show", f"{self.revision}:{nombre}"], cwd=raiz, capture_output=True)
+                if resultado.returncode != 0:
+                    if nombre == "ppp.py":
+                        raise ValueError(f"No se pudo leer ppp.py de la revisión {self.revision}: "
+                                         f"{resultado.stderr.decode(errors='replace').strip()}")
+                    continue
+                with open(os.path.join(self.directorio, nombre), 'wb') as archivo:
+                    archivo.write(resultado.stdout)
+        return os.path.join(self.directorio, "ppp.py")
+
+    def _importar(self) -> Tuple[ModuleType, Optional[ModuleType]]:
+        ruta = self._copiar_archivos()
+        # El ppp.py de la referencia importa 'motor': mientras se carga, ese nombre debe apuntar
+        # al motor.py de la referencia y no al actual
+        motor_actual = sys.modules.pop('motor', None)
+        sys.path.insert(0, self.directorio)
+        try:
+            spec = importlib.util.spec_from_file_location("ppp_referencia", ruta)
+            modulo = importlib.util.module_from_spec(spec)
+            with contextlib.redirect_stdout(io.StringIO()):
+                spec.loader.exec_module(modulo)
+            motor_referencia = sys.modules.get('motor')
+            # Fuera de `streamlit run` cada cache y cada st.* avisan que no hay runtime
+            for nombre in list(logging.root.manager.loggerDict):
+                if nombre.startswith("streamlit"):
+                    logging.getLogger(nombre).setLevel(logging.ERROR)
+        finally:
+            sys.path.remove(self.directorio)
+            if motor_actual is not None:
+                sys.modules['motor'] = motor_actual
+        return modulo, motor_referencia
+
+    def _atributo(self, nombre: str) -> Any:
+        for modulo in self.modulos:
+            if hasattr(modulo, nombre):
+                return getattr(modulo, nombre)
+        raise AttributeError(f"La referencia {self.revision} no tiene {nombre}")
+
+    def _argumento(self, df: Optional[pd.DataFrame]) -> Any:
+        return df.to_dict('records') if self.con_registros and df is not None else df
+
+    def limpiar_caches(self) -> None:
+        """Vacía los caches de la referencia para medir en frío"""
+        self.ppp.st.cache_data.clear()
+        if self.motor is not None and hasattr(self.motor, 'limpiar_caches_procesamiento'):
+            self.motor.limpiar_caches_procesamiento()
+        shutil.rmtree(os.path.join(self.directorio, "cache"), ignore_errors=True)
+
+    def cargar_stock(self, ruta: str, clave: str) -> pd.DataFrame:
+        # El tablero original recibía el contenido completo del archivo subido
+        with open(ruta, 'rb') as archivo:
+            contenido = archivo.read()
+        if hasattr(self.data_loader, 'procesar_archivo_stock'):
+            return self.data_loader.procesar_archivo_stock(contenido, clave)
+        # Mismos pasos que DataLoader._process_file del tablero original
+        df = self.data_loader._read_csv(BytesIO(contenido))
+        df = self.data_loader._clean_data(df)
+        df = self.data_loader._filter_by_country(df, clave)
+        self.data_loader._validate_columns(df, clave)
+        return df
+
+    def cargar_ventas(self, ruta: str, clave: str) -> pd.DataFrame:
+        with open(ruta, 'rb') as archivo:
+            contenido = archivo.read()
+        if hasattr(self.data_loader, 'procesar_archivo_ventas'):
+            return self.data_loader.procesar_archivo_ventas(contenido, clave)
+        # Mismos pasos que DataLoader.cargar_archivo_ventas del tablero original
+        df = pd.read_csv(BytesIO(contenido), encoding='utf-8', delimiter=';', low_memory=False, on_bad_lines='skip')
+        df.columns = df.columns.str.strip()
+        return df
+
+    def consolidado(self, df_stock: pd.DataFrame, pais: str, liga: Optional[str],
+                    df_ventas: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+        return self.data_processor.procesar_datos_consolidados(self._argumento(df_stock), pais, liga,
+                                                               self._argumento(df_ventas))
+
+    def solo_ventas(self, df_ventas: pd.DataFrame, pais: str, liga: Optional[str]) -> Optional[pd.DataFrame]:
+        metodo = getattr(self.data_processor, f"procesar_solo_ventas_{SUFIJOS_SOLO_VENTAS[pais]}")
+        return metodo(self._argumento(df_ventas), liga)
+
+    def mvp(self, df_stock: pd.DataFrame, pais: str) -> pd.DataFrame:
+        return self._atributo(motor.PAISES_MOTOR[pais]['mvps'].__name__)(df_stock)
+
+    def contar_semaforo(self, tabla: pd.DataFrame, columnas_real: List[str], columnas_optimo: List[str]) -> dict:
+        return self._atributo('contar_celdas_semaforo_mvp')(tabla, columnas_real, columnas_optimo)
+
+    def cerrar(self) -> None:
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+def _columnas_semaforo(tabla: pd.DataFrame) -> Tuple[List[str], List[str]]:
+    columnas_real = [col for col in tabla.columns if col.startswith('Real ')]
+    columnas_optimo = [col for col in tabla.columns if col.startswith('Óptimo ')]
+    return columnas_real, columnas_optimo
+
+def ejecutar_camino(camino: Any, rutas: Dict[str, str], pais: str, limpiar) -> Tuple[Dict[tuple, Any], Dict[tuple, float]]:
+    """
+    Corre todos los componentes de un país con un camino (la referencia o el motor actual).
+    Devuelve los resultados y los segundos de cada caso, medidos con los caches vacíos.
+    """
+    datos = motor.PAISES_MOTOR[pais]
+    resultados: Dict[tuple, Any] = {}
+    tiempos: Dict[tuple, float] = {}
+
+    def medir(caso: tuple, funcion, *args) -> Any:
+        limpiar()
+        inicio = time.perf_counter()
+        resultado = funcion(*args)
+        tiempos[caso] = time.perf_counter() - inicio
+        return resultado
+
+    df_stock = medir(('ingesta_stock',), camino.cargar_stock, rutas['stock'], datos['archivo'])
+    df_ventas = None
+    if 'ventas' in rutas:
+        df_ventas = medir(('ingesta_ventas',), camino.cargar_ventas, rutas['ventas'], datos['ventas'])
+
+    if df_ventas is not None:
+        for liga in LIGAS_EQUIVALENCIA:
+            resultados[('consolidado', liga)] = medir(('consolidado', liga), camino.consolidado, df_stock, pais, liga, df_ventas)
+            resultados[('consolidado_sin_ventas', liga)] = medir(('consolidado_sin_ventas', liga), camino.consolidado,
+                                                                 df_stock, pais, liga, None)
+            resultados[('solo_ventas', liga)] = medir(('solo_ventas', liga), camino.solo_ventas, df_ventas, pais, liga)
+
+    tabla_mvp = medir(('mvp', None), camino.mvp, df_stock, pais)
+    resultados[('mvp', None)] = tabla_mvp
+    if not tabla_mvp.empty:
+        inicio = time.perf_counter()
+        resultados[('semaforo', None)] = camino.contar_semaforo(tabla_mvp, *_columnas_semaforo(tabla_mvp))
+        tiempos[('mvp', None)] += time.perf_counter() - inicio
+    return resultados, tiempos
+
+class CaminoRapido:
+    """El motor actual con la misma interfaz que Referencia"""
+
+    def cargar_stock(self, ruta: str, clave: str) -> pd.DataFrame:
+        return motor.data_loader.procesar_archivo_stock(ruta, clave)
+
+    def cargar_ventas(self, ruta: str, clave: str) -> pd.DataFrame:
+        return motor.data_loader.procesar_archivo_ventas(ruta, clave)
+
+    def consolidado(self, df_stock: pd.DataFrame, pais: str, liga: Optional[str],
+                    df_ventas: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+        return motor.tabla_consolidada(df_stock, pais, liga, df_ventas)
+
+    def solo_ventas(self, df_ventas: pd.DataFrame, pais: str, liga: Optional[str]) -> Optional[pd.DataFrame]:
+        return motor.tabla_solo_ventas(df_ventas, pais, liga)
+
+    def mvp(self, df_stock: pd.DataFrame, pais: str) -> pd.DataFrame:
+        return motor.tabla_mvps(df_stock, pais)
+
+    def contar_semaforo(self, tabla: pd.DataFrame, columnas_real: List[str], columnas_optimo: List[str]) -> dict:
+        return motor.contar_celdas_semaforo_mvp(tabla, columnas_real, columnas_optimo)
+
+def _filas_total(tabla: pd.DataFrame) -> pd.DataFrame:
+    # La consolidada marca la fila en la columna Bodega; solo-ventas y MVPs, en el índice
+    if ('INFO', 'INFO', 'Bodega') in tabla.columns:
+        etiquetas = tabla[('INFO', 'INFO', 'Bodega')]
+    else:
+        etiquetas = tabla.index.get_level_values(0) if tabla.index.nlevels > 1 else tabla.index
+    return tabla[pd.Index(etiquetas).astype(str) == 'TOTAL']
+
+def comparar(esperado: Any, obtenido: Any) -> List[str]:
+    """Diferencias entre el resultado de la referencia y el del motor (lista vacía si son iguales)"""
+    if esperado is None or obtenido is None:
+        return [] if esperado is None and obtenido is None else [f"uno es None: referencia={type(esperado).__name__}, motor={type(obtenido).__name__}"]
+    if isinstance(esperado, pd.DataFrame):
+        diferencias = []
+        for nombre, a, b in (("totales", _filas_total(esperado), _filas_total(obtenido)), ("tabla", esperado, obtenido)):
+            try:
+                pd.testing.assert_frame_equal(a, b, check_exact=False, rtol=TOLERANCIA_RELATIVA)
+            except AssertionError as e:
+                diferencias.append(f"{nombre}: {' '.join(str(e).split())[:500]}")
+        return diferencias
+    return [] if esperado == obtenido else [f"referencia={esperado}, motor={obtenido}"]
+
+def _huella_referencia(revision: str) -> str:
+    """Identifica la referencia para los archivos golden: el commit completo o el contenido del archivo"""
+    if os.path.isfile(revision):
+        with open(revision, 'rb') as archivo:
+            return hashlib.sha256(archivo.read()).hexdigest()[:16]
+    resultado = subprocess.run(["git", "rev-parse", "--verify", f"{revision}^{{commit}}"],
+                               cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True)
+    if resultado.returncode != 0:
+        raise ValueError(f"Revisión desconocida: {revision}")
+    return resultado.stdout.strip()[:16]
+
+def resultados_referencia(revision: str, rutas: Dict[str, str], pais: str, filas: int, semilla: int,
+                          referencia: Dict[str, Referencia], regenerar: bool) -> Dict[str, Any]:
+    """Resultados y tiempos de la referencia: del archivo golden si existe, si no se calculan y se guardan"""
+    ruta = os.path.join(DIRECTORIO_GOLDEN, f"{_huella_referencia(revision)}_{pais.replace(' ', '_')}_{filas}_s{semilla}"
+                                           f"_v{benchmark.generador_datos.VERSION_DATOS}.pkl")
+    if not regenerar and os.path.exists(ruta):
+        with open(ruta, 'rb') as archivo:
+            golden = pickle.load(archivo)
+        if golden.get('version') == VERSION_GOLDEN:
+            return golden
+
+    if 'modulo' not in referencia:
+        logger.info("Cargando la referencia %s", revision)
+        referencia['modulo'] = Referencia(revision)
+    camino = referencia['modulo']
+    logger.info("Calculando los resultados de referencia de %s (%s filas)", pais, f"{filas:,}")
+    # El tablero original escribe mucho en la consola
+    with contextlib.redirect_stdout(io.StringIO()):
+        resultados, tiempos = ejecutar_camino(camino, rutas, pais, camino.limpiar_caches)
+    golden = {'version': VERSION_GOLDEN, 'revision': revision, 'resultados': resultados, 'tiempos': tiempos}
+
+    os.makedirs(DIRECTORIO_GOLDEN, exist_ok=True)
+    with open(ruta, 'wb') as archivo:
+        pickle.dump(golden, archivo)
+    return golden
+
+def resultados_motor(rutas: Dict[str, str], pais: str) -> Tuple[Dict[tuple, Any], Dict[tuple, float]]:
+    """Resultados y tiempos del motor actual con sus caches en disco en una carpeta temporal"""
+    directorio_cache = tempfile.mkdtemp(prefix="equivalencia_cache_")
+    directorios_originales = (motor.DIRECTORIO_CACHE_CARGAS, motor.DIRECTORIO_TABLAS_PRECALCULADAS)
+    motor.DIRECTORIO_CACHE_CARGAS = directorio_cache
+    motor.DIRECTORIO_TABLAS_PRECALCULADAS = os.path.join(directorio_cache, "tablas")
+
+    def limpiar() -> None:
+        motor.limpiar_caches_procesamiento()
+        shutil.rmtree(directorio_cache, ignore_errors=True)
+
+    try:
+        return ejecutar_camino(CaminoRapido(), rutas, pais, limpiar)
+    finally:
+        motor.DIRECTORIO_CACHE_CARGAS, motor.DIRECTORIO_TABLAS_PRECALCULADAS = directorios_originales
+        shutil.rmtree(directorio_cache, ignore_errors=True)
+        motor.limpiar_caches_procesamiento()
+
+def comparar_pais(golden: Dict[str, Any], resultados: Dict[tuple, Any], tiempos: Dict[tuple, float],
+                  pais: str) -> Tuple[pd.DataFrame, List[str]]:
+    """Tabla por componente (tiempos, aceleración y casos distintos) y el detalle de cada diferencia"""
+    detalle = []
+    distintos: Dict[str, int] = {}
+    for caso, esperado in golden['resultados'].items():
+        componente = caso[0] if caso[0] != 'semaforo' else 'mvp'
+        distintos.setdefault(componente, 0)
+        if caso not in resultados:
+            diferencias = ["el motor no generó este resultado"]
+        else:
+            diferencias = comparar(esperado, resultados[caso])
+        if diferencias:
+            distintos[componente] += 1
+            detalle.extend(f"{pais} {caso[0]} liga={caso[1] or 'Todas'}: {diferencia}" for diferencia in diferencias)
+    for caso in resultados.keys() - golden['resultados'].keys():
+        distintos[caso[0]] = distintos.get(caso[0], 0) + 1
+        detalle.append(f"{pais} {caso[0]} liga={caso[1] or 'Todas'}: la referencia no generó este resultado")
+
+    filas = []
+    for componente in dict.fromkeys(caso[0] for caso in golden['tiempos']):
+        referencia = sum(segundos for caso, segundos in golden['tiempos'].items() if caso[0] == componente)
+        rapido = sum(segundos for caso, segundos in tiempos.items() if caso[0] == componente)
+        filas.append({
+            'País': pais, 'Componente': componente, 'Referencia (s)': round(referencia, 3),
+            'Motor (s)': round(rapido, 3), 'Aceleración (x)': round(referencia / rapido, 1) if rapido > 0 else None,
+            'Distintos': distintos.get(componente, '-')
+        })
+    return pd.DataFrame(filas), detalle
+
+def main(argumentos: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compara el motor actual con el procesamiento original sobre los mismos archivos")
+    parser.add_argument("--filas", type=int, default=10_000, help="Filas del archivo de stock de cada país")
+    parser.add_argument("--paises", nargs="+", choices=list(motor.PAISES_MOTOR), default=list(motor.PAISES_MOTOR),
+                        help="Países a comparar (por defecto todos)")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla del generador de datos")
+    parser.add_argument("--referencia", default=REFERENCIA_PREDETERMINADA,
+                        help="Revisión de git o ruta a un ppp.py con el procesamiento de referencia")
+    parser.add_argument("--regenerar", action="store_true", help="Recalcula los resultados golden de la referencia")
+    args = parser.parse_args(argumentos)
+
+    # Los mensajes del motor y del tablero original se silencian para que no ensucien el reporte
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger.setLevel(logging.INFO)
+
+    if not benchmark.generador_datos.FILAS_MINIMAS <= args.filas <= benchmark.generador_datos.FILAS_MAXIMAS:
+        logger.error("filas fuera de rango (%s a %s)", f"{benchmark.generador_datos.FILAS_MINIMAS:,}",
+                     f"{benchmark.generador_datos.FILAS_MAXIMAS:,}")
+        return 2
+
+    referencia: Dict[str, Referencia] = {}
+    tablas = []
+    detalle = []
+    try:
+        for pais in args.paises:
+            rutas = benchmark.archivos_de_prueba(pais, args.filas, args.semilla)
+            golden = resultados_referencia(args.referencia, rutas, pais, args.filas, args.semilla,
+                                           referencia, args.regenerar)
+            resultados, tiempos = resultados_motor(rutas, pais)
+            tabla, diferencias = comparar_pais(golden, resultados, tiempos, pais)
+            tablas.append(tabla)
+            detalle.extend(diferencias)
+    except ValueError as e:
+        logger.error(str(e))
+        return 2
+    finally:
+        if 'modulo' in referencia:
+            referencia['modulo'].cerrar()
+
+    reporte = pd.concat(tablas, ignore_index=True)
+    logger.info("Equivalencia con %s (%s filas por país):\n%s", args.referencia, f"{args.filas:,}",
+                reporte.to_string(index=False))
+    referencia_total = reporte['Referencia (s)'].sum()
+    rapido_total = reporte['Motor (s)'].sum()
+    logger.info("Total: referencia %.2fs, motor %.2fs, aceleración %.1fx", referencia_total, rapido_total,
+                referencia_total / rapido_total if rapido_total > 0 else float('nan'))
+
+    for diferencia in detalle:
+        logger.error(diferencia)
+    if detalle:
+        logger.error("%s diferencias con la referencia", len(detalle))
+        return 1
+    logger.info("Sin diferencias con la referencia")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
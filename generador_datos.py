@@ -0,0 +1,254 @@
+"""
+Generador de archivos sintéticos de stock y ventas para pruebas de carga y benchmarks.
+
+Escribe archivos con la misma forma que los del ERP que se suben al tablero (GUATEMALA.csv,
+VENTAS_GUATEMALA.csv, ...): separador ';', las columnas que usa el motor y los nombres
+reales de bodegas y tiendas de cada país (CountryManager y los mapeos de ventas), ligas,
+siluetas y códigos MVP del catálogo de óptimos. Una parte de las filas trae el nombre de la
+bodega o tienda escrito como llega del ERP (mayúsculas, espacios, sin tildes o con los alias
+de los mapeos), para que la normalización de nombres también se mida y se compare. La carpeta
+generada sirve directamente como entrada de lote.py.
+
+Uso:
+    python generador_datos.py CARPETA_SALIDA [--filas 100000] [--filas-ventas N]
+        [--paises "Guatemala" "PANAMA" ...] [--semilla 0] [--proporcion-variantes 0.05]
+
+Admite de 10 mil a 5 millones de filas por archivo; se escribe por bloques, así que la
+memoria no crece con el tamaño del archivo.
+"""
+import argparse
+import logging
+import os
+import sys
+import unicodedata
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import motor
+
+logger = logging.getLogger("generador_datos")
+
+FILAS_MINIMAS = 10_000
+FILAS_MAXIMAS = 5_000_000
+FILAS_POR_BLOQUE = 500_000
+# Subir cuando cambie lo que se genera con la misma semilla: los benchmarks guardan los archivos por versión
+VERSION_DATOS = 2
+
+# Puerto Rico no tiene bodegas en CountryManager: son las que busca procesar_stock_mvps_puerto_rico
+BODEGAS_PUERTO_RICO = ["NE Barceloneta Premium Outlet", "NE Plaza Carolina"]
+
+# Proporción de filas de otras marcas y de bodegas de otros países (el archivo del ERP trae
+# todo y el cargador filtra NEW ERA y las bodegas del país)
+PROPORCION_OTRAS_MARCAS = 0.08
+PROPORCION_OTRAS_BODEGAS = 0.10
+PROPORCION_CODIGOS_MVP = 0.15
+# Proporción de filas con el nombre de bodega o tienda en una variante cruda (ver variantes_nombre)
+PROPORCION_VARIANTES_NOMBRES = 0.05
+
+OTRAS_MARCAS = ["47 BRAND", "MITCHELL & NESS", "FANATICS"]
+SEGMENTOS = ["HEADWEAR", "APPAREL", "ACCESSORIES", "FOOTWEAR"]
+PESOS_SEGMENTOS = [0.60, 0.25, 0.12, 0.03]
+SILUETAS_APPAREL = ["T-SHIRT", "HOODIE", "JERSEY", "JACKET"]
+SILUETAS_ACCESSORIES = ["BACKPACK", "CAP CARRIER", "SOCKS", "PIN"]
+# Siluetas de headwear que el clasificador no reconoce (quedan fuera de planas y curvas)
+SILUETAS_SIN_CLASIFICAR = ["BUCKET", "KNIT", "VISOR"]
+TALLAS = ["678", "700", "712", "714", "718", "734", "738", "758", "778", "800", "SM", "ML", "OSFM"]
+COLECCIONES = ["CORE", "FASHION", "ON FIELD", "LICENSED"]
+
+def bodegas_stock(pais: str) -> List[str]:
+    """Nombres de bodega del archivo de stock de un país"""
+    return motor.country_manager.get_bodegas(pais) or list(BODEGAS_PUERTO_RICO if pais == "Puerto Rico" else [])
+
+def tiendas_ventas(pais: str) -> List[str]:
+    """Nombres de tienda del archivo de ventas de un país (formato ventas de los mapeos)"""
+    mapeos = motor.sales_processor.country_mappings.get(pais, {})
+    return sorted({variaciones[-1] for variaciones in mapeos.values()})
+
+def variantes_nombre(nombre: str) -> List[str]:
+    """
+    Variantes crudas de un nombre de bodega o tienda: los alias conocidos (llaves de
+    mapeo_normalizacion_stock y las demás variaciones de los mapeos de ventas) y el mismo
+    nombre en mayúsculas, minúsculas, con espacios de más y sin tildes
+    """
+    procesador = motor.sales_processor
+    alias = [crudo for crudo, normalizado in procesador.mapeo_normalizacion_stock.items() if normalizado == nombre]
+    for mapeos in procesador.country_mappings.values():
+        for variaciones in mapeos.values():
+            if nombre in variaciones:
+                alias.extend(variaciones)
+    sin_tildes = ''.join(letra for letra in unicodedata.normalize('NFKD', nombre) if not unicodedata.combining(letra))
+    variantes = alias + [nombre.upper(), nombre.lower(), f" {nombre} ", nombre.replace(' ', '  ', 1), sin_tildes]
+    return list(dict.fromkeys(variante for variante in variantes if variante != nombre))
+
+def codigos_mvp(pais: str) -> List[str]:
+    """Códigos MVP del país según el catálogo de óptimos"""
+    return sorted(motor.cargar_tablas_optimos_mvp().get(pais, {}).get("por_codigo", {}))
+
+def _ligas_por_segmento() -> Dict[str, List[str]]:
+    categorias = motor.league_categories.get_all_categories()
+    ligas = [liga for categoria, valores in categorias.items() if categoria != "ACCESSORIES" for liga in valores]
+    return {"HEADWEAR": ligas, "APPAREL": ligas, "FOOTWEAR": ligas, "ACCESSORIES": categorias["ACCESSORIES"]}
+
+def _elegir(rng: np.random.Generator, valores: List[str], n: int, pesos: Optional[List[float]] = None) -> np.ndarray:
+    return np.asarray(valores, dtype=object)[rng.choice(len(valores), size=n, p=pesos)]
+
+def _columna_por_segmento(rng: np.random.Generator, segmentos: np.ndarray, opciones: Dict[str, List[str]]) -> np.ndarray:
+    """Elige un valor por fila entre las opciones de su segmento"""
+    resultado = np.empty(len(segmentos), dtype=object)
+    for segmento, valores in opciones.items():
+        filas = segmentos == segmento
+        resultado[filas] = _elegir(rng, valores, int(filas.sum()))
+    return resultado
+
+def _siluetas(rng: np.random.Generator, segmentos: np.ndarray) -> np.ndarray:
+    clasificador = motor.product_classifier
+    headwear = clasificador.siluetas_planas + clasificador.siluetas_curvas + SILUETAS_SIN_CLASIFICAR
+    return _columna_por_segmento(rng, segmentos, {
+        "HEADWEAR": headwear, "APPAREL": SILUETAS_APPAREL,
+        "ACCESSORIES": SILUETAS_ACCESSORIES, "FOOTWEAR": ["SNEAKER"]
+    })
+
+def _bodegas(rng: np.random.Generator, propias: List[str], otras: List[str], n: int) -> np.ndarray:
+    bodegas = _elegir(rng, propias, n)
+    if otras:
+        ajenas = rng.random(n) < PROPORCION_OTRAS_BODEGAS
+        bodegas[ajenas] = _elegir(rng, otras, int(ajenas.sum()))
+    return bodegas
+
+def _con_variantes(rng: np.random.Generator, nombres: np.ndarray, proporcion: float) -> np.ndarray:
+    """Reemplaza una proporción de los nombres por una de sus variantes crudas"""
+    if proporcion <= 0:
+        return nombres
+    elegidas = np.flatnonzero(rng.random(len(nombres)) < proporcion)
+    for nombre in pd.unique(nombres[elegidas]):
+        filas = elegidas[nombres[elegidas] == nombre]
+        variantes = variantes_nombre(nombre)
+        if variantes:
+            nombres[filas] = _elegir(rng, variantes, len(filas))
+    return nombres
+
+def _marcas(rng: np.random.Generator, n: int) -> np.ndarray:
+    marcas = np.full(n, "NEW ERA", dtype=object)
+    otras = rng.random(n) < PROPORCION_OTRAS_MARCAS
+    marcas[otras] = _elegir(rng, OTRAS_MARCAS, int(otras.sum()))
+    return marcas
+
+def generar_bloque_stock(pais: str, filas: int, rng: np.random.Generator,
+                         proporcion_variantes: float = PROPORCION_VARIANTES_NOMBRES) -> pd.DataFrame:
+    """Un bloque de filas de stock con la forma del archivo del ERP"""
+    otras_bodegas = sorted({bodega for otro in motor.PAISES_MOTOR if otro != pais for bodega in bodegas_stock(otro)})
+    segmentos = _elegir(rng, SEGMENTOS, filas, PESOS_SEGMENTOS)
+
+    estilos = rng.integers(10_000_000, 80_000_000, filas).astype(str).astype(object)
+    mvps = codigos_mvp(pais)
+    if mvps:
+        es_mvp = rng.random(filas) < PROPORCION_CODIGOS_MVP
+        estilos[es_mvp] = _elegir(rng, mvps, int(es_mvp.sum()))
+    tallas = _elegir(rng, TALLAS, filas)
+
+    # El ERP exporta el stock como texto con separador de miles y a veces negativo
+    stock = rng.geometric(0.12, filas) - 1
+    stock[rng.random(filas) < 0.01] *= -1
+    stock[rng.random(filas) < 0.002] *= 150
+    stock_texto = pd.Series(stock).map("{:,}".format)
+
+    ligas = _columna_por_segmento(rng, segmentos, _ligas_por_segmento())
+    siluetas = _siluetas(rng, segmentos)
+
+    return pd.DataFrame({
+        'U_Marca': _marcas(rng, filas),
+        'U_Liga': ligas,
+        'U_Silueta': siluetas,
+        'U_Segmento': segmentos,
+        'Bodega': _con_variantes(rng, _bodegas(rng, bodegas_stock(pais), otras_bodegas, filas), proporcion_variantes),
+        'Stock_Actual': stock_texto.values,
+        'U_Estilo': estilos,
+        'Codigo_SAP': estilos + "-" + tallas,
+        'U_Coleccion_NE': _elegir(rng, COLECCIONES, filas),
+        'U_Descripcion': ligas + " " + siluetas,
+        'U_Talla': tallas,
+    })
+
+def generar_bloque_ventas(pais: str, filas: int, rng: np.random.Generator,
+                          proporcion_variantes: float = PROPORCION_VARIANTES_NOMBRES) -> pd.DataFrame:
+    """Un bloque de filas de ventas (una línea por ticket y producto) con la forma del archivo del ERP"""
+    otras_tiendas = sorted({tienda for otro in motor.PAISES_MOTOR if otro != pais for tienda in tiendas_ventas(otro)})
+    segmentos = _elegir(rng, SEGMENTOS, filas, PESOS_SEGMENTOS)
+    cantidades = rng.geometric(0.6, filas)
+    precios = rng.choice([19.99, 24.99, 29.99, 34.99, 39.99, 44.99], filas)
+
+    return pd.DataFrame({
+        'U_Marca': _marcas(rng, filas),
+        'U_Liga': _columna_por_segmento(rng, segmentos, _ligas_por_segmento()),
+        'U_Silueta': _siluetas(rng, segmentos),
+        'U_Segmento': segmentos,
+        'Tienda': _con_variantes(rng, _bodegas(rng, tiendas_ventas(pais), otras_tiendas, filas), proporcion_variantes),
+        'Cantidad': cantidades,
+        'USD_Total_SI_CD': np.round(cantidades * precios / 1.12, 2),
+    })
+
+def escribir_archivo(ruta: str, generar_bloque, pais: str, filas: int, rng: np.random.Generator,
+                     proporcion_variantes: float = PROPORCION_VARIANTES_NOMBRES) -> str:
+    """Escribe el CSV por bloques de FILAS_POR_BLOQUE filas"""
+    with open(ruta, 'w', encoding='utf-8', newline='') as archivo:
+        escritas = 0
+        while escritas < filas:
+            bloque = generar_bloque(pais, min(FILAS_POR_BLOQUE, filas - escritas), rng, proporcion_variantes)
+            bloque.to_csv(archivo, sep=';', index=False, header=escritas == 0)
+            escritas += len(bloque)
+    return ruta
+
+def generar_pais(pais: str, salida: str, filas: int, filas_ventas: Optional[int] = None,
+                 semilla: int = 0, proporcion_variantes: float = PROPORCION_VARIANTES_NOMBRES) -> Dict[str, str]:
+    """
+    Genera el archivo de stock (y el de ventas si el país lo usa) de un país en salida con los
+    nombres que espera lote.py. Devuelve {'stock': ruta, 'ventas': ruta}.
+    """
+    if not FILAS_MINIMAS <= filas <= FILAS_MAXIMAS:
+        raise ValueError(f"filas debe estar entre {FILAS_MINIMAS:,} y {FILAS_MAXIMAS:,}")
+    if not 0 <= proporcion_variantes <= 1:
+        raise ValueError("proporcion_variantes debe estar entre 0 y 1")
+    datos = motor.PAISES_MOTOR[pais]
+    nombres = motor.data_loader.nombres_permitidos
+    os.makedirs(salida, exist_ok=True)
+    # Una semilla distinta por país y archivo: los resultados no dependen de qué países se pidan
+    rng_stock = np.random.default_rng([semilla, list(motor.PAISES_MOTOR).index(pais), 0])
+    rng_ventas = np.random.default_rng([semilla, list(motor.PAISES_MOTOR).index(pais), 1])
+
+    rutas = {}
+    ruta = os.path.join(salida, f"{nombres[datos['archivo']]['stock']}.csv")
+    rutas['stock'] = escribir_archivo(ruta, generar_bloque_stock, pais, filas, rng_stock, proporcion_variantes)
+    if datos['ventas'] is not None:
+        ruta = os.path.join(salida, f"{nombres[datos['ventas']]['ventas']}.csv")
+        rutas['ventas'] = escribir_archivo(ruta, generar_bloque_ventas, pais, filas_ventas or filas // 2, rng_ventas,
+                                           proporcion_variantes)
+    return rutas
+
+def main(argumentos: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Genera archivos sintéticos de stock y ventas con la forma de los del ERP")
+    parser.add_argument("salida", help="Carpeta donde se escriben los CSV")
+    parser.add_argument("--filas", type=int, default=100_000, help="Filas del archivo de stock de cada país")
+    parser.add_argument("--filas-ventas", type=int, default=None, help="Filas del archivo de ventas (por defecto la mitad)")
+    parser.add_argument("--paises", nargs="+", choices=list(motor.PAISES_MOTOR), default=["Guatemala"],
+                        help="Países a generar (por defecto Guatemala)")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla del generador aleatorio")
+    parser.add_argument("--proporcion-variantes", type=float, default=PROPORCION_VARIANTES_NOMBRES,
+                        help="Proporción de filas con el nombre de bodega o tienda en una variante cruda (0 a 1)")
+    args = parser.parse_args(argumentos)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    try:
+        for pais in args.paises:
+            rutas = generar_pais(pais, args.salida, args.filas, args.filas_ventas, args.semilla,
+                                 args.proporcion_variantes)
+            logger.info("%s: %s", pais, ", ".join(rutas.values()))
+    except ValueError as e:
+        logger.error(str(e))
+        return 2
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""
+Procesamiento por lotes del New Era Analytics Dashboard.
+
+Genera, sin abrir el tablero, las tablas y los Excel de todos los países a partir de una
+carpeta con los mismos archivos que se suben en cada pestaña (GUATEMALA.csv,
+VENTAS_GUATEMALA.csv, EL_SALVADOR.csv, ..., PUERTO_RICO.csv). Cada país se procesa en
+un proceso aparte del pool.
+
+Uso:
+    python lote.py CARPETA_ENTRADA [--salida CARPETA] [--procesos N] [--paises "Guatemala" "PANAMA" ...] [--perfil]
+        [--log-niveles "motor=DEBUG,motor.mvp=WARNING"]
+
+Por país se escribe en CARPETA/<fecha>/<país>/:
+    - STOCK_CONSOLIDADO_<PAÍS>_<fecha>.xlsx y STOCK_<LIGA>_<PAÍS>_<fecha>.xlsx por liga
+    - DISTRIBUCION_BODEGAS_<PAÍS>_<fecha>.xlsx (si la pestaña del país lo ofrece)
+    - MVP_<País>_Semaforo_<fecha>.xlsx
+    - tablas/*.pkl con las tablas consolidadas, solo-ventas y de MVPs (pd.read_pickle)
+
+Además deja en el cache en disco del tablero (.cache_cargas) los archivos ya leídos y las
+tablas consolidadas precalculadas: al subir los mismos archivos en el tablero se cargan al instante.
+El snapshot del día de cada país se agrega al histórico (.historico) que usa la vista de tendencias.
+
+Con --perfil cada etapa del procesamiento (tiempo, filas y pico de memoria) se escribe como
+una línea JSON en el log y queda también en resumen.json, bajo 'etapas' de cada país.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+import motor
+
+logger = logging.getLogger("lote")
+
+# Opciones del selector de liga del tablero (None = "Todas")
+LIGAS_LOTE = [None, "MLB", "NBA", "NFL", "MOTORSPORT", "ENTERTAINMENT"]
+
+def _ruta_archivo_entrada(entrada: str, clave: Optional[str], tipo: str) -> Optional[str]:
+    """Ruta del CSV esperado para la clave de nombres_permitidos; None si no está en la carpeta"""
+    if clave is None:
+        return None
+    nombre = motor.data_loader.nombres_permitidos.get(clave, {}).get(tipo)
+    if nombre is None:
+        return None
+    ruta = os.path.join(entrada, f"{nombre}.csv")
+    return ruta if os.path.exists(ruta) else None
+
+def _escribir(ruta: str, contenido: bytes, generados: List[str]) -> None:
+    with open(ruta, 'wb') as archivo:
+        archivo.write(contenido)
+    generados.append(ruta)
+
+def _guardar_tabla(tabla: pd.DataFrame, ruta: str, generados: List[str]) -> None:
+    # Pickle y no Parquet: la tabla de MVPs tiene índices con códigos numéricos y 'TOTAL' en el mismo nivel
+    tabla.to_pickle(ruta)
+    generados.append(ruta)
+
+def procesar_pais(pais: str, entrada: str, salida: str, perfil: bool = False) -> Dict[str, Any]:
+    """
+    Genera todas las tablas y los Excel de un país; se ejecuta en un proceso del pool.
+    Devuelve un resumen con los archivos generados, el tiempo y el error si lo hubo
+    (y las etapas medidas si perfil es True).
+    """
+    inicio = time.time()
+    if perfil:
+        motor.config.registrar_etapas_json = True
+        motor.instrumentacion.iniciar_registro(memoria=True)
+    datos = motor.PAISES_MOTOR[pais]
+    carpeta = os.path.join(salida, pais.replace(' ', '_'))
+    carpeta_tablas = os.path.join(carpeta, "tablas")
+    generados: List[str] = []
+    resumen = {'pais': pais, 'archivos': generados, 'error': None}
+
+    try:
+        ruta_stock = _ruta_archivo_entrada(entrada, datos['archivo'], 'stock')
+        ruta_ventas = _ruta_archivo_entrada(entrada, datos['ventas'], 'ventas')
+        if ruta_stock is None and ruta_ventas is None:
+            resumen['omitido'] = True
+            return resumen
+        os.makedirs(carpeta_tablas, exist_ok=True)
+
+        df_stock = None
+        df_ventas = None
+        if ruta_stock is not None:
+            df_stock = motor.data_loader.procesar_archivo_stock(ruta_stock, datos['archivo'])
+        if ruta_ventas is not None:
+            df_ventas = motor.data_loader.procesar_archivo_ventas(ruta_ventas, datos['ventas'])
+
+        sufijo_pais = pais.upper().replace(' ', '_')
+        fecha = motor.config.fecha_reporte
+
+        if datos['ventas'] is not None and df_stock is not None:
+            # Tabla consolidada por cada opción del selector de liga (con ventas si hay archivo)
+            huella_stock = motor.obtener_huella_dataframe(df_stock)
+            huella_ventas = motor.obtener_huella_dataframe(df_ventas)
+            tabla_todas = None
+            for liga in LIGAS_LOTE:
+                tabla = motor.data_processor.procesar_datos_consolidados(df_stock, pais, liga, df_ventas)
+                if tabla is None:
+                    continue
+                motor.data_processor.guardar_tabla_precalculada(tabla, pais, liga, huella_stock, huella_ventas)
+                _guardar_tabla(tabla, os.path.join(carpeta_tablas, f"consolidado_{liga or 'Todas'}.pkl"), generados)
+
+                nombre_excel = f"STOCK_CONSOLIDADO_{sufijo_pais}_{fecha}.xlsx" if liga is None else f"STOCK_{liga}_{sufijo_pais}_{fecha}.xlsx"
+                excel = motor.construir_excel_consolidado(tabla, os.path.basename(ruta_stock), pais, liga)
+                _escribir(os.path.join(carpeta, nombre_excel), excel, generados)
+                if liga is None:
+                    tabla_todas = tabla
+
+            if tabla_todas is not None:
+                motor.historico.guardar_snapshot(tabla_todas, pais, huella_stock=huella_stock, huella_ventas=huella_ventas)
+            
+            exportacion = motor.calcular_tablas_exportacion_distribuciones(tabla_todas, pais) if tabla_todas is not None else None
+            if exportacion is not None:
+                tablas_distribucion, tiene_ventas = exportacion
+                excel = motor.construir_excel_distribuciones_reales(tablas_distribucion, pais, tiene_ventas)
+                _escribir(os.path.join(carpeta, f"DISTRIBUCION_BODEGAS_{sufijo_pais}_{fecha}.xlsx"), excel, generados)
+
+        elif df_ventas is not None:
+            # Modo solo-ventas: igual que la pestaña cuando solo se sube el archivo de ventas
+            for liga in LIGAS_LOTE:
+                tabla = motor.tabla_solo_ventas(df_ventas, pais, liga)
+                if tabla is None:
+                    continue
+                _guardar_tabla(tabla, os.path.join(carpeta_tablas, f"solo_ventas_{liga or 'Todas'}.pkl"), generados)
+                if liga is None:
+                    excel = motor.construir_excel_consolidado(tabla, os.path.basename(ruta_ventas), pais)
+                    _escribir(os.path.join(carpeta, f"STOCK_CONSOLIDADO_{sufijo_pais}_{fecha}.xlsx"), excel, generados)
+
+        if df_stock is not None:
+            tabla_mvp = motor.tabla_mvps(df_stock, pais)
+            if not tabla_mvp.empty:
+                _guardar_tabla(tabla_mvp, os.path.join(carpeta_tablas, "mvps.pkl"), generados)
+                columnas_real = [col for col in tabla_mvp.columns if col.startswith('Real ')]
+                columnas_optimo = [col for col in tabla_mvp.columns if col.startswith('Óptimo ')]
+                excel = motor.exportar_mvp_excel_con_colores(tabla_mvp, columnas_real, columnas_optimo, datos['etiqueta_mvp'])
+                if excel:
+                    _escribir(os.path.join(carpeta, f"MVP_{datos['etiqueta_mvp'].replace(' ', '_')}_Semaforo_{fecha}.xlsx"), excel, generados)
+
+    except Exception as e:
+        logger.exception('Error procesando %s', pais)
+        resumen['error'] = str(e)
+
+    resumen['segundos'] = round(time.time() - inicio, 2)
+    if perfil:
+        resumen['etapas'] = motor.instrumentacion.registros()
+        motor.instrumentacion.finalizar_registro()
+    return resumen
+
+def ejecutar_lote(entrada: str, salida: str, paises: List[str], procesos: int,
+                  perfil: bool = False) -> List[Dict[str, Any]]:
+    """Reparte los países en un pool de procesos y devuelve el resumen de cada uno"""
+    resumenes = []
+    with ProcessPoolExecutor(max_workers=max(1, min(procesos, len(paises)))) as pool:
+        futuros = {pool.submit(procesar_pais, pais, entrada, salida, perfil): pais for pais in paises}
+        for futuro in as_completed(futuros):
+            resumen = futuro.result()
+            if resumen.get('omitido'):
+                estado = "sin archivos de entrada, omitido"
+            elif resumen['error']:
+                estado = f"ERROR: {resumen['error']}"
+            else:
+                estado = f"{len(resumen['archivos'])} archivos"
+            logger.info('%s: %s (%.2fs)', resumen['pais'], estado, resumen.get('segundos', 0))
+            resumenes.append(resumen)
+    return resumenes
+
+def main(argumentos: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Genera las tablas y los Excel de todos los países sin abrir el tablero")
+    parser.add_argument("entrada", help="Carpeta con los CSV (GUATEMALA.csv, VENTAS_GUATEMALA.csv, ...)")
+    parser.add_argument("--salida", default="resultados_lote", help="Carpeta donde se escriben los resultados")
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1, help="Procesos en paralelo (uno por país)")
+    parser.add_argument("--paises", nargs="+", choices=list(motor.PAISES_MOTOR), default=list(motor.PAISES_MOTOR),
+                        help="Países a procesar (por defecto todos)")
+    parser.add_argument("--perfil", action="store_true",
+                        help="Mide cada etapa (tiempo, filas y memoria) y la escribe como JSON en el log y en resumen.json")
+    parser.add_argument("--log-niveles", default=os.environ.get("NEW_ERA_LOG_NIVELES"),
+                        help='Niveles de log por módulo, p. ej. "motor=DEBUG,motor.mvp=WARNING" (o NEW_ERA_LOG_NIVELES)')
+    args = parser.parse_args(argumentos)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+    motor.configurar_niveles_log(args.log_niveles)
+
+    if not os.path.isdir(args.entrada):
+        logger.error('No existe la carpeta de entrada: %s', args.entrada)
+        return 2
+
+    salida = os.path.join(args.salida, datetime.now().strftime('%Y%m%d'))
+    os.makedirs(salida, exist_ok=True)
+
+    inicio = time.time()
+    resumenes = ejecutar_lote(args.entrada, salida, args.paises, args.procesos, args.perfil)
+    total = time.time() - inicio
+
+    with open(os.path.join(salida, "resumen.json"), 'w', encoding='utf-8') as archivo:
+        json.dump({'segundos_totales': round(total, 2), 'paises': resumenes}, archivo, ensure_ascii=False, indent=2)
+
+    logger.info('Lote completado en %.2fs - resultados en %s', total, salida)
+    return 1 if any(resumen['error'] for resumen in resumenes) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
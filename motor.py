@@ -0,0 +1,5374 @@
+"""
+Motor de procesamiento del New Era Analytics Dashboard, sin dependencia de Streamlit.
+
+Contiene la configuración, los cargadores de archivos, SalesProcessor, DataProcessor
+y los cálculos de MVPs/óptimos. ppp.py es la capa de interfaz sobre este módulo; los
+mismos cálculos pueden ejecutarse en procesos por lotes, perfiles o pruebas de rendimiento
+con la API al final del archivo (cargar_stock, cargar_ventas, tabla_consolidada,
+tabla_solo_ventas, tabla_mvps).
+"""
+import pandas as pd
+import numpy as np
+from datetime import date, datetime
+import os
+import sys
+import time
+import types
+import copy
+import hashlib
+import inspect
+import threading
+import tracemalloc
+import csv
+import logging
+import json
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache, wraps
+from typing import Dict, Optional, List, Tuple, Any, Union, BinaryIO
+from dataclasses import dataclass
+from io import BytesIO
+from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
+from openpyxl.utils import get_column_letter
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # Sin pyarrow se usa siempre el lector de pandas
+    pa = None
+    pa_csv = None
+
+# Un logger por área del motor para poder subir o bajar el nivel de cada una por separado
+# (configurar_niveles_log). Los mensajes de depuración se formatean solo si el nivel DEBUG
+# está activo, y los cálculos que solo sirven para ellos van dentro de isEnabledFor(DEBUG).
+logger = logging.getLogger(__name__)
+logger_ventas = logging.getLogger(f"{__name__}.ventas")
+logger_mvp = logging.getLogger(f"{__name__}.mvp")
+logger_rendimiento = logging.getLogger(f"{__name__}.rendimiento")
+
+def configurar_niveles_log(niveles: Optional[str]) -> Dict[str, str]:
+    """
+    Aplica niveles de log por módulo desde un texto como "motor=DEBUG,motor.mvp=WARNING,lote=INFO"
+    (un nombre solo, como "DEBUG", aplica al motor completo). Devuelve los niveles aplicados;
+    los nombres de nivel desconocidos se ignoran con un aviso.
+    """
+    aplicados = {}
+    for parte in (niveles or "").split(','):
+        parte = parte.strip()
+        if not parte:
+            continue
+        nombre, _, nivel = parte.rpartition('=')
+        nombre = nombre.strip() or __name__
+        nivel = nivel.strip().upper()
+        if not isinstance(logging.getLevelName(nivel), int):
+            logger.warning("Nivel de log desconocido para %s: %s", nombre, nivel)
+            continue
+        logging.getLogger(nombre).setLevel(nivel)
+        aplicados[nombre] = nivel
+    return aplicados
+
+@dataclass
+class StockAnalysisConfig:
+    """Configuración para el análisis de stock"""
+    fecha_reporte: str
+    colores_semaforo: Dict[str, str]
+    umbrales: Dict[str, Tuple[float, float]]
+    # Política del cache de procesamiento: vida útil (segundos) y máximo de entradas (LRU)
+    cache_ttl_segundos: int = 3600
+    cache_max_entradas: int = 32
+    # Lector de CSV para los archivos subidos: "pyarrow" (multihilo) o "pandas" (lector original)
+    motor_lectura_csv: str = "pyarrow"
+    # Archivos de stock más grandes que este umbral (MB) se leen por bloques, agregando sobre la marcha
+    umbral_lectura_por_bloques_mb: int = 256
+    filas_por_bloque: int = 200_000
+    # Escribir cada etapa medida (tiempo, filas y memoria) como una línea JSON en el log 'motor.rendimiento'
+    registrar_etapas_json: bool = False
+    
+    def __post_init__(self):
+        self.fecha_reporte = datetime.now().strftime('%Y%m%d_%H%M')
+        self.colores_semaforo = {
+            "verde": "#28a745",
+            "amarillo": "#ffc107",
+            "rojo": "#dc3545",
+            "gris": "#6c757d"
+        }
+        self.umbrales = {
+            "verde": (1.0, 1.15),
+            "amarillo": (1.15, float('inf')),
+            "rojo": (0.0, 1.0)
+        }
+
+# Instancia de configuración
+config = StockAnalysisConfig(fecha_reporte="", colores_semaforo={}, umbrales={})
+
+# Tablas de stock óptimo MVP: archivo de datos versionado junto a la aplicación
+ARCHIVO_OPTIMOS_MVP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "optimos_mvp.json")
+VERSION_OPTIMOS_MVP = 1
+
+# Cache en disco (Parquet) de los archivos subidos ya limpios y filtrados, por huella de contenido.
+# Subir VERSION_CACHE_CARGAS cuando cambie la limpieza o el filtrado para invalidar lo guardado.
+DIRECTORIO_CACHE_CARGAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache_cargas")
+VERSION_CACHE_CARGAS = 2
+MAX_ARCHIVOS_CACHE_CARGAS = 24
+
+# Tablas consolidadas precalculadas por el proceso por lotes (lote.py), por país, liga y
+# huellas de los archivos: el tablero las usa en lugar de procesar cuando se suben los mismos archivos
+DIRECTORIO_TABLAS_PRECALCULADAS = os.path.join(DIRECTORIO_CACHE_CARGAS, "tablas")
+VERSION_TABLAS_PRECALCULADAS = 1
+MAX_TABLAS_PRECALCULADAS = 120
+
+# Histórico de snapshots diarios (Parquet particionado por país y fecha). No es un cache:
+# nunca se poda. Subir VERSION_HISTORICO si cambian las columnas del snapshot.
+DIRECTORIO_HISTORICO = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".historico")
+VERSION_HISTORICO = 1
+
+# Valores que pd.read_csv interpreta como nulos por defecto; el lector pyarrow usa la misma lista
+LECTURA_CSV_VALORES_NULOS = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+                             '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+
+# Archivo de entrada: ruta en disco, archivo binario abierto (p. ej. el de st.file_uploader) o su contenido
+OrigenArchivo = Union[str, os.PathLike, bytes, BinaryIO]
+TAMANO_BLOQUE_HUELLA = 1024 * 1024
+
+def calcular_huella_contenido(contenido: bytes) -> str:
+    """Calcula una huella corta y estable del contenido de un archivo subido"""
+    return hashlib.blake2b(contenido, digest_size=16).hexdigest()
+
+def calcular_huella_archivo(archivo: BinaryIO) -> str:
+    """
+    Misma huella que calcular_huella_contenido, leyendo el archivo por bloques para no
+    tenerlo completo en memoria. Deja el archivo al inicio.
+    """
+    huella = hashlib.blake2b(digest_size=16)
+    archivo.seek(0)
+    for bloque in iter(lambda: archivo.read(TAMANO_BLOQUE_HUELLA), b''):
+        huella.update(bloque)
+    archivo.seek(0)
+    return huella.hexdigest()
+
+@contextmanager
+def abrir_origen(origen: OrigenArchivo):
+    """
+    Entrega el origen como archivo binario posicionado al inicio y su tamaño en bytes:
+    el del archivo en disco, el que informa la subida (atributo size) o el del contenido.
+    Solo cierra los archivos que abre él mismo.
+    """
+    if isinstance(origen, (bytes, bytearray, memoryview)):
+        yield BytesIO(origen), len(origen)
+    elif isinstance(origen, (str, os.PathLike)):
+        with open(origen, 'rb') as archivo:
+            yield archivo, os.path.getsize(origen)
+    else:
+        tamano = getattr(origen, 'size', None)
+        if tamano is None:
+            tamano = origen.seek(0, os.SEEK_END)
+        origen.seek(0)
+        yield origen, tamano
+
+def obtener_huella_dataframe(df: Optional[pd.DataFrame]) -> Optional[str]:
+    """
+    Obtiene la huella de contenido de un DataFrame para usarla como llave de cache.
+    Usa la huella del archivo original si el cargador la registró en df.attrs;
+    de lo contrario la calcula a partir del hash vectorizado de pandas.
+    """
+    if df is None:
+        return None
+    huella = df.attrs.get('huella')
+    if huella:
+        return huella
+    hashes = pd.util.hash_pandas_object(df, index=False).values
+    columnas = '|'.join(map(str, df.columns)).encode('utf-8')
+    return calcular_huella_contenido(columnas + hashes.tobytes())
+
+def mapear_por_valor(serie: pd.Series, funcion) -> pd.Series:
+    """
+    Aplica funcion una sola vez por cada valor distinto de la columna (incluido el
+    nulo) y devuelve el resultado como columna categórica con categorías ordenadas;
+    así groupby/pivot_table con observed=True dan el mismo orden que sobre texto.
+    """
+    codigos, valores = pd.factorize(serie, use_na_sentinel=False)
+    resultados = pd.Index([funcion(valor) for valor in valores], dtype=object)
+    categorias = resultados.dropna().unique().sort_values()
+    codigos_resultado = categorias.get_indexer(resultados)
+    return pd.Series(pd.Categorical.from_codes(codigos_resultado[codigos], categorias),
+                     index=serie.index, name=serie.name)
+
+def limpiar_columna_texto(serie: pd.Series, mayusculas: bool = False) -> pd.Series:
+    """Equivale a serie.astype(str).str.strip() (y .str.upper()), calculado por valor distinto y en categórico"""
+    if mayusculas:
+        return mapear_por_valor(serie, lambda valor: str(valor).strip().upper())
+    return mapear_por_valor(serie, lambda valor: str(valor).strip())
+
+
+class Notificador:
+    """
+    Destino de los mensajes de progreso del motor. Por defecto solo se registran en el
+    log; la interfaz instala su propio notificador (st.info, st.spinner, ...) con
+    configurar_notificador.
+    """
+    
+    def info(self, mensaje: str) -> None:
+        logger.info(mensaje)
+    
+    def aviso(self, mensaje: str) -> None:
+        logger.warning(mensaje)
+    
+    def error(self, mensaje: str) -> None:
+        logger.error(mensaje)
+    
+    def exito(self, mensaje: str) -> None:
+        logger.info(mensaje)
+    
+    def etapa(self, mensaje: str):
+        """Contexto que envuelve una etapa larga del procesamiento (spinner en la interfaz)"""
+        return nullcontext()
+
+notificador = Notificador()
+
+def configurar_notificador(nuevo: Notificador) -> None:
+    """Reemplaza el notificador del motor (lo usa la interfaz de Streamlit)"""
+    global notificador
+    notificador = nuevo
+
+def _filas_de(valores) -> Optional[int]:
+    """Filas del primer DataFrame entre los valores (o dentro de una tupla de resultado); None si no hay"""
+    for valor in valores:
+        if isinstance(valor, pd.DataFrame):
+            return len(valor)
+        if isinstance(valor, tuple):
+            filas = _filas_de(valor)
+            if filas is not None:
+                return filas
+    return None
+
+class InstrumentacionEtapas:
+    """
+    Mide cada etapa del procesamiento (carga, limpieza, preparación, categorías, ventas,
+    formato, MVPs, HTML y Excel): tiempo, filas de entrada y salida y pico de memoria.
+    
+    Cada hilo (en Streamlit, cada rerun de una sesión) lleva su propio registro, que se
+    abre con iniciar_registro, se lee con registros y se cierra con finalizar_registro.
+    Con config.registrar_etapas_json cada etapa además se escribe como una línea JSON en
+    el log 'motor.rendimiento'. Sin registro abierto ni log JSON las etapas no se miden.
+    
+    El pico de memoria sale de tracemalloc, que solo se activa mientras algún registro lo
+    pida (memoria=True) porque hace más lento el procesamiento; es de todo el proceso, así
+    que con varias sesiones procesando a la vez incluye lo que asignen las demás.
+    """
+    
+    def __init__(self):
+        self._local = threading.local()
+        self._candado = threading.Lock()
+        self._hilos_memoria: set = set()
+        self._tracemalloc_propio = False
+    
+    def _activo(self) -> bool:
+        return getattr(self._local, 'registros', None) is not None or config.registrar_etapas_json
+    
+    def _pila(self) -> List[Dict[str, Any]]:
+        pila = getattr(self._local, 'pila', None)
+        if pila is None:
+            pila = self._local.pila = []
+        return pila
+    
+    def _actualizar_tracemalloc(self, memoria: bool) -> None:
+        with self._candado:
+            # Los hilos terminados sin finalizar_registro (un rerun interrumpido) ya no cuentan
+            vivos = {hilo.ident for hilo in threading.enumerate()}
+            self._hilos_memoria &= vivos
+            if memoria:
+                self._hilos_memoria.add(threading.get_ident())
+            else:
+                self._hilos_memoria.discard(threading.get_ident())
+            
+            if self._hilos_memoria and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._tracemalloc_propio = True
+            elif not self._hilos_memoria and self._tracemalloc_propio:
+                tracemalloc.stop()
+                self._tracemalloc_propio = False
+    
+    def iniciar_registro(self, memoria: bool = False) -> None:
+        """Abre un registro vacío para el hilo actual; memoria=True mide además el pico de memoria"""
+        self._local.registros = []
+        self._local.pila = []
+        self._actualizar_tracemalloc(memoria)
+    
+    def registros(self) -> List[Dict[str, Any]]:
+        """Etapas medidas en el hilo actual, en orden de inicio ('nivel' indica el anidamiento)"""
+        return list(getattr(self._local, 'registros', None) or [])
+    
+    def finalizar_registro(self) -> None:
+        self._local.registros = None
+        self._local.pila = []
+        self._actualizar_tracemalloc(False)
+    
+    @contextmanager
+    def medir(self, nombre: str, filas_entrada: Optional[int] = None, **detalles):
+        """
+        Contexto que mide una etapa. Entrega el diccionario de la etapa para que quien
+        llama complete 'filas_salida' (u otros detalles) antes de salir.
+        """
+        if not self._activo():
+            yield {}
+            return
+        
+        pila = self._pila()
+        memoria = tracemalloc.is_tracing()
+        base = 0
+        if memoria:
+            base, pico = tracemalloc.get_traced_memory()
+            # El pico visto hasta ahora pertenece a la etapa que contiene a esta
+            if pila:
+                pila[-1]['_pico'] = max(pila[-1]['_pico'], pico)
+            tracemalloc.reset_peak()
+        
+        etapa = {'etapa': nombre, 'nivel': len(pila), 'filas_entrada': filas_entrada,
+                 'filas_salida': None, **detalles, '_pico': 0}
+        registros = getattr(self._local, 'registros', None)
+        if registros is not None:
+            registros.append(etapa)
+        pila.append(etapa)
+        inicio = time.perf_counter()
+        try:
+            yield etapa
+        except BaseException as e:
+            etapa['error'] = type(e).__name__
+            raise
+        finally:
+            etapa['segundos'] = round(time.perf_counter() - inicio, 4)
+            if pila and pila[-1] is etapa:
+                pila.pop()
+            pico = etapa.pop('_pico')
+            if memoria and tracemalloc.is_tracing():
+                pico = max(pico, tracemalloc.get_traced_memory()[1])
+                etapa['pico_memoria_mb'] = round((pico - base) / 2**20, 2)
+                if pila:
+                    pila[-1]['_pico'] = max(pila[-1]['_pico'], pico)
+            else:
+                etapa['pico_memoria_mb'] = None
+            
+            if config.registrar_etapas_json:
+                logger_rendimiento.info(json.dumps(etapa, ensure_ascii=False, default=str))
+    
+    def etapa(self, nombre: str):
+        """
+        Decorador que mide cada llamada como la etapa nombre; las filas de entrada y salida
+        son las del primer DataFrame entre los argumentos y en el resultado.
+        """
+        def decorador(funcion):
+            @wraps(funcion)
+            def envoltura(*args, **kwargs):
+                if not self._activo():
+                    return funcion(*args, **kwargs)
+                
+                with self.medir(nombre, _filas_de(list(args) + list(kwargs.values()))) as etapa:
+                    resultado = funcion(*args, **kwargs)
+                    etapa['filas_salida'] = _filas_de((resultado,))
+                    if isinstance(resultado, bytes):
+                        etapa['bytes_salida'] = len(resultado)
+                    return resultado
+            return envoltura
+        return decorador
+
+instrumentacion = InstrumentacionEtapas()
+
+# Funciones decoradas con cache_por_huella, para vaciarlas todas con limpiar_caches_procesamiento
+_caches_por_huella: List[Any] = []
+
+def cache_por_huella(funcion):
+    """
+    Cache en memoria equivalente a st.cache_data para el motor: la llave son los
+    argumentos cuyo nombre no empieza con '_' (los DataFrames se pasan con '_' y se
+    identifican por su huella), con vida útil cache_ttl_segundos y como máximo
+    cache_max_entradas entradas (LRU). Devuelve copias para que quien llama no
+    altere lo guardado.
+    
+    Además de .clear(), la función decorada expone .consultar(*args) (lo guardado o None,
+    sin calcular) y .guardar(valor, *args) (registra un resultado calculado por otra vía,
+    por ejemplo al aplicar un delta de stock).
+    """
+    firma = inspect.signature(funcion)
+    entradas: OrderedDict = OrderedDict()
+    candado = threading.Lock()
+    
+    def llave_de(args, kwargs) -> tuple:
+        argumentos = firma.bind(*args, **kwargs)
+        argumentos.apply_defaults()
+        return tuple((nombre, valor) for nombre, valor in argumentos.arguments.items()
+                     if not nombre.startswith('_'))
+    
+    def registrar(llave, momento, resultado) -> None:
+        with candado:
+            entradas[llave] = (momento, resultado)
+            entradas.move_to_end(llave)
+            while len(entradas) > config.cache_max_entradas:
+                entradas.popitem(last=False)
+    
+    def consultar(*args, **kwargs):
+        llave = llave_de(args, kwargs)
+        with candado:
+            entrada = entradas.get(llave)
+            if entrada is not None and time.monotonic() - entrada[0] < config.cache_ttl_segundos:
+                entradas.move_to_end(llave)
+                return copy.deepcopy(entrada[1])
+        return None
+    
+    @wraps(funcion)
+    def envoltura(*args, **kwargs):
+        llave = llave_de(args, kwargs)
+        ahora = time.monotonic()
+        with candado:
+            entrada = entradas.get(llave)
+            if entrada is not None and ahora - entrada[0] < config.cache_ttl_segundos:
+                entradas.move_to_end(llave)
+                return copy.deepcopy(entrada[1])
+        
+        resultado = funcion(*args, **kwargs)
+        registrar(llave, ahora, resultado)
+        return copy.deepcopy(resultado)
+    
+    def guardar(valor, *args, **kwargs) -> None:
+        registrar(llave_de(args, kwargs), time.monotonic(), copy.deepcopy(valor))
+    
+    def limpiar() -> None:
+        with candado:
+            entradas.clear()
+    
+    def reiniciar_candado() -> None:
+        # Un proceso creado con fork podría heredar el candado tomado por otro hilo
+        nonlocal candado
+        candado = threading.Lock()
+    
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=reiniciar_candado)
+    
+    envoltura.clear = limpiar
+    envoltura.consultar = consultar
+    envoltura.guardar = guardar
+    _caches_por_huella.append(envoltura)
+    return envoltura
+
+def limpiar_caches_procesamiento() -> None:
+    """
+    Vacía los caches en memoria del procesamiento (no los de disco): la próxima llamada
+    recalcula desde los datos, por ejemplo para medir tiempos en frío en benchmark.py
+    """
+    for funcion in _caches_por_huella:
+        funcion.clear()
+
+@dataclass
+class ProductClassification:
+    """Clasificación de productos por silueta"""
+    siluetas_planas: List[str]
+    siluetas_curvas: List[str]
+    
+    def __post_init__(self):
+        self.siluetas_planas = [
+            "950", "5950", "5950 AF", "5950 DOGEAR", "5950 SPLIT PANEL",
+            "950 AF", "950 AF TRUCKER", "950 SS", "950 TRUCKER",
+            "LP 5950", "LP 950", "RC 5950", "RC 950"
+        ]
+        self.siluetas_curvas = [
+            "920", "940", "970", "1920", "3930",
+            "920 TRUCKER", "940 AF", "940 AF TRUCKER",
+            "940 EF", "940 SS", "940 TRUCKER", "970 SS"
+        ]
+    
+        # Mapeo precalculado silueta normalizada -> tipo (búsqueda O(1))
+        self.mapa_siluetas = {silueta: 'Curvas' for silueta in self.siluetas_curvas}
+        self.mapa_siluetas.update({silueta: 'Planas' for silueta in self.siluetas_planas})
+    
+    def clasificar_silueta(self, silueta) -> Optional[str]:
+        """Clasifica una silueta como plana o curva"""
+        if pd.isna(silueta) or not isinstance(silueta, str):
+            return None
+        
+        return self.mapa_siluetas.get(silueta.strip().upper())
+    
+    def clasificar_siluetas(self, siluetas: pd.Series, segmentos: Optional[pd.Series] = None) -> pd.Series:
+        """
+        Clasificación vectorizada de una columna de siluetas.
+        Clasifica una sola vez cada valor distinto y propaga el resultado por códigos
+        (factorize), en lugar de llamar a clasificar_silueta por fila.
+        Si se indica la columna de segmentos, solo se clasifican las filas HEADWEAR.
+        """
+        codigos, valores_unicos = pd.factorize(siluetas)
+        # La posición extra (-1) corresponde a los valores nulos
+        tipos_unicos = np.array([self.clasificar_silueta(valor) for valor in valores_unicos] + [None], dtype=object)
+        tipos = tipos_unicos[codigos]
+        
+        if segmentos is not None:
+            es_headwear = segmentos.eq('HEADWEAR').fillna(False).to_numpy(dtype=bool)
+            tipos = np.where(es_headwear, tipos, None)
+        
+        return pd.Series(tipos, index=siluetas.index, dtype=object)
+
+# Instancia de clasificación
+product_classifier = ProductClassification(siluetas_planas=[], siluetas_curvas=[])
+
+@dataclass
+class CountryData:
+    """Datos específicos de un país"""
+    name: str
+    bodegas: List[str]
+    capacidades: Dict[str, int]
+    tienda_mapping: Dict[str, str] = None
+    
+    def get_total_capacity(self) -> int:
+        """Obtiene la capacidad total del país"""
+        return sum(self.capacidades.values())
+
+class CountryManager:
+    """Gestor de datos de países"""
+    
+    def __init__(self):
+        self.countries = {
+            "Guatemala": CountryData(
+                name="Guatemala",
+                bodegas=[
+                    "NE Cayala", "NE Chimaltenango", "NE Concepcion", "NE Interplaza Escuintla",
+                    "NE InterXela", "NE Metrocentro Outlet", "NE Metronorte", "NE Metroplaza Jutiapa",
+                    "NE Miraflores", "NE Naranjo", "NE Oakland", "NE Outlet Santa clara",
+                    "NE Paseo Antigua", "NE Peri Roosvelt", "NE Plaza Magdalena", "NE Plaza Videre",
+                    "NE Portales", "NE Pradera Chiquimula", "NE Pradera Escuintla", "NE Pradera Huehuetenango",
+                    "NE Pradera Xela", "NE Puerto Barrios", "NE Vistares", "CENTRAL NEW ERA"
+                ],
+                capacidades={
+                    "NE Miraflores": 6989, "NE Oakland": 5276, "NE Cayala": 5109,
+                    "NE Plaza Videre": 2208, "NE Concepcion": 2754, "NE Portales": 6453,
+                    "NE Naranjo": 2790, "NE Peri Roosvelt": 2476, "NE Vistares": 4890,
+                    "NE Chimaltenango": 2357, "NE Pradera Escuintla": 4619, "NE Interplaza Escuintla": 6769,
+                    "NE Pradera Xela": 3827, "NE InterXela": 3907, "NE Pradera Huehuetenango": 4835,
+                    "NE Metroplaza Jutiapa": 2766, "NE Pradera Chiquimula": 4837, "NE Plaza Magdalena": 4710,
+                    "NE Metronorte": 6735, "NE Metrocentro Outlet": 5184, "NE Outlet Santa clara": 4860,
+                    "NE Paseo Antigua": 2952, "NE Puerto Barrios": 3024, "CENTRAL NEW ERA": 0
+                }
+            ),
+            "El Salvador": CountryData(
+                name="El Salvador",
+                bodegas=[
+                    "NE METROCENTRO LOURDES", "NE METROCENTRO SAN MIGUEL", "NE PLAZA MUNDO SOYAPANGO",
+                    "NE USULUTÁN", "New Era Central", "NEW ERA EL PASEO", "NEW ERA METROCENTRO",
+                    "NEW ERA METROCENTRO SANTA ANA", "NEW ERA MULTIPLAZA"
+                ],
+                capacidades={
+                    "NEW ERA METROCENTRO": 4355, "NEW ERA MULTIPLAZA": 5443, "NEW ERA EL PASEO": 4436,
+                    "NEW ERA METROCENTRO SANTA ANA": 5771, "NE USULUTÁN": 5760, "NE METROCENTRO SAN MIGUEL": 3600,
+                    "NE PLAZA MUNDO SOYAPANGO": 3120, "NE METROCENTRO LOURDES": 6912, "New Era Central": 0
+                },
+                tienda_mapping={
+                    # Mapeo: Bodega (Stock) -> Tienda (Ventas)
+                    "NE METROCENTRO LOURDES": "NE METROCENTRO LOURDES",
+                    "NEW ERA MULTIPLAZA": "NEW ERA MULTIPLAZA",
+                    "NEW ERA METROCENTRO": "NE METROCENTRO",
+                    "NEW ERA METROCENTRO SANTA ANA": "NE METROCENTRO SANTA ANA",
+                    "NE PLAZA MUNDO SOYAPANGO": "NE PLAZA MUNDO SOYAPANGO",
+                    "NE USULUTÁN": "NE PLAZA MUNDO USULUTÁN",
+                    "NE METROCENTRO SAN MIGUEL": "NE METROCENTRO SAN MIGUEL",
+                    "NEW ERA EL PASEO": "NEW ERA EL PASEO"
+                    # Nota: "New Era Central" no tiene equivalente en ventas
+                }
+            ),
+            "Honduras": CountryData(
+                name="Honduras",
+                bodegas=[
+                    "NE – Cascadas Mall Tegucigalpa", "NE – City Mall Tegucigalpa", "NE – Mega Mall SPS",
+                    "NE – Multiplaza Tegucigalpa", "NE –Multiplaza SPS"
+                ],
+                capacidades={
+                    "NE – Mega Mall SPS": 2730, "NE –Multiplaza SPS": 6540, "NE – City Mall Tegucigalpa": 5190,
+                    "NE – Cascadas Mall Tegucigalpa": 3816, "NE – Multiplaza Tegucigalpa": 0
+                },
+                tienda_mapping={
+                    # Mapeo: Bodega (Stock) -> Tienda (Ventas)
+                    "NE –Multiplaza SPS": "NE MULTIPLAZA SPS",
+                    "NE – Cascadas Mall Tegucigalpa": "NEW ERA CASCADAS MALL TEGUCIGALPA",
+                    "NE – Multiplaza Tegucigalpa": "NEW ERA MULTIPLAZA TEGUCIGALPA",
+                    "NE – Mega Mall SPS": "NE MEGA  MALL SAN PEDRO SULA",
+                    "NE – City Mall Tegucigalpa": "NE CITY MALL TEGUCIGALPA"
+                }
+            ),
+            "Costa Rica": CountryData(
+                name="Costa Rica",
+                bodegas=[
+                    "Bodega Central NEW ERA", "NE City Mall"
+                ],
+                capacidades={
+                    "NE City Mall": 4260, "Bodega Central NEW ERA": 0
+                },
+                tienda_mapping={
+                    # Mapeo: Bodega (Stock) -> Tienda (Ventas)
+                    "NE City Mall": "NE CITY MAL"
+                    # Nota: "Bodega Central NEW ERA" no tiene equivalente en ventas
+                }
+            ),
+            "PANAMA": CountryData(
+                name="PANAMA",
+                bodegas=[
+                    "Almacén general", "Bodega Central Albrook", "NE Albrookmall",
+                    "NE Metromall", "NE Multiplaza Panamá", "NE Westland"
+                ],
+                capacidades={
+                    "NE Multiplaza Panamá": 6318, "NE Westland": 2972, "NE Metromall": 4422,
+                    "NE Albrookmall": 4224, "Almacén general": 0, "Bodega Central Albrook": 0
+                },
+                tienda_mapping={
+                    # Mapeo: Bodega (Stock) -> Tienda (Ventas)
+                    "NE Westland": "NE WESTLAND MALL",
+                    "NE Multiplaza Panamá": "NE MULTIPLAZA PANAMÁ",
+                    "NE Metromall": "NE METROMALL",
+                    "NE Albrookmall": "NE ALBROOK MALL"
+                    # Nota: "Bodega Central Albrook" y "Almacén general" no tienen equivalente en ventas
+                }
+            )
+        }
+    
+    def get_country_data(self, country: str) -> Optional[CountryData]:
+        """Obtiene los datos de un país"""
+        return self.countries.get(country)
+    
+    def get_bodegas(self, country: str) -> List[str]:
+        """Obtiene las bodegas de un país"""
+        country_data = self.get_country_data(country)
+        return country_data.bodegas if country_data else []
+    
+    def get_capacidades(self, country: str) -> Dict[str, int]:
+        """Obtiene las capacidades de un país"""
+        country_data = self.get_country_data(country)
+        return country_data.capacidades if country_data else {}
+
+# Instancia del gestor de países
+country_manager = CountryManager()
+
+@dataclass
+class CuboVentas:
+    """
+    Cubo de ventas tienda × liga × subcategoría × medida.
+    Se construye una sola vez por archivo de ventas y de él se obtienen tanto las
+    columnas de ventas de la tabla consolidada como las tablas solo-ventas.
+    """
+    pais: str
+    bodegas: List[str]                  # Bodegas mapeadas en orden de aparición en el archivo
+    categorias_ligas: List[str]
+    valores: pd.DataFrame               # Índice (Bodega, Categoria, Subcategoria); columnas = medidas
+    ceros: Dict[str, Any]               # Cero de cada medida con el tipo de dato de su columna
+    claves_accessories: Tuple[str, ...] # Claves con las que ACCESSORIES se reporta en el desglose
+    
+    @staticmethod
+    def subcategorias(categoria: str) -> List[str]:
+        """Subcategorías de una liga dentro del cubo"""
+        return ['Accessories'] if categoria == 'ACCESSORIES' else ['Planas', 'Curvas', 'Apparel']
+    
+    @property
+    def medidas(self) -> List[str]:
+        return list(self.valores.columns)
+    
+    def matriz(self, medida: str) -> pd.DataFrame:
+        """Tabla ancha bodega × (liga, subcategoría) de una medida, con ceros donde no hay ventas"""
+        columnas = pd.MultiIndex.from_tuples(
+            [(categoria, subcat) for categoria in self.categorias_ligas for subcat in self.subcategorias(categoria)],
+            names=['Categoria', 'Subcategoria']
+        )
+        cero = self.ceros[medida]
+        if self.valores.empty:
+            return pd.DataFrame(cero, index=pd.Index(self.bodegas, dtype=object), columns=columnas)
+        
+        tabla = self.valores[medida].unstack(['Categoria', 'Subcategoria'], fill_value=cero)
+        return tabla.reindex(index=pd.Index(self.bodegas, dtype=object), columns=columnas, fill_value=cero)
+    
+    def a_desglose(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Estructura anidada {bodega: {liga: {subcategoria: valor}}} usada por el resto de la aplicación.
+        Con una sola medida el valor es escalar; con varias es {'Cantidad': X, 'USD': Y}.
+        """
+        medidas = self.medidas
+        totales = {medida: self.valores[medida].to_dict() for medida in medidas}
+        
+        def valor(bodega, categoria, subcat):
+            if len(medidas) == 1:
+                return totales[medidas[0]].get((bodega, categoria, subcat), self.ceros[medidas[0]])
+            return {medida: totales[medida].get((bodega, categoria, subcat), self.ceros[medida]) for medida in medidas}
+        
+        desglose = {}
+        for bodega in self.bodegas:
+            desglose[bodega] = {}
+            for categoria in self.categorias_ligas:
+                if categoria == 'ACCESSORIES':
+                    desglose[bodega][categoria] = {
+                        clave: valor(bodega, categoria, 'Accessories') for clave in self.claves_accessories
+                    }
+                else:
+                    desglose[bodega][categoria] = {
+                        subcat: valor(bodega, categoria, subcat) for subcat in self.subcategorias(categoria)
+                    }
+        return desglose
+
+@dataclass
+class SalesProcessor:
+    """Procesador de datos de ventas"""
+    
+    def __init__(self):
+        # Inicializar country_manager
+        self.country_manager = CountryManager()
+        
+        # Sistema de mapeo bidireccional para todos los países
+        # Formato: nombre_canónico -> [variaciones_stock, variaciones_ventas]
+        
+        # GUATEMALA
+        self.guatemala_mappings = {
+            "NE_OAKLAND": ["NE Oakland", "NE OAKLAND"],
+            "NE_CAYALA": ["NE Cayala", "NE CAYALA"],
+            "NE_MIRAFLORES": ["NE Miraflores", "NE MIRAFLORES"],
+            "NE_PORTALES": ["NE Portales", "NE PORTALES"],
+            "NE_INTERXELA": ["NE InterXela", "NE INTERXELA"],
+            "NE_METRONORTE": ["NE Metronorte", "NE METRONORTE"],
+            "NE_CONCEPCION": ["NE Concepcion", "NE CONCEPCION"],
+            "NE_INTERPLAZA_ESCUINTLA": ["NE Interplaza Escuintla", "NE INTERPLAZA ESCUINTLA"],
+            "NE_PRADERA_HUEHUETENANGO": ["NE Pradera Huehuetenango", "NE PRADERA HUEHUETENANGO"],
+            "NE_NARANJO": ["NE Naranjo", "NE NARANJO"],
+            "NE_METROCENTRO_OUTLET": ["NE Metrocentro Outlet", "NEW ERA METROCENTRO VILLA NUEVA"],
+            "NE_VISTARES": ["NE Vistares", "NE PRADERA VISTARES"],
+            "NE_PERI_ROOSVELT": ["NE Peri Roosvelt", "NE PERIROOSVELT"],
+            "NE_OUTLET_SANTA_CLARA": ["NE Outlet Santa clara", "NE SANTA CLARA"],
+            "NE_PLAZA_MAGDALENA": ["NE Plaza Magdalena", "NE PLAZA MAGDALENA"],
+            "NE_PRADERA_CHIQUIMULA": ["NE Pradera Chiquimula", "NE PRADERA CHIQUIMULA"],
+            "NE_PRADERA_ESCUINTLA": ["NE Pradera Escuintla", "NE PRADERA ESCUINTLA"],
+            "NE_PASEO_ANTIGUA": ["NE Paseo Antigua", "NE PASEO ANTIGUA"],
+            "NE_PRADERA_XELA": ["NE Pradera Xela", "NE PRADERA XELA"],
+            "NE_CHIMALTENANGO": ["NE Chimaltenango", "NE CHIMALTENANGO"],
+            "NE_PLAZA_VIDERE": ["NE Plaza Videre", "NE PLAZA VIDERE"],
+            "NE_METROPLAZA_JUTIAPA": ["NE Metroplaza Jutiapa", "NE METROPLAZA JUTIAPA"],
+            "NE_PUERTO_BARRIOS": ["NE Puerto Barrios", "New Era Puerto Barrios"]
+        }
+        
+        # EL SALVADOR
+        self.el_salvador_mappings = {
+            "NE_METROCENTRO_LOURDES": ["NE METROCENTRO LOURDES", "NE METROCENTRO LOURDES"],
+            "NEW_ERA_MULTIPLAZA": ["NEW ERA MULTIPLAZA", "NEW ERA MULTIPLAZA"],
+            "NEW_ERA_METROCENTRO": ["NEW ERA METROCENTRO", "NE METROCENTRO"],
+            "NEW_ERA_METROCENTRO_SANTA_ANA": ["NEW ERA METROCENTRO SANTA ANA", "NE METROCENTRO SANTA ANA"],
+            "NE_PLAZA_MUNDO_SOYAPANGO": ["NE PLAZA MUNDO SOYAPANGO", "NE PLAZA MUNDO SOYAPANGO"],
+            "NE_USULUTN": ["NE USULUTÁN", "NE PLAZA MUNDO USULUTÁN"],
+            "NE_METROCENTRO_SAN_MIGUEL": ["NE METROCENTRO SAN MIGUEL", "NE METROCENTRO SAN MIGUEL"],
+            "NEW_ERA_EL_PASEO": ["NEW ERA EL PASEO", "NEW ERA EL PASEO"]
+        }
+        
+        # HONDURAS
+        self.honduras_mappings = {
+            "NE_MULTIPLAZA_SPS": ["NE –Multiplaza SPS", "NE MULTIPLAZA SPS"],
+            "NE_CASCADAS_MALL_TEGUCIGALPA": ["NE – Cascadas Mall Tegucigalpa", "NEW ERA CASCADAS MALL TEGUCIGALPA"],
+            "NE_MULTIPLAZA_TEGUCIGALPA": ["NE – Multiplaza Tegucigalpa", "NEW ERA MULTIPLAZA TEGUCIGALPA"],
+            "NE_MEGA_MALL_SPS": ["NE – Mega Mall SPS", "NE MEGA\xa0 MALL SAN PEDRO SULA"],
+            "NE_CITY_MALL_TEGUCIGALPA": ["NE – City Mall Tegucigalpa", "NE CITY MALL TEGUCIGALPA"]
+        }
+        
+        # COSTA RICA
+        self.costa_rica_mappings = {
+            "NE_CITY_MALL": ["NE City Mall", "NE CITY MAL"]
+        }
+        
+        # PANAMA
+        self.panama_mappings = {
+            "NE_WESTLAND": ["NE Westland", "NE WESTLAND MALL"],
+            "NE_MULTIPLAZA_PANAMA": ["NE Multiplaza Panamá", "NE MULTIPLAZA PANAMÁ"],
+            "NE_METROMALL": ["NE Metromall", "NE METROMALL"],
+            "NE_ALBROOKMALL": ["NE Albrookmall", "NE ALBROOK MALL"]
+        }
+        
+        # Mapeo consolidado por país
+        self.country_mappings = {
+            "Guatemala": self.guatemala_mappings,
+            "El Salvador": self.el_salvador_mappings,
+            "Honduras": self.honduras_mappings,
+            "Costa Rica": self.costa_rica_mappings,
+            "PANAMA": self.panama_mappings
+        }
+        
+        # Crear mapeos bidireccionales dinámicamente para todos los países
+        self.nombre_to_canonico = {}  # cualquier_variacion -> (nombre_canonico, pais)
+        self.canonico_to_stock = {}   # (nombre_canonico, pais) -> formato_stock
+        self.canonico_to_ventas = {}  # (nombre_canonico, pais) -> formato_ventas
+        
+        for pais, mappings in self.country_mappings.items():
+            for canonico, variaciones in mappings.items():
+                formato_stock = variaciones[0]
+                formato_ventas = variaciones[1]
+                key = (canonico, pais)
+                
+                # Mapear todas las variaciones al canónico con país
+                self.nombre_to_canonico[formato_stock] = key
+                self.nombre_to_canonico[formato_ventas] = key
+                self.nombre_to_canonico[self._normalize_text(formato_stock)] = key
+                self.nombre_to_canonico[self._normalize_text(formato_ventas)] = key
+                
+                # Mapear canónico+país a formatos específicos
+                self.canonico_to_stock[key] = formato_stock
+                self.canonico_to_ventas[key] = formato_ventas
+        
+        # Normalización de nombres del archivo de stock: variaciones exactas conocidas
+        self.mapeo_normalizacion_stock = {
+            # Costa Rica
+            'BODEGA CENTRAL NEW ERA': 'Bodega Central NEW ERA',
+            'Bodega Central New Era': 'Bodega Central NEW ERA',
+            'bodega central new era': 'Bodega Central NEW ERA',
+            'BODEGA CENTRAL NEW ERA ': 'Bodega Central NEW ERA',
+            # Guatemala
+            'central new era': 'CENTRAL NEW ERA',
+            'Central New Era': 'CENTRAL NEW ERA',
+            'Central NEW ERA': 'CENTRAL NEW ERA',
+            'CENTRAL NEW ERA ': 'CENTRAL NEW ERA',
+            # El Salvador
+            'new era central': 'New Era Central',
+            'NEW ERA CENTRAL': 'New Era Central',
+            'New era central': 'New Era Central',
+            'NEW ERA CENTRAL ': 'New Era Central',
+            # Tiendas comunes
+            'NE CITY MALL': 'NE City Mall',
+            'Ne City Mall': 'NE City Mall',
+            'ne city mall': 'NE City Mall',
+            # Honduras - normalizar guiones y espacios
+            'NE - City Mall Tegucigalpa': 'NE – City Mall Tegucigalpa',
+            'NE -City Mall Tegucigalpa': 'NE – City Mall Tegucigalpa',
+            'NE- City Mall Tegucigalpa': 'NE – City Mall Tegucigalpa',
+            'NE-City Mall Tegucigalpa': 'NE – City Mall Tegucigalpa',
+            'NE - CIty Mall Tegucigalpa': 'NE – City Mall Tegucigalpa',  # Con I mayúscula
+            'NE -CIty Mall Tegucigalpa': 'NE – City Mall Tegucigalpa',
+            'NE- CIty Mall Tegucigalpa': 'NE – City Mall Tegucigalpa',
+            'NE-CIty Mall Tegucigalpa': 'NE – City Mall Tegucigalpa',
+            'NE - Cascadas Mall Tegucigalpa': 'NE – Cascadas Mall Tegucigalpa',
+            'NE -Cascadas Mall Tegucigalpa': 'NE – Cascadas Mall Tegucigalpa',
+            'NE- Cascadas Mall Tegucigalpa': 'NE – Cascadas Mall Tegucigalpa',
+            'NE-Cascadas Mall Tegucigalpa': 'NE – Cascadas Mall Tegucigalpa',
+            'NE - Multiplaza Tegucigalpa': 'NE – Multiplaza Tegucigalpa',
+            'NE -Multiplaza Tegucigalpa': 'NE – Multiplaza Tegucigalpa',
+            'NE- Multiplaza Tegucigalpa': 'NE – Multiplaza Tegucigalpa',
+            'NE-Multiplaza Tegucigalpa': 'NE – Multiplaza Tegucigalpa',
+            'NE - Mega Mall SPS': 'NE – Mega Mall SPS',
+            'NE -Mega Mall SPS': 'NE – Mega Mall SPS',
+            'NE- Mega Mall SPS': 'NE – Mega Mall SPS',
+            'NE-Mega Mall SPS': 'NE – Mega Mall SPS',
+            'NE -Multiplaza SPS': 'NE –Multiplaza SPS',
+            'NE- Multiplaza SPS': 'NE –Multiplaza SPS',
+            'NE-Multiplaza SPS': 'NE –Multiplaza SPS',
+            'NE - Multiplaza SPS': 'NE –Multiplaza SPS'
+        }
+        # Reglas por texto similar para Honduras (palabras clave -> nombre canónico), en orden de prioridad
+        self.reglas_bodegas_honduras = [
+            (('cascadas mall',), "NE_CASCADAS_MALL_TEGUCIGALPA"),
+            (('multiplaza', 'tegucigalpa'), "NE_MULTIPLAZA_TEGUCIGALPA"),
+            (('mega mall', 'sps'), "NE_MEGA_MALL_SPS"),
+            (('multiplaza', 'sps'), "NE_MULTIPLAZA_SPS"),
+        ]
+        
+        # Categorías de ligas usadas en los archivos de ventas (USD) por país
+        categorias_ligas_base = {
+            "MLB": ["MLB", "MLB properties"],
+            "NBA": ["NBA", "NBA Properties"],
+            "NFL": ["NFL", "NFL Properties"],
+            "MOTORSPORT": ["MOTORSPORT"],
+            "ENTERTAINMENT": [
+                "NEW ERA BRANDED", "ENTERTAINMENT", "MARCA PAIS", "WARNER BROS",
+                "DISNEY", "LOONEY TUNES", "MARVEL", "DC", "UNIVERSAL", "PARAMOUNT"
+            ],
+            "ACCESSORIES": ["ACCESSORIES"]
+        }
+        # Honduras y PANAMA no usan las variantes "properties"
+        categorias_ligas_honduras = {
+            "MLB": ["MLB"],
+            "NBA": ["NBA"],
+            "NFL": ["NFL"],
+            "MOTORSPORT": ["MOTORSPORT"],
+            "ENTERTAINMENT": [
+                "NEW ERA BRANDED", "ENTERTAINMENT", "MARCA PAIS", "WARNER BROS",
+                "NONE LICENSED", "EUROPEAN SOCCER", "HONDURAS SOCCER"
+            ],
+            "ACCESSORIES": ["ACCESSORIES"]
+        }
+        categorias_ligas_panama = {
+            "MLB": ["MLB"],
+            "NBA": ["NBA"],
+            "NFL": ["NFL"],
+            "MOTORSPORT": ["MOTORSPORT"],
+            "ENTERTAINMENT": [
+                "NEW ERA BRANDED", "ENTERTAINMENT", "MARCA PAIS", "WARNER BROS",
+                "NONE LICENSED", "EUROPEAN SOCCER"
+            ],
+            "ACCESSORIES": ["ACCESSORIES"]
+        }
+        self.categorias_ligas_ventas = {
+            "Guatemala": categorias_ligas_base,
+            "El Salvador": categorias_ligas_base,
+            "Costa Rica": categorias_ligas_base,
+            "Honduras": categorias_ligas_honduras,
+            "PANAMA": categorias_ligas_panama
+        }
+        
+        # Países cuya columna de tienda se busca por nombre exacto (el resto por coincidencia parcial)
+        self.paises_columna_tienda_exacta = ["Honduras", "PANAMA"]
+        self.posibles_columnas_tienda = ['Tienda', 'Bodega', 'Store', 'Location']
+        
+        # Modo cantidades (solo-ventas): listados exactos de tiendas, sin normalizar nombres
+        self.tiendas_solo_ventas = {
+            "Guatemala": [
+                "NE CAYALA", "NE CHIMALTENANGO", "NE CONCEPCION", "NE INTERPLAZA ESCUINTLA",
+                "NE INTERXELA", "NE METRONORTE", "NE METROPLAZA JUTIAPA", "NE MIRAFLORES",
+                "NE NARANJO", "NE OAKLAND", "NE PASEO ANTIGUA", "NE PERIROOSVELT",
+                "NE PLAZA MAGDALENA", "NE PLAZA VIDERE", "NE PORTALES", "NE PRADERA CHIQUIMULA",
+                "NE PRADERA ESCUINTLA", "NE PRADERA HUEHUETENANGO", "NE PRADERA VISTARES",
+                "NE PRADERA XELA", "NE SANTA CLARA", "NEW ERA METROCENTRO VILLA NUEVA",
+                "New Era Puerto Barrios"
+            ],
+            "El Salvador": [
+                "NE METROCENTRO LOURDES", "NEW ERA MULTIPLAZA", "NE METROCENTRO", 
+                "NE METROCENTRO SANTA ANA", "NE PLAZA MUNDO SOYAPANGO", "NE PLAZA MUNDO USULUTÁN",
+                "NE METROCENTRO SAN MIGUEL", "NEW ERA EL PASEO"
+            ]
+        }
+        # Modo cantidades: países que también reportan ACCESSORIES como 'Ventas'
+        self.paises_accessories_con_ventas = ["Honduras", "Costa Rica"]
+        # Modo cantidades: PANAMA toma ACCESSORIES por liga en lugar de por segmento
+        self.paises_accessories_por_liga = ["PANAMA"]
+
+    def normalizar_bodega_stock(self, nombre_bodega: str) -> str:
+        """
+        Normaliza un nombre de bodega del archivo de stock: primero por coincidencia exacta y
+        luego por texto similar. Se aplica una vez por nombre distinto, no por fila.
+        """
+        bodega = self.mapeo_normalizacion_stock.get(nombre_bodega, nombre_bodega)
+        texto = bodega.lower()
+        if 'central' in texto and 'new era' in texto:
+            # Determinar país basado en el formato del nombre
+            if 'bodega' in texto:
+                return 'Bodega Central NEW ERA'  # Costa Rica
+            if texto.startswith('new era'):
+                return 'New Era Central'  # El Salvador
+            return 'CENTRAL NEW ERA'  # Guatemala
+        if 'city mall' in texto and 'ne' in texto:
+            if 'tegucigalpa' in texto:
+                normalizada = self.canonico_to_stock[("NE_CITY_MALL_TEGUCIGALPA", "Honduras")]
+                logger_ventas.debug("NORMALIZANDO HONDURAS: '%s' -> '%s'", bodega, normalizada)
+                return normalizada
+            return self.canonico_to_stock[("NE_CITY_MALL", "Costa Rica")]  # Otros países
+        # Normalización adicional para otras bodegas de Honduras
+        if 'ne' in texto:
+            for palabras_clave, canonico in self.reglas_bodegas_honduras:
+                if all(palabra in texto for palabra in palabras_clave):
+                    return self.canonico_to_stock[(canonico, "Honduras")]
+        return bodega
+
+    def get_canonical_name(self, nombre_bodega, pais=None):
+        """Obtiene el nombre canónico de una bodega desde cualquier variación"""
+        if not nombre_bodega:
+            return None
+        
+        # Intentar mapeo directo
+        if nombre_bodega in self.nombre_to_canonico:
+            canonical_key = self.nombre_to_canonico[nombre_bodega]
+            # Si se especifica país, verificar que coincida
+            if pais and canonical_key[1] != pais:
+                return None
+            return canonical_key
+        
+        # Intentar mapeo normalizado
+        normalizado = self._normalize_text(nombre_bodega)
+        if normalizado in self.nombre_to_canonico:
+            canonical_key = self.nombre_to_canonico[normalizado]
+            # Si se especifica país, verificar que coincida
+            if pais and canonical_key[1] != pais:
+                return None
+            return canonical_key
+        
+        return None
+
+    def normalize_bodega_name(self, nombre_bodega, target_format="stock", pais=None):
+        """
+        Normaliza nombre de bodega a formato específico.
+        target_format: 'stock' o 'ventas'
+        pais: país específico para filtrar mapeos
+        """
+        canonical_key = self.get_canonical_name(nombre_bodega, pais)
+        if not canonical_key:
+            return nombre_bodega  # Devolver original si no hay mapeo
+        
+        if target_format == "stock":
+            return self.canonico_to_stock.get(canonical_key, nombre_bodega)
+        elif target_format == "ventas":
+            return self.canonico_to_ventas.get(canonical_key, nombre_bodega)
+        else:
+            return nombre_bodega
+
+    def get_all_variations_for_country(self, pais):
+        """Obtiene todas las variaciones de nombres para un país específico"""
+        if pais not in self.country_mappings:
+            return []
+        
+        variaciones = []
+        for variaciones_lista in self.country_mappings[pais].values():
+            variaciones.extend(variaciones_lista)
+        return variaciones
+            
+    def _normalize_text(self, text):
+        """Normaliza texto para comparación: mayúsculas, sin espacios extra, normalizar guiones"""
+        if pd.isna(text):
+            return ""
+        # Normalizar diferentes tipos de guiones a guión estándar
+        normalized = str(text).strip().upper()
+        # Reemplazar diferentes tipos de guiones con guión estándar
+        normalized = normalized.replace("–", "-").replace("—", "-").replace("−", "-")
+        # Limpiar espacios múltiples
+        normalized = normalized.replace("  ", " ")
+        return normalized
+    
+    def _buscar_columna_tienda(self, df_ventas: pd.DataFrame, busqueda_exacta: bool) -> Optional[str]:
+        """Encuentra la columna de tienda del archivo de ventas (por nombre exacto o por coincidencia parcial)"""
+        if busqueda_exacta:
+            for col in self.posibles_columnas_tienda:
+                if col in df_ventas.columns:
+                    return col
+            return None
+        
+        for col in df_ventas.columns:
+            if 'tienda' in col.lower() or 'store' in col.lower() or 'bodega' in col.lower():
+                return col
+        return None
+    
+    def _mapear_tiendas_ventas(self, df_ventas: pd.DataFrame, columna_tienda: str, pais: str) -> pd.DataFrame:
+        """
+        Filtra NEW ERA y las tiendas conocidas del país y agrega 'Bodega_Mapeada' (formato stock).
+        La normalización se calcula una vez por tienda distinta y se propaga con map.
+        """
+        df_new_era = df_ventas[df_ventas['U_Marca'].str.upper() == 'NEW ERA']
+        df_mapeado = df_new_era[df_new_era[columna_tienda].isin(self.get_all_variations_for_country(pais))].copy()
+        
+        mapeo_tiendas = {
+            tienda: self.normalize_bodega_name(tienda, target_format="stock", pais=pais)
+            for tienda in df_mapeado[columna_tienda].unique()
+        }
+        df_mapeado['Bodega_Mapeada'] = df_mapeado[columna_tienda].map(mapeo_tiendas)
+        return df_mapeado
+    
+    def _etiquetar_categorias(self, df: pd.DataFrame, categorias_ligas: Dict[str, List[str]],
+                              accessories_por_liga: bool = False) -> Tuple[pd.Series, pd.Series]:
+        """
+        Asigna en una sola pasada la categoría de liga y la subcategoría de cada fila.
+        - ACCESSORIES se define por segmento (o por liga si accessories_por_liga)
+        - HEADWEAR se divide en Planas/Curvas según 'Tipo'; APPAREL va a 'Apparel'
+        Las filas que no pertenecen a ninguna combinación quedan en None.
+        """
+        liga_a_categoria = {
+            liga: categoria
+            for categoria, ligas in categorias_ligas.items()
+            if categoria != 'ACCESSORIES' or accessories_por_liga
+            for liga in ligas
+        }
+        categoria_liga = df['U_Liga'].map(liga_a_categoria).to_numpy(dtype=object)
+        segmento = df['U_Segmento']
+        es_headwear = (segmento == 'HEADWEAR').to_numpy()
+        es_apparel = (segmento == 'APPAREL').to_numpy()
+        if accessories_por_liga:
+            es_accessories = categoria_liga == 'ACCESSORIES'
+        else:
+            es_accessories = (segmento == 'ACCESSORIES').to_numpy()
+        tipo = df['Tipo'].to_numpy(dtype=object)
+        
+        categoria = np.where(es_accessories, 'ACCESSORIES', categoria_liga)
+        subcategoria = np.select(
+            [es_accessories, es_headwear & (tipo == 'Planas'), es_headwear & (tipo == 'Curvas'), es_apparel],
+            ['Accessories', 'Planas', 'Curvas', 'Apparel'],
+            default=None
+        )
+        categoria = np.where(pd.isna(subcategoria), None, categoria)
+        return (pd.Series(categoria, index=df.index, dtype=object),
+                pd.Series(subcategoria, index=df.index, dtype=object))
+    
+    def construir_cubo_ventas(self, df_ventas: pd.DataFrame, pais: str, modo: str = "ventas") -> Optional[CuboVentas]:
+        """
+        Construye el cubo de ventas de un país con un único groupby.
+        - modo 'ventas': USD por bodega/liga/subcategoría (tabla consolidada stock + ventas)
+        - modo 'cantidades': Cantidad y USD (tablas solo-ventas)
+        Retorna None si el archivo no tiene las columnas necesarias o ninguna tienda del país.
+        """
+        if df_ventas is None or df_ventas.empty:
+            return None
+        
+        logger_ventas.debug('Construyendo cubo de ventas %s (%s) - Columnas disponibles: %s', pais, modo, list(df_ventas.columns))
+        
+        # El modo cantidades siempre busca la columna por nombre exacto
+        busqueda_exacta = modo == "cantidades" or pais in self.paises_columna_tienda_exacta
+        columna_tienda = self._buscar_columna_tienda(df_ventas, busqueda_exacta)
+        if columna_tienda is None:
+            logger_ventas.warning('No se encontró columna de tienda en %s', pais)
+            return None
+        
+        columnas_medidas = {'USD': 'USD_Total_SI_CD'}
+        if modo == "cantidades":
+            columnas_medidas = {'Cantidad': 'Cantidad', 'USD': 'USD_Total_SI_CD'}
+        
+        # Verificar que existan todas las columnas necesarias
+        for col in ['U_Marca', 'U_Segmento', 'U_Liga', 'U_Silueta'] + list(columnas_medidas.values()):
+            if col not in df_ventas.columns:
+                logger_ventas.warning('No se encontró columna %s en %s', col, pais)
+                return None
+        
+        logger_ventas.debug('Usando columna de tienda para %s: %s', pais, columna_tienda)
+        
+        if modo == "cantidades" and pais in self.tiendas_solo_ventas:
+            # Listado exacto de tiendas; se conservan los nombres del archivo de ventas
+            df_new_era = df_ventas[df_ventas['U_Marca'].str.upper() == 'NEW ERA']
+            df_mapeado = df_new_era[df_new_era[columna_tienda].isin(self.tiendas_solo_ventas[pais])].copy()
+            df_mapeado['Bodega_Mapeada'] = df_mapeado[columna_tienda]
+        else:
+            df_mapeado = self._mapear_tiendas_ventas(df_ventas, columna_tienda, pais)
+        
+        if df_mapeado.empty:
+            logger_ventas.warning('No hay registros mapeados para procesar en %s', pais)
+            return None
+        
+        if modo == "cantidades":
+            # Conversión numérica segura sobre la selección (no modifica el archivo original)
+            for columna in columnas_medidas.values():
+                df_mapeado[columna] = pd.to_numeric(df_mapeado[columna], errors='coerce').fillna(0)
+            categorias_ligas = self.categorias_ligas_ventas["Guatemala"]
+            accessories_por_liga = pais in self.paises_accessories_por_liga
+            claves_accessories = ('Stock', 'Ventas') if pais in self.paises_accessories_con_ventas else ('Stock',)
+        else:
+            categorias_ligas = self.categorias_ligas_ventas[pais]
+            accessories_por_liga = False
+            claves_accessories = ('Stock', 'Ventas')
+        
+        # Clasificar siluetas solo para HEADWEAR
+        df_mapeado['Tipo'] = product_classifier.clasificar_siluetas(df_mapeado['U_Silueta'], df_mapeado['U_Segmento'])
+        
+        categoria, subcategoria = self._etiquetar_categorias(df_mapeado, categorias_ligas, accessories_por_liga)
+        medidas = df_mapeado[list(columnas_medidas.values())].rename(
+            columns={columna: medida for medida, columna in columnas_medidas.items()}
+        )
+        valores = medidas.groupby([df_mapeado['Bodega_Mapeada'], categoria, subcategoria], sort=False).sum()
+        valores.index.names = ['Bodega', 'Categoria', 'Subcategoria']
+        
+        cubo = CuboVentas(
+            pais=pais,
+            bodegas=list(df_mapeado['Bodega_Mapeada'].unique()),
+            categorias_ligas=list(categorias_ligas.keys()),
+            valores=valores,
+            # Cero con el mismo tipo que produciría la suma de una selección vacía
+            ceros={medida: medidas[medida].iloc[:0].sum() for medida in medidas.columns},
+            claves_accessories=claves_accessories
+        )
+        logger_ventas.debug('Cubo de ventas %s (%s) construido para %s bodegas', pais, modo, len(cubo.bodegas))
+        return cubo
+    
+    def procesar_ventas_pais(self, df_ventas: pd.DataFrame, pais: str) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Procesa el archivo de ventas de un país y retorna ventas (USD) desglosadas por bodega, liga y subcategoría
+        Estructura: {bodega: {liga: {subcategoria: ventas}}}
+        """
+        cubo = self.construir_cubo_ventas(df_ventas, pais, "ventas")
+        return cubo.a_desglose() if cubo is not None else {}
+    
+    def procesar_cantidades_pais(self, df_ventas: pd.DataFrame, pais: str) -> Dict[str, Dict[str, Dict[str, Dict[str, float]]]]:
+        """
+        Procesa el archivo de ventas de un país basado en 'Cantidad' y 'USD_Total_SI_CD' para tablas solo-ventas
+        Estructura: {bodega: {liga: {subcategoria: {'Cantidad': X, 'USD': Y}}}}
+        """
+        cubo = self.construir_cubo_ventas(df_ventas, pais, "cantidades")
+        return cubo.a_desglose() if cubo is not None else {}
+    
+    def procesar_ventas_guatemala(self, df_ventas: pd.DataFrame) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Procesa el archivo de ventas de Guatemala y retorna ventas desglosadas por bodega, liga y subcategoría
+        Estructura: {bodega: {liga: {subcategoria: ventas}}}
+        """
+        return self.procesar_ventas_pais(df_ventas, "Guatemala")
+
+    def procesar_ventas_el_salvador(self, df_ventas: pd.DataFrame) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Procesa el archivo de ventas de El Salvador y retorna ventas desglosadas por bodega, liga y subcategoría
+        Estructura: {bodega: {liga: {subcategoria: ventas}}}
+        """
+        return self.procesar_ventas_pais(df_ventas, "El Salvador")
+
+    def procesar_ventas_costa_rica(self, df_ventas: pd.DataFrame) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Procesa el archivo de ventas de Costa Rica y retorna ventas desglosadas por bodega, liga y subcategoría
+        Estructura: {bodega: {liga: {subcategoria: ventas}}}
+        """
+        return self.procesar_ventas_pais(df_ventas, "Costa Rica")
+
+    def procesar_ventas_honduras(self, df_ventas: pd.DataFrame) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Procesa el archivo de ventas de Honduras y retorna ventas desglosadas por bodega, liga y subcategoría
+        Estructura: {bodega: {liga: {subcategoria: ventas}}}
+        """
+        return self.procesar_ventas_pais(df_ventas, "Honduras")
+
+    def procesar_ventas_panama(self, df_ventas: pd.DataFrame) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Procesa el archivo de ventas de PANAMA y retorna ventas desglosadas por bodega, liga y subcategoría
+        Estructura: {bodega: {liga: {subcategoria: ventas}}}
+        """
+        return self.procesar_ventas_pais(df_ventas, "PANAMA")
+
+    def procesar_cantidades_guatemala(self, df_ventas: pd.DataFrame) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Procesa el archivo de ventas de Guatemala basado en columna 'Cantidad' para tabla solo-ventas
+        Estructura: {bodega: {liga: {subcategoria: {'Cantidad': X, 'USD': Y}}}}
+        """
+        return self.procesar_cantidades_pais(df_ventas, "Guatemala")
+
+    def procesar_cantidades_el_salvador(self, df_ventas: pd.DataFrame) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Procesa el archivo de ventas de El Salvador basado en columna 'Cantidad' para tabla solo-ventas
+        Estructura: {bodega: {liga: {subcategoria: {'Cantidad': X, 'USD': Y}}}}
+        """
+        return self.procesar_cantidades_pais(df_ventas, "El Salvador")
+
+    def procesar_cantidades_honduras(self, df_ventas: pd.DataFrame) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Procesa el archivo de ventas de Honduras basado en columna 'Cantidad' para tabla solo-ventas
+        Estructura: {bodega: {liga: {subcategoria: {'Cantidad': X, 'USD': Y}}}}
+        """
+        return self.procesar_cantidades_pais(df_ventas, "Honduras")
+
+    def procesar_cantidades_costa_rica(self, df_ventas: pd.DataFrame) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Procesa el archivo de ventas de Costa Rica basado en columna 'Cantidad' para tabla solo-ventas
+        Estructura: {bodega: {liga: {subcategoria: {'Cantidad': X, 'USD': Y}}}}
+        """
+        return self.procesar_cantidades_pais(df_ventas, "Costa Rica")
+
+    def procesar_cantidades_panama(self, df_ventas: pd.DataFrame) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Procesa el archivo de ventas de Panama basado en columna 'Cantidad' para tabla solo-ventas
+        Estructura: {bodega: {liga: {subcategoria: {'Cantidad': X, 'USD': Y}}}}
+        """
+        return self.procesar_cantidades_pais(df_ventas, "PANAMA")
+
+    def procesar_usd_simple_guatemala(self, df_ventas: pd.DataFrame) -> Dict[str, float]:
+        """
+        Procesa archivo de ventas de Guatemala para extraer SOLO los USD por bodega
+        Sigue el procedimiento simple de 4 pasos sin mapeos complejos
+        """
+        if df_ventas is None or df_ventas.empty:
+            return {}
+        
+        logger_ventas.debug('Procesando USD simple Guatemala - Columnas: %s', list(df_ventas.columns))
+        
+        # Buscar columna de tienda/bodega
+        columna_tienda = None
+        for col in df_ventas.columns:
+            if 'tienda' in col.lower() or 'store' in col.lower() or 'bodega' in col.lower():
+                columna_tienda = col
+                break
+        
+        if columna_tienda is None:
+            logger_ventas.warning('No se encontró columna de tienda')
+            return {}
+        
+        # Verificar columnas necesarias
+        if 'USD_Total_SI_CD' not in df_ventas.columns:
+            logger_ventas.warning('No se encontró columna USD_Total_SI_CD')
+            return {}
+        
+        # Convertir USD a numérico
+        df_ventas['USD_Total_SI_CD'] = pd.to_numeric(df_ventas['USD_Total_SI_CD'], errors='coerce').fillna(0)
+        
+        # PASO 1: Filtrar U_Marca con datos NEW ERA
+        df_new_era = df_ventas[df_ventas['U_Marca'].str.upper() == 'NEW ERA'].copy()
+        logger_ventas.debug('Registros después de filtrar NEW ERA: %s', len(df_new_era))
+        
+        if df_new_era.empty:
+            return {}
+        
+        # Clasificar siluetas para HEADWEAR
+        df_new_era['Tipo'] = product_classifier.clasificar_siluetas(df_new_era['U_Silueta'], df_new_era['U_Segmento'])
+        
+        # Resultado: USD por bodega
+        usd_por_bodega = {}
+        
+        # Procesar por bodega
+        for bodega in df_new_era[columna_tienda].unique():
+            df_bodega = df_new_era[df_new_era[columna_tienda] == bodega]
+            total_usd_bodega = 0
+            
+            # PASO 2: HEADWEAR - Filtrar U_Segmento con HEADWEAR y separar planas y curvas
+            df_headwear = df_bodega[df_bodega['U_Segmento'] == 'HEADWEAR']
+            df_planas = df_headwear[df_headwear['Tipo'] == 'Planas']
+            df_curvas = df_headwear[df_headwear['Tipo'] == 'Curvas']
+            
+            # PASO 3: Sumar USD_TOTAL_SI_CD para planas y curvas
+            total_usd_bodega += df_planas['USD_Total_SI_CD'].sum()
+            total_usd_bodega += df_curvas['USD_Total_SI_CD'].sum()
+            
+            # PASO 4a: APPAREL - Filtrar U_Segmento con APPAREL
+            df_apparel = df_bodega[df_bodega['U_Segmento'] == 'APPAREL']
+            total_usd_bodega += df_apparel['USD_Total_SI_CD'].sum()
+            
+            # PASO 4b: ACCESSORIES - Filtrar U_Segmento con ACCESSORIES
+            df_accessories = df_bodega[df_bodega['U_Segmento'] == 'ACCESSORIES']
+            total_usd_bodega += df_accessories['USD_Total_SI_CD'].sum()
+            
+            # Guardar total por bodega
+            usd_por_bodega[bodega] = total_usd_bodega
+            
+            if total_usd_bodega > 0:
+                logger_ventas.debug('  %s: $%.2f', bodega, total_usd_bodega)
+        
+        logger_ventas.debug('USD simple procesado para %s bodegas', len(usd_por_bodega))
+        if logger_ventas.isEnabledFor(logging.DEBUG):
+            logger_ventas.debug('TOTAL USD SIMPLE: $%.2f', sum(usd_por_bodega.values()))
+        
+        return usd_por_bodega
+
+# Instancia del procesador de ventas
+sales_processor = SalesProcessor()
+
+@dataclass
+class LeagueCategories:
+    """Categorías de ligas deportivas"""
+    categories: Dict[str, List[str]]
+    
+    def __post_init__(self):
+        self.categories = {
+            "MLB": ["MLB", "MLB properties"],
+            "NBA": ["NBA", "NBA Properties"],
+            "NFL": ["NFL", "NFL Properties"],
+            "MOTORSPORT": ["MOTORSPORT"],
+            "ENTERTAINMENT": [
+                "NEW ERA BRANDED",
+                "ENTERTAINMENT",
+                "MARCA PAIS",
+                "WARNER BROS",
+                "NONE LICENSED",
+                "MLS",
+                "MILB",
+                "GUATEMALA SOCCER LEAGUE",
+                "WBC",
+                "EUROPEAN SOCCER",
+                "FEDERACION DE BASEBALL PUERTO RICO",
+                "FEDERACION DOMINICANA DE BASEBALL",
+                "BASEBALL FEDERATION"
+            ],
+            "ACCESSORIES": ["ACCESSORIES"]
+        }
+    
+    def get_category_values(self, category: str) -> List[str]:
+        """Obtiene los valores de una categoría"""
+        return self.categories.get(category, [])
+    
+    def get_all_categories(self) -> Dict[str, List[str]]:
+        """Obtiene todas las categorías"""
+        return self.categories
+
+# Instancia de categorías de liga
+league_categories = LeagueCategories(categories={})
+
+class StockAnalyzer:
+    """Analizador de stock con métricas de cumplimiento"""
+    
+    def __init__(self, config: StockAnalysisConfig):
+        self.config = config
+    
+    def obtener_color_semaforo(self, total_headwear: int, capacidad: int) -> str:
+        """Determina el color del semáforo basado en el porcentaje de cumplimiento"""
+        if capacidad == 0:
+            return "rojo"
+        
+        # Aplicar nueva fórmula: (((TOTAL HEADWEAR/CAPACIDAD)*100%)-100%)
+        porcentaje_cumplimiento = ((total_headwear / capacidad) * 100) - 100
+        
+        if porcentaje_cumplimiento < 0:  # Valores negativos
+            return "rojo"
+        elif 0 <= porcentaje_cumplimiento <= 15:  # 0% a 15%
+            return "verde"
+        else:  # Mayores al 15%
+            return "amarillo"
+    
+    def calculate_performance_metrics(self, stock_data: List[Dict]) -> Dict[str, Any]:
+        """Calcula métricas de rendimiento del stock"""
+        if not stock_data:
+            return {}
+        
+        total_stock = sum(item.get('stock', 0) for item in stock_data)
+        total_capacity = sum(item.get('capacity', 0) for item in stock_data if item.get('capacity', 0) > 0)
+        
+        return {
+            'total_stock': total_stock,
+            'total_capacity': total_capacity,
+            'capacity_utilization': total_stock / total_capacity if total_capacity > 0 else 0,
+            'low_stock_stores': len([item for item in stock_data if self._is_low_stock(item)]),
+            'overstock_stores': len([item for item in stock_data if self._is_overstock(item)])
+        }
+    
+    def _is_low_stock(self, item: Dict) -> bool:
+        """Verifica si una tienda tiene stock bajo"""
+        capacity = item.get('capacity', 0)
+        stock = item.get('stock', 0)
+        if capacity == 0:
+            return False
+        return stock < (capacity * 0.95)
+    
+    def _is_overstock(self, item: Dict) -> bool:
+        """Verifica si una tienda tiene sobrestock"""
+        capacity = item.get('capacity', 0)
+        stock = item.get('stock', 0)
+        if capacity == 0:
+            return False
+        return stock > capacity
+
+# Instancia del analizador
+stock_analyzer = StockAnalyzer(config)
+
+@dataclass
+class DeltaStock:
+    """Cambios que un archivo delta aplicó sobre el stock cargado"""
+    huella_anterior: str
+    huella_delta: str
+    bodegas: List[str]          # Bodegas (nombre del archivo) con filas reemplazadas o nuevas
+    estilos: List[str]          # U_Estilo de esas filas (para saber si tocan los MVPs)
+    filas_reemplazadas: int
+    filas_nuevas: int
+
+class DataLoader:
+    """Cargador de datos con validación robusta"""
+    
+    def __init__(self, country_manager: CountryManager):
+        self.country_manager = country_manager
+        self.required_columns = ['U_Marca', 'U_Silueta', 'Stock_Actual', 'Bodega', 'U_Liga', 'U_Segmento']
+        
+        # Columnas que se leen de los archivos de stock: las del consolidado más las de MVPs
+        self.columnas_stock = self.required_columns + ['U_Estilo', 'Codigo_SAP', 'U_Coleccion_NE', 'U_Descripcion', 'U_Talla', 'Talla']
+        self.columnas_texto_stock = ['U_Silueta', 'Stock_Actual', 'Bodega', 'U_Liga', 'U_Segmento']
+        # Columnas de pocos valores distintos: se leen como categóricas y se limpian por categoría
+        self.columnas_categoricas_stock = ['Bodega', 'U_Liga', 'U_Segmento', 'U_Silueta', 'U_Marca']
+        
+        # Configuración centralizada de nombres de archivos permitidos
+        self.nombres_permitidos = {
+            'GUATEMALA': {
+                'stock': 'GUATEMALA',
+                'ventas': 'VENTAS_GUATEMALA'
+            },
+            'EL_SALVADOR': {
+                'stock': 'EL_SALVADOR', 
+                'ventas': 'VENTAS_EL_SALVADOR'
+            },
+            'PANAMA': {
+                'stock': 'PANAMA',
+                'ventas': 'VENTAS_PANAMA'
+            },
+            'HONDURAS': {
+                'stock': 'HONDURAS',
+                'ventas': 'VENTAS_HONDURAS'
+            },
+            'COSTA_RICA': {
+                'stock': 'COSTA_RICA',
+                'ventas': 'VENTAS_COSTA_RICA'
+            },
+            'GT': {
+                'stock': 'GT',
+                'ventas': 'GT'
+            },
+            # CONFIGURACIONES TEMPORALES - ESPACIO ADICIONAL
+            'GUATEMALA_TEMP': {
+                'stock': 'GUATEMALA',
+                'ventas': 'VENTAS_GUATEMALA'
+            },
+            'EL_SALVADOR_TEMP': {
+                'stock': 'EL_SALVADOR', 
+                'ventas': 'VENTAS_EL_SALVADOR'
+            },
+            'HONDURAS_TEMP': {
+                'stock': 'HONDURAS',
+                'ventas': 'VENTAS_HONDURAS'
+            },
+            'COSTA_RICA_TEMP': {
+                'stock': 'COSTA_RICA',
+                'ventas': 'VENTAS_COSTA_RICA'
+            },
+            'PANAMA_TEMP': {
+                'stock': 'PANAMA',
+                'ventas': 'VENTAS_PANAMA'
+            },
+            'PUERTO_RICO_TEMP': {
+                'stock': 'PUERTO_RICO',
+                'ventas': 'VENTAS_PUERTO_RICO'
+            },
+            'GUATEMALA_MVP_TEMP': {
+                'stock': 'GUATEMALA',
+                'ventas': 'VENTAS_GUATEMALA'
+            }
+        }
+    
+    @instrumentacion.etapa("carga_stock")
+    def procesar_archivo_stock(self, origen: OrigenArchivo, pais: str) -> pd.DataFrame:
+        """
+        Lee, limpia y filtra un archivo de stock (o lo recupera del cache en disco si ya se
+        procesó). origen es la ruta, el archivo subido o su contenido; pais es la clave de
+        nombres_permitidos. Los archivos grandes se leen por bloques desde el mismo archivo,
+        sin cargar su contenido completo en memoria.
+        """
+        start_time = time.time()
+        with abrir_origen(origen) as (archivo, tamano):
+            huella = calcular_huella_archivo(archivo)
+            df = self._leer_cache_carga('stock', pais, huella)
+            desde_cache = df is not None
+            
+            if not desde_cache:
+                # Para archivos de óptimos, procesamiento mínimo
+                if pais == 'GT':
+                    df = self._read_csv(archivo, proyectar=False)
+                    # Solo limpiar nombres de columnas para archivo de óptimos
+                    df.columns = df.columns.str.strip()
+                elif tamano > config.umbral_lectura_por_bloques_mb * 1024 * 1024:
+                    # Archivo regional muy grande: lectura por bloques con memoria acotada
+                    df = self._leer_stock_por_bloques(archivo, pais)
+                    self._validate_columns(df, pais)
+                    df = self._compactar_stock(df)
+                else:
+                    # Procesamiento completo para archivos de stock normales
+                    df = self._read_csv(archivo)
+                    df = self._clean_data(df)
+                    df = self._filter_by_country(df, pais)
+                    self._validate_columns(df, pais)
+                    df = self._compactar_stock(df)
+                
+                self._guardar_cache_carga('stock', pais, huella, df)
+        
+        # Huella del archivo original: llave de cache para el procesamiento posterior
+        df.attrs['huella'] = huella
+        
+        elapsed_time = time.time() - start_time
+        origen = "cache" if desde_cache else "CSV"
+        if logger.isEnabledFor(logging.INFO):
+            logger.info('Archivo %s cargado exitosamente desde %s en %.2fs - Registros: %s',
+                        pais, origen, elapsed_time, f"{len(df):,}")
+        return df
+    
+    @instrumentacion.etapa("carga_ventas")
+    def procesar_archivo_ventas(self, origen: OrigenArchivo, clave: str) -> pd.DataFrame:
+        """Lee un archivo de ventas completo (todas las columnas) desde su ruta, el archivo subido o su contenido, con cache en disco"""
+        with abrir_origen(origen) as (archivo, _):
+            huella = calcular_huella_archivo(archivo)
+            df = self._leer_cache_carga('ventas', clave, huella)
+            
+            if df is None:
+                # Leer CSV sin validaciones específicas de stock (todas las columnas)
+                df = self._leer_csv_pyarrow(archivo) if config.motor_lectura_csv == "pyarrow" else None
+                if df is None:
+                    archivo.seek(0)
+                    df = pd.read_csv(
+                        archivo,
+                        encoding='utf-8',
+                        delimiter=';',
+                        low_memory=False,
+                        on_bad_lines='skip'
+                    )
+                
+                # Limpieza básica sin columnas específicas
+                df.columns = df.columns.str.strip()
+                self._guardar_cache_carga('ventas', clave, huella, df)
+        
+        df.attrs['huella'] = huella
+        return df
+    
+    @instrumentacion.etapa("delta_stock")
+    def aplicar_delta_stock(self, df_stock: pd.DataFrame, contenido: bytes, pais: str) -> Tuple[pd.DataFrame, DeltaStock]:
+        """
+        Aplica un archivo delta del ERP (mismas columnas que el archivo de stock, solo las filas
+        cambiadas) sobre un stock ya cargado. Cada (Bodega, Codigo_SAP) del delta reemplaza todas
+        sus filas anteriores; las que no existían se agregan y una fila con Stock_Actual 0 deja la
+        combinación en cero. La huella del resultado combina la del stock anterior y la del delta.
+        """
+        return self._aplicar_delta_stock_cache(df_stock, contenido, pais, obtener_huella_dataframe(df_stock),
+                                               calcular_huella_contenido(contenido))
+    
+    @cache_por_huella
+    def _aplicar_delta_stock_cache(_self, _df_stock: pd.DataFrame, _contenido: bytes, pais: str,
+                                   huella_anterior: str, huella_delta: str) -> Tuple[pd.DataFrame, DeltaStock]:
+        """Aplicación cacheada: en cada rerun del tablero el mismo delta no se vuelve a leer ni a combinar"""
+        delta = _self._read_csv(BytesIO(_contenido))
+        delta.columns = delta.columns.str.strip()
+        faltantes = [col for col in _df_stock.columns if col not in delta.columns]
+        if 'Codigo_SAP' not in _df_stock.columns or faltantes:
+            raise ValueError(f"El archivo delta debe tener las mismas columnas que el de stock (faltan: {faltantes or ['Codigo_SAP']})")
+        delta = _self._clean_data(delta)
+        
+        # Llaves del delta antes de filtrar por marca: una fila que deja de ser NEW ERA también reemplaza
+        llaves_delta = set(zip(delta['Bodega'].astype(str), _self._normalizar_codigo_sap(delta['Codigo_SAP'])))
+        bodegas_delta = {bodega for bodega, _ in llaves_delta}
+        
+        # Solo se arman llaves para las filas de las bodegas que aparecen en el delta
+        en_bodegas = _df_stock['Bodega'].isin(bodegas_delta).to_numpy()
+        candidatas = _df_stock[en_bodegas]
+        llaves_candidatas = pd.Series(list(zip(candidatas['Bodega'].astype(str),
+                                               _self._normalizar_codigo_sap(candidatas['Codigo_SAP']))),
+                                      index=candidatas.index, dtype=object)
+        reemplazar = np.zeros(len(_df_stock), dtype=bool)
+        reemplazar[en_bodegas] = llaves_candidatas.isin(llaves_delta).to_numpy()
+        
+        nuevas = _self._filter_by_country(delta, pais)[list(_df_stock.columns)].copy()
+        # Mismo tipo de dato que el stock cargado en las columnas no categóricas (códigos como texto o número)
+        for col in nuevas.columns:
+            if col == 'Stock_Actual' or isinstance(_df_stock[col].dtype, pd.CategoricalDtype):
+                continue
+            try:
+                nuevas[col] = nuevas[col].astype(_df_stock[col].dtype)
+            except (TypeError, ValueError):
+                pass
+        
+        reemplazadas = _df_stock[reemplazar]
+        df = pd.concat([_df_stock[~reemplazar], nuevas], ignore_index=True)
+        df = _self._compactar_stock(df)
+        df.attrs['huella'] = calcular_huella_contenido(f"{huella_anterior}+{huella_delta}".encode())
+        
+        columnas_cambios = [col for col in ['Bodega', 'U_Estilo'] if col in _df_stock.columns]
+        cambios = pd.concat([reemplazadas[columnas_cambios].astype(str), nuevas[columnas_cambios].astype(str)])
+        resumen = DeltaStock(
+            huella_anterior=huella_anterior,
+            huella_delta=huella_delta,
+            bodegas=sorted(cambios['Bodega'].unique()),
+            estilos=sorted(cambios['U_Estilo'].unique()) if 'U_Estilo' in cambios.columns else [],
+            filas_reemplazadas=int(reemplazar.sum()),
+            filas_nuevas=len(nuevas)
+        )
+        logger.info('Delta aplicado a %s: %s filas reemplazadas, %s nuevas, %s bodegas afectadas',
+                    pais, resumen.filas_reemplazadas, resumen.filas_nuevas, len(resumen.bodegas))
+        return df, resumen
+    
+    @staticmethod
+    def _normalizar_codigo_sap(serie: pd.Series) -> np.ndarray:
+        """Codigo_SAP como texto comparable entre archivos (123 y 123.0 son el mismo código)"""
+        return serie.astype(str).str.strip().str.replace(r'\.0$', '', regex=True).to_numpy()
+    
+    def _ruta_cache_carga(self, tipo: str, pais: str, huella: str) -> str:
+        """Ruta del archivo Parquet que guarda un archivo subido ya procesado"""
+        return os.path.join(DIRECTORIO_CACHE_CARGAS, f"{tipo}_{pais}_{huella}_v{VERSION_CACHE_CARGAS}.parquet")
+    
+    def _leer_cache_carga(self, tipo: str, pais: str, huella: str) -> Optional[pd.DataFrame]:
+        """Recupera del cache en disco un archivo ya procesado; None si no existe o no se puede leer"""
+        ruta = self._ruta_cache_carga(tipo, pais, huella)
+        if not os.path.exists(ruta):
+            return None
+        
+        try:
+            df = pd.read_parquet(ruta)
+        except Exception as e:
+            logger.warning('No se pudo leer el cache de carga %s: %s', ruta, e)
+            return None
+        
+        # Parquet devuelve None en los nulos de texto; read_csv usa NaN y el resto del código lo espera así
+        for col in df.columns[df.dtypes == object]:
+            df[col] = df[col].where(df[col].notna(), np.nan)
+        
+        os.utime(ruta)
+        return df
+    
+    def _guardar_cache_carga(self, tipo: str, pais: str, huella: str, df: pd.DataFrame) -> None:
+        """Guarda en disco el archivo procesado; un fallo solo se registra y la carga continúa"""
+        ruta = self._ruta_cache_carga(tipo, pais, huella)
+        try:
+            os.makedirs(DIRECTORIO_CACHE_CARGAS, exist_ok=True)
+            # Escritura atómica: otra sesión nunca lee un Parquet a medio escribir
+            ruta_temporal = f"{ruta}.{os.getpid()}.tmp"
+            df.to_parquet(ruta_temporal)
+            os.replace(ruta_temporal, ruta)
+        except Exception as e:
+            logger.warning('No se pudo guardar el cache de carga %s: %s', ruta, e)
+            return
+        
+        self._podar_cache_cargas()
+    
+    def _podar_cache_cargas(self) -> None:
+        """Elimina los archivos de cache menos usados cuando se supera MAX_ARCHIVOS_CACHE_CARGAS"""
+        try:
+            rutas = [os.path.join(DIRECTORIO_CACHE_CARGAS, nombre)
+                     for nombre in os.listdir(DIRECTORIO_CACHE_CARGAS) if nombre.endswith('.parquet')]
+            rutas.sort(key=os.path.getmtime, reverse=True)
+            for ruta in rutas[MAX_ARCHIVOS_CACHE_CARGAS:]:
+                os.remove(ruta)
+        except OSError as e:
+            logger.warning('No se pudo depurar el cache de cargas: %s', e)
+    
+    def _read_csv(self, archivo, proyectar: bool = True) -> pd.DataFrame:
+        """Lee el archivo CSV con configuración optimizada.
+        
+        Con el motor pyarrow (y proyectar=True) solo se leen las columnas de
+        columnas_stock y las de pocos valores llegan como categóricas; si pyarrow
+        no está disponible o el archivo trae filas irregulares se usa pandas.
+        """
+        if config.motor_lectura_csv == "pyarrow":
+            if proyectar:
+                df = self._leer_csv_pyarrow(archivo, self.columnas_stock,
+                                            self.columnas_texto_stock, self.columnas_categoricas_stock)
+            else:
+                df = self._leer_csv_pyarrow(archivo, columnas_texto=self.columnas_texto_stock)
+            if df is not None:
+                return df
+            archivo.seek(0)
+        
+        return pd.read_csv(
+            archivo,
+            encoding='utf-8',
+            delimiter=';',
+            dtype={'U_Silueta': str, 'Stock_Actual': str, 'Bodega': str, 'U_Liga': str, 'U_Segmento': str},
+            low_memory=False,
+            on_bad_lines='skip'
+        )
+    
+    def _leer_stock_por_bloques(self, archivo, pais: str) -> pd.DataFrame:
+        """
+        Lee un archivo de stock por bloques de filas_por_bloque filas: cada bloque se
+        limpia, se filtra (NEW ERA y bodegas del país) y se agrega sumando Stock_Actual
+        por todas las demás columnas de columnas_stock. En memoria solo quedan las
+        sumas parciales, cuyo tamaño depende del catálogo por bodega y no del archivo.
+        
+        El consolidado y los MVPs solo suman Stock_Actual por subconjuntos de esas
+        columnas, así que el resultado es equivalente al de la lectura completa.
+        """
+        lector = pd.read_csv(
+            archivo,
+            encoding='utf-8',
+            delimiter=';',
+            dtype=str,
+            usecols=lambda nombre: nombre.strip() in self.columnas_stock,
+            chunksize=config.filas_por_bloque,
+            on_bad_lines='skip'
+        )
+        
+        parciales = []
+        filas_parciales = 0
+        filas_leidas = 0
+        claves = None
+        columnas = None
+        for bloque in lector:
+            filas_leidas += len(bloque)
+            bloque = self._filter_by_country(self._clean_data(bloque), pais)
+            if claves is None:
+                columnas = list(bloque.columns)
+                claves = [col for col in columnas if col != 'Stock_Actual']
+            parciales.append(self._agregar_stock(bloque, claves))
+            filas_parciales += len(parciales[-1])
+            
+            # Compactar las sumas parciales cuando crecen más que un bloque
+            if filas_parciales > config.filas_por_bloque:
+                parciales = [self._agregar_stock(pd.concat(parciales, ignore_index=True), claves)]
+                filas_parciales = len(parciales[0])
+        
+        if not parciales:
+            return pd.DataFrame(columns=self.columnas_stock)
+        
+        agregado = self._agregar_stock(pd.concat(parciales, ignore_index=True), claves)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info('Lectura por bloques %s: %s filas leídas, %s combinaciones agregadas',
+                        pais, f"{filas_leidas:,}", f"{len(agregado):,}")
+        
+        # Los bloques se leen como texto; en las columnas sin dtype fijo en _read_csv los tipos
+        # se infieren igual que read_csv, pero solo sobre los valores ya agregados
+        columnas_inferidas = [col for col in claves if col not in self.columnas_texto_stock]
+        if columnas_inferidas:
+            buffer_claves = BytesIO(agregado[columnas_inferidas].to_csv(sep=';', index=False).encode('utf-8'))
+            inferidas = pd.read_csv(buffer_claves, encoding='utf-8', delimiter=';', low_memory=False)
+            for col in columnas_inferidas:
+                agregado[col] = inferidas[col].to_numpy()
+        return agregado[columnas]
+    
+    def _agregar_stock(self, df: pd.DataFrame, claves: List[str]) -> pd.DataFrame:
+        """Suma Stock_Actual por las columnas clave, conservando nulos y el orden de aparición"""
+        return df.groupby(claves, dropna=False, sort=False, observed=True)['Stock_Actual'].sum().reset_index()
+    
+    def _leer_csv_pyarrow(self, archivo: BinaryIO, columnas: Optional[List[str]] = None,
+                          columnas_texto: Optional[List[str]] = None,
+                          columnas_categoricas: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """
+        Lee un CSV separado por ';' con el lector multihilo de pyarrow.
+        
+        Reproduce el resultado de pd.read_csv: mismos valores nulos, fechas como
+        texto, columnas vacías como float y nulos de texto como NaN. Devuelve None
+        (para usar pandas) si pyarrow no está instalado o hay filas irregulares,
+        que read_csv trata distinto (omite las largas y rellena las cortas).
+        """
+        if pa_csv is None:
+            return None
+        
+        # Encabezado real del archivo: los nombres pueden traer espacios que luego se limpian
+        archivo.seek(0)
+        primera_linea = archivo.readline().decode('utf-8-sig').rstrip('\r\n')
+        encabezados = next(csv.reader([primera_linea], delimiter=';'), [])
+        por_nombre_limpio = {nombre.strip(): nombre for nombre in encabezados}
+        
+        columnas_incluidas = None
+        if columnas is not None:
+            columnas_incluidas = [nombre for nombre in encabezados if nombre.strip() in columnas]
+        tipos = {}
+        for col in columnas_texto or []:
+            if col in por_nombre_limpio:
+                tipos[por_nombre_limpio[col]] = pa.string()
+        for col in columnas_categoricas or []:
+            if col in por_nombre_limpio:
+                tipos[por_nombre_limpio[col]] = pa.dictionary(pa.int32(), pa.string())
+        
+        filas_irregulares = []
+        
+        def _registrar_fila_irregular(fila):
+            filas_irregulares.append(fila.number)
+            return 'skip'
+        
+        def _leer(tipos_columnas):
+            archivo.seek(0)
+            return pa_csv.read_csv(
+                archivo,
+                parse_options=pa_csv.ParseOptions(delimiter=';', invalid_row_handler=_registrar_fila_irregular),
+                convert_options=pa_csv.ConvertOptions(
+                    include_columns=columnas_incluidas,
+                    column_types=tipos_columnas,
+                    null_values=LECTURA_CSV_VALORES_NULOS,
+                    strings_can_be_null=True
+                )
+            )
+        
+        try:
+            tabla = _leer(tipos)
+            # pandas no interpreta fechas por defecto: esas columnas se vuelven a leer como texto
+            columnas_fecha = {campo.name: pa.string() for campo in tabla.schema
+                              if pa.types.is_temporal(campo.type)}
+            if columnas_fecha:
+                tabla = _leer({**tipos, **columnas_fecha})
+        except (pa.ArrowException, UnicodeDecodeError) as e:
+            logger.warning('Lector pyarrow no disponible para este archivo, se usa pandas: %s', e)
+            return None
+        
+        if filas_irregulares:
+            logger.info('%s filas irregulares en el CSV: se usa el lector de pandas', len(filas_irregulares))
+            return None
+        
+        df = tabla.to_pandas()
+        for campo in tabla.schema:
+            if pa.types.is_null(campo.type):
+                df[campo.name] = np.nan
+            elif pa.types.is_string(campo.type) or pa.types.is_large_string(campo.type):
+                df[campo.name] = df[campo.name].where(df[campo.name].notna(), np.nan)
+        return df
+    
+    def _compactar_stock(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Representación compacta del stock ya filtrado: dimensiones de pocos valores
+        como categóricas (solo con las categorías presentes) y Stock_Actual en el
+        entero más pequeño posible cuando todos sus valores son enteros.
+        """
+        tipos = {}
+        for col in self.columnas_categoricas_stock:
+            if col in df.columns:
+                tipos[col] = 'category'
+        df = df.astype(tipos)
+        for col in tipos:
+            df[col] = df[col].cat.remove_unused_categories()
+        if 'Stock_Actual' in df.columns:
+            df['Stock_Actual'] = pd.to_numeric(df['Stock_Actual'], downcast='integer')
+        return df
+    
+    @instrumentacion.etapa("clean_data")
+    def _clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Limpia y normaliza los datos"""
+        df.columns = df.columns.str.strip()
+        df['Bodega'] = limpiar_columna_texto(df['Bodega'])
+        df['U_Liga'] = limpiar_columna_texto(df['U_Liga'], mayusculas=True)
+        df['U_Segmento'] = limpiar_columna_texto(df['U_Segmento'], mayusculas=True)
+        
+        # Conversión segura de stock a numérico
+        df['Stock_Actual'] = pd.to_numeric(
+            df['Stock_Actual'].str.replace(',', ''),
+            errors='coerce'
+        ).fillna(0)
+        
+        return df
+    
+    def _filter_by_country(self, df: pd.DataFrame, pais: str) -> pd.DataFrame:
+        """Filtra datos por país y marca NEW ERA"""
+        # Primero filtrar por marca NEW ERA
+        df_new_era = df[df['U_Marca'].str.upper() == 'NEW ERA']
+        
+        # Luego filtrar por bodegas del país
+        bodegas = self.country_manager.get_bodegas(pais)
+        return df_new_era[df_new_era['Bodega'].isin(bodegas)] if bodegas else df_new_era
+    
+    def _validate_columns(self, df: pd.DataFrame, pais: str) -> None:
+        """Valida que existan las columnas requeridas"""
+        if not all(col in df.columns for col in self.required_columns):
+            logger.error('Faltan columnas requeridas en el archivo de %s', pais)
+            notificador.error(f"❌ Faltan columnas requeridas en el archivo de {pais}")
+            raise ValueError(f"Faltan columnas requeridas: {self.required_columns}")
+
+# Instancia del cargador de datos
+data_loader = DataLoader(country_manager)
+
+class DataProcessor:
+    """Procesador de datos consolidados"""
+    
+    def __init__(self, country_manager: CountryManager, league_categories: LeagueCategories, 
+                 product_classifier: ProductClassification):
+        self.country_manager = country_manager
+        self.league_categories = league_categories
+        self.product_classifier = product_classifier
+    
+    @instrumentacion.etapa("consolidado")
+    def procesar_datos_consolidados(self, df: pd.DataFrame, pais: str, selected_league: str = None, df_ventas: pd.DataFrame = None) -> Optional[pd.DataFrame]:
+        """
+        Procesa los datos para generar tabla con múltiples niveles de encabezados.
+        El resultado se guarda en cache usando la huella de contenido de los archivos
+        (más país y liga), sin convertir los DataFrames a registros.
+        """
+        if df is None or df.empty:
+            return None
+        return self._procesar_datos_consolidados_cache(
+            df, pais, selected_league, df_ventas,
+            obtener_huella_dataframe(df), obtener_huella_dataframe(df_ventas)
+        )
+    
+    @instrumentacion.etapa("tabla_mvps")
+    def obtener_tabla_mvps(self, df: pd.DataFrame, pais: str) -> pd.DataFrame:
+        """Tabla de stock real vs óptimo de los MVPs del país, cacheada por la huella del stock"""
+        if df is None or df.empty:
+            return pd.DataFrame()
+        return self._obtener_tabla_mvps_cache(df, pais, obtener_huella_dataframe(df))
+    
+    @cache_por_huella
+    def _obtener_tabla_mvps_cache(_self, _df: pd.DataFrame, pais: str, huella_stock: str) -> pd.DataFrame:
+        return PAISES_MOTOR[pais]["mvps"](_df)
+    
+    @instrumentacion.etapa("delta_tablas")
+    def aplicar_delta_stock(self, df_anterior: pd.DataFrame, df_nuevo: pd.DataFrame, delta: DeltaStock,
+                            pais: str) -> None:
+        """
+        Deja en cache los resultados del stock con delta sin recorrer el archivo completo:
+        - el resumen agregado se recalcula solo para las bodegas afectadas (todas las filas
+          que se normalizan a ellas) y se combina con el resto del resumen anterior; la tabla
+          consolidada, los totales y las ventas se arman desde ahí como siempre;
+        - si el delta no toca códigos MVP, la tabla de MVPs anterior sigue siendo válida.
+        """
+        huella_nueva = obtener_huella_dataframe(df_nuevo)
+        
+        if pais in self.country_manager.countries and self._obtener_resumen_stock.consultar(self, df_nuevo, pais, huella_nueva) is None:
+            resumen = self._obtener_resumen_stock(df_anterior, pais, delta.huella_anterior)
+            afectadas = {sales_processor.normalizar_bodega_stock(bodega.strip()) for bodega in delta.bodegas}
+            bodegas_normalizadas = mapear_por_valor(
+                df_nuevo['Bodega'], lambda bodega: sales_processor.normalizar_bodega_stock(str(bodega).strip())
+            )
+            filas_afectadas = df_nuevo[bodegas_normalizadas.isin(afectadas).to_numpy()].copy()
+            resumen_afectadas = self._resumir_stock(self._prepare_data(filas_afectadas))
+            
+            resumen = pd.concat([resumen[~resumen['Bodega'].isin(afectadas)], resumen_afectadas], ignore_index=True)
+            resumen = resumen.sort_values(['Bodega', 'U_Liga', 'U_Segmento', 'Tipo'], na_position='last', ignore_index=True)
+            self._obtener_resumen_stock.guardar(resumen, self, df_nuevo, pais, huella_nueva)
+            logger.info('Resumen de stock %s actualizado con el delta en %s bodegas', pais, len(afectadas))
+        
+        if pais in PAISES_MOTOR:
+            tabla_mvp = self._obtener_tabla_mvps_cache.consultar(self, df_anterior, pais, delta.huella_anterior)
+            if tabla_mvp is not None and not tabla_mvp.empty:
+                codigos_mvp = set(tabla_mvp.index.get_level_values(0).astype(str)) - {'TOTAL'}
+                if codigos_mvp.isdisjoint(delta.estilos):
+                    self._obtener_tabla_mvps_cache.guardar(tabla_mvp, self, df_nuevo, pais, huella_nueva)
+    
+    @cache_por_huella
+    def _procesar_datos_consolidados_cache(_self, _df: pd.DataFrame, pais: str, selected_league: str,
+                                           _df_ventas: Optional[pd.DataFrame], huella_stock: str,
+                                           huella_ventas: Optional[str]) -> Optional[pd.DataFrame]:
+        """
+        Procesamiento consolidado cacheado; los DataFrames no se hashean, la llave es su huella.
+        La tabla de stock de todas las ligas sale de _obtener_base_consolidada; aquí solo se
+        proyecta a la liga seleccionada (totales, ventas y formato).
+        """
+        if _df is None or _df.empty:
+            return None
+        
+        tabla_precalculada = _self._leer_tabla_precalculada(pais, selected_league, huella_stock, huella_ventas)
+        if tabla_precalculada is not None:
+            logger.info('Tabla consolidada %s tomada de los resultados precalculados', pais)
+            return tabla_precalculada
+        
+        # Copia local: el procesamiento no debe alterar los datos de ventas de la sesión
+        df_ventas = _df_ventas.copy() if _df_ventas is not None else None
+        
+        with notificador.etapa(f"Generando tabla consolidada {pais}..."):
+            logger.info('Iniciando procesamiento de datos consolidados para %s', pais)
+            
+            tabla_final = _self._obtener_base_consolidada(_df, pais, huella_stock)
+            tabla_final = _self._calculate_totals(tabla_final, pais, selected_league)
+            
+            # Agregar columna Ventas (USD) para ACCESSORIES solo si hay datos de ventas
+            if (df_ventas is not None and pais in ["Guatemala", "El Salvador", "Costa Rica", "Honduras", "PANAMA"] and 
+                'ACCESSORIES - Stock' in tabla_final.columns and 
+                'ACCESSORIES - Ventas (USD)' not in tabla_final.columns):
+                tabla_final['ACCESSORIES - Ventas (USD)'] = 0.0
+            
+            # Agregar columnas de ventas si hay datos de ventas para Guatemala, El Salvador, Costa Rica, Honduras o PANAMA
+            if df_ventas is not None and pais in ["Guatemala", "El Salvador", "Costa Rica", "Honduras", "PANAMA"]:
+                tabla_final = _self._add_sales_columns(tabla_final, df_ventas, selected_league, pais)
+            
+            # Calcular TOTAL (USD) SOLO si hay archivo de ventas cargado
+            if df_ventas is not None and pais in ["Guatemala", "El Salvador", "Costa Rica", "Honduras", "PANAMA"]:
+                if selected_league:
+                    # Para liga específica, solo sumar columnas de ventas de esa liga
+                    columnas_usd = [col for col in tabla_final.columns if 
+                                   ('Ventas (USD)' in col or ('Ventas' in col and 'Stock' not in col)) and 
+                                   selected_league in col]
+                    logger.info('TOTAL (USD) calculado solo para liga: %s', selected_league)
+                else:
+                    # Para todas las ligas, sumar todas las columnas de ventas
+                    columnas_usd = [col for col in tabla_final.columns if 'Ventas (USD)' in col or ('Ventas' in col and 'Stock' not in col)]
+                    logger.info("TOTAL (USD) calculado para todas las ligas")
+                
+                if columnas_usd:
+                    tabla_final['TOTAL (USD)'] = tabla_final[columnas_usd].sum(axis=1)
+                else:
+                    tabla_final['TOTAL (USD)'] = 0.0
+            # Si no hay archivo de ventas, NO crear la columna TOTAL (USD)
+            
+            # Determinar si hay datos de ventas para pasarlo a _format_table
+            hay_ventas = df_ventas is not None and pais in ["Guatemala", "El Salvador", "Costa Rica", "Honduras", "PANAMA"]
+            tabla_final = _self._format_table(tabla_final, selected_league, hay_ventas)
+            
+            logger.info('Procesamiento completado para %s', pais)
+            return tabla_final
+    
+    def _ruta_tabla_precalculada(self, pais: str, selected_league: Optional[str], huella_stock: str,
+                                 huella_ventas: Optional[str]) -> str:
+        """Ruta del Parquet de una tabla consolidada precalculada"""
+        nombre = f"consolidado_{pais.replace(' ', '_')}_{selected_league or 'Todas'}_{huella_stock}_{huella_ventas or 'sin_ventas'}"
+        return os.path.join(DIRECTORIO_TABLAS_PRECALCULADAS, f"{nombre}_v{VERSION_TABLAS_PRECALCULADAS}.parquet")
+    
+    def _leer_tabla_precalculada(self, pais: str, selected_league: Optional[str], huella_stock: str,
+                                 huella_ventas: Optional[str]) -> Optional[pd.DataFrame]:
+        """Tabla consolidada guardada por el proceso por lotes; None si no existe o no se puede leer"""
+        ruta = self._ruta_tabla_precalculada(pais, selected_league, huella_stock, huella_ventas)
+        if not os.path.exists(ruta):
+            return None
+        try:
+            return pd.read_parquet(ruta)
+        except Exception as e:
+            logger.warning('No se pudo leer la tabla precalculada %s: %s', ruta, e)
+            return None
+    
+    def guardar_tabla_precalculada(self, tabla: pd.DataFrame, pais: str, selected_league: Optional[str],
+                                   huella_stock: str, huella_ventas: Optional[str]) -> None:
+        """Guarda una tabla consolidada para que el tablero la cargue sin procesar (escritura atómica)"""
+        ruta = self._ruta_tabla_precalculada(pais, selected_league, huella_stock, huella_ventas)
+        try:
+            os.makedirs(DIRECTORIO_TABLAS_PRECALCULADAS, exist_ok=True)
+            ruta_temporal = f"{ruta}.{os.getpid()}.tmp"
+            tabla.to_parquet(ruta_temporal)
+            os.replace(ruta_temporal, ruta)
+        except Exception as e:
+            logger.warning('No se pudo guardar la tabla precalculada %s: %s', ruta, e)
+            return
+        
+        # Conservar solo las tablas más recientes
+        try:
+            rutas = [os.path.join(DIRECTORIO_TABLAS_PRECALCULADAS, nombre)
+                     for nombre in os.listdir(DIRECTORIO_TABLAS_PRECALCULADAS) if nombre.endswith('.parquet')]
+            rutas.sort(key=os.path.getmtime, reverse=True)
+            for ruta_antigua in rutas[MAX_TABLAS_PRECALCULADAS:]:
+                os.remove(ruta_antigua)
+        except OSError as e:
+            logger.warning('No se pudo depurar las tablas precalculadas: %s', e)
+    
+    @cache_por_huella
+    def _obtener_base_consolidada(_self, _df: pd.DataFrame, pais: str, huella_stock: str) -> pd.DataFrame:
+        """
+        Tabla de stock bodega × liga × tipo con todas las ligas, que no depende de la liga
+        seleccionada: se calcula una vez por archivo (huella) y país, y cambiar de liga
+        solo vuelve a ejecutar las proyecciones de _procesar_datos_consolidados_cache.
+        """
+        resumen = _self._obtener_resumen_stock(_df, pais, huella_stock)
+        return _self._tabla_desde_resumen(resumen, _self._create_base_table(pais), pais)
+    
+    @cache_por_huella
+    def _obtener_resumen_stock(_self, _df: pd.DataFrame, pais: str, huella_stock: str) -> pd.DataFrame:
+        """
+        Cubo agregado del stock (bodega × liga × segmento × tipo): la única pasada sobre
+        todas las filas del archivo. Un delta de stock lo actualiza solo en las bodegas
+        afectadas (aplicar_delta_stock) sin volver a recorrer el archivo completo.
+        """
+        # Copia local: el procesamiento normaliza columnas y no debe alterar los datos de la sesión
+        df = _df.copy()
+        
+        # Debug específico para Honduras (recorre el archivo completo: solo con nivel DEBUG)
+        if pais == "Honduras" and logger.isEnabledFor(logging.DEBUG):
+            logger.debug('INICIO PROCESAMIENTO HONDURAS: %s filas, columnas %s', len(df), list(df.columns))
+            if 'Bodega' in df.columns:
+                logger.debug('- Bodegas únicas en datos: %s', df['Bodega'].unique())
+                city_mall_records = df[df['Bodega'].str.contains('City Mall Tegucigalpa', na=False)]
+                logger.debug("- Registros con 'City Mall Tegucigalpa': %s", len(city_mall_records))
+                if len(city_mall_records) > 0:
+                    logger.debug('- Stock total bruto City Mall: %s', city_mall_records['Stock_Actual'].sum())
+        
+        return _self._resumir_stock(_self._prepare_data(df))
+    
+    @instrumentacion.etapa("prepare_data")
+    def _prepare_data(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Prepara los datos para el procesamiento"""
+        # Asegurar que U_Silueta sea string y manejar valores NaN (una vez por silueta distinta)
+        df['U_Silueta'] = limpiar_columna_texto(df['U_Silueta'], mayusculas=True)
+        
+        # Normalizar nombres de bodegas para consistencia
+        if 'Bodega' in df.columns:
+            # Normalizar una sola vez por nombre distinto; la columna queda categórica
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Bodegas originales encontradas: %s', pd.unique(df['Bodega']))
+            df['Bodega'] = mapear_por_valor(
+                df['Bodega'], lambda bodega: sales_processor.normalizar_bodega_stock(str(bodega).strip())
+            )
+            logger.debug('Bodegas después de normalización: %s', df['Bodega'].cat.categories.tolist())
+        
+        # Clasificar solo productos HEADWEAR por silueta
+        df['Tipo'] = self.product_classifier.clasificar_siluetas(df['U_Silueta'], df['U_Segmento'])
+        
+        # Filtrar solo siluetas válidas de HEADWEAR, Apparel y Accessories
+        df_filtrado = df[(df['Tipo'].notna()) | (df['U_Segmento'] == 'APPAREL') | (df['U_Segmento'] == 'ACCESSORIES')].copy()
+        
+        # Debug específico para Honduras después del filtrado
+        if 'Bodega' in df_filtrado.columns and logger.isEnabledFor(logging.DEBUG):
+            bodegas_en_datos = df_filtrado['Bodega'].unique()
+            if any('City Mall Tegucigalpa' in bodega for bodega in bodegas_en_datos):
+                logger.debug("Después del filtrado, bodegas con 'City Mall Tegucigalpa': %s", [b for b in bodegas_en_datos if 'City Mall Tegucigalpa' in b])
+                city_mall_data = df_filtrado[df_filtrado['Bodega'].str.contains('City Mall Tegucigalpa', na=False)]
+                if not city_mall_data.empty:
+                    logger.debug('Stock total NE City Mall Tegucigalpa: %s', city_mall_data['Stock_Actual'].sum())
+                    logger.debug('Registros por segmento: %s', city_mall_data['U_Segmento'].value_counts().to_dict())
+        
+        return df_filtrado
+    
+    def _create_base_table(self, pais: str) -> pd.DataFrame:
+        """Crea la tabla base con las bodegas del país"""
+        bodegas = self.country_manager.get_bodegas(pais)
+        if pais == "Honduras":
+            logger.debug('Creando tabla base para Honduras con bodegas: %s', bodegas)
+        return pd.DataFrame(index=bodegas)
+    
+    @instrumentacion.etapa("process_categories")
+    def _process_categories(self, df: pd.DataFrame, tabla_final: pd.DataFrame, pais: str, selected_league: str = None, df_ventas: pd.DataFrame = None) -> pd.DataFrame:
+        """
+        Procesa todas las categorías de liga (SIEMPRE la tabla completa).
+        El stock se recorre una sola vez: un groupby por bodega × liga × segmento × tipo
+        deja un resumen de pocas filas, y cada categoría se arma sobre ese resumen.
+        """
+        return self._tabla_desde_resumen(self._resumir_stock(df), tabla_final, pais)
+    
+    @instrumentacion.etapa("process_categories.resumen")
+    def _resumir_stock(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Única pasada sobre el stock preparado: suma y número de registros por bodega × liga × segmento × tipo"""
+        resumen = df.groupby(['Bodega', 'U_Liga', 'U_Segmento', 'Tipo'], dropna=False, observed=True)['Stock_Actual'].agg(
+            Stock_Actual='sum', Registros='size'
+        ).reset_index()
+        return resumen.astype({'Bodega': object, 'U_Liga': object, 'U_Segmento': object})
+    
+    @instrumentacion.etapa("process_categories.tabla")
+    def _tabla_desde_resumen(self, resumen: pd.DataFrame, tabla_final: pd.DataFrame, pais: str) -> pd.DataFrame:
+        """
+        Arma la tabla bodega × liga × tipo a partir del resumen. Las columnas se unen a la
+        tabla en un solo join y las bodegas faltantes se agregan con un reindex.
+        """
+        categorias_a_procesar = self.league_categories.get_all_categories()
+        logger.info("Procesando todas las categorías para tabla completa")
+        
+        ligas_resumen = resumen['U_Liga'].str.upper()
+        
+        partes = []
+        pivot_anterior, categoria_anterior = None, None
+        for categoria, valores in categorias_a_procesar.items():
+            if categoria == 'ACCESSORIES':
+                # Para ACCESSORIES, filtrar por segmento en lugar de liga
+                resumen_cat = resumen[resumen['U_Segmento'].str.upper() == 'ACCESSORIES']
+            else:
+                resumen_cat = resumen[ligas_resumen.isin([v.upper() for v in valores])]
+            registros = int(resumen_cat['Registros'].sum())
+            logger.info('Categoría: %s, Registros filtrados: %s', categoria, registros)
+            
+            # Debug específico para Honduras
+            if pais == "Honduras" and logger.isEnabledFor(logging.DEBUG):
+                logger.debug('%s Honduras - Registros encontrados: %s', categoria, registros)
+                if registros > 0:
+                    logger.debug('Bodegas en %s: %s', categoria, resumen_cat['Bodega'].unique())
+                    logger.debug('Stock por bodega en %s: %s', categoria, resumen_cat.groupby('Bodega')['Stock_Actual'].sum().to_dict())
+            
+            if registros == 0:
+                logger.warning('No se encontraron datos para la categoría %s', categoria)
+                continue
+            
+            if categoria == 'ACCESSORIES':
+                # Para ACCESSORIES, columnas Stock y Ventas (USD)
+                accessories_stock = self._process_accessories_stock(resumen_cat)
+                partes.append(accessories_stock.add_prefix(f"{categoria} - "))
+                
+                # Igual que la versión por categorías: ACCESSORIES repite las columnas de la
+                # última liga procesada (con su prefijo) y su Apparel
+                if pivot_anterior is not None:
+                    apparel_anterior = pivot_anterior[f"{categoria_anterior} - Apparel"].rename('Apparel')
+                    partes.append(pd.concat([pivot_anterior, apparel_anterior], axis=1).add_prefix(f"{categoria} - "))
+            else:
+                # Planas y Curvas por pivot, Apparel solo en bodegas con headwear de la liga
+                pivot = self._process_headwear_types(resumen_cat)
+                apparel = self._process_apparel(resumen_cat)
+                pivot = pivot.join(apparel, how='left').fillna(0)
+                pivot.columns = [f"{categoria} - {col}" for col in pivot.columns]
+                logger.debug('Columnas generadas: %s', list(pivot.columns))
+                partes.append(pivot)
+                pivot_anterior, categoria_anterior = pivot, categoria
+        
+        # SIEMPRE procesar Accessories para tabla completa
+        partes.append(self._process_accessories(resumen))
+        
+        tabla_final = tabla_final.join(pd.concat(partes, axis=1), how='left')
+        
+        # Asegurar que todas las bodegas del país aparezcan en la tabla final
+        bodegas_faltantes = [b for b in self.country_manager.get_bodegas(pais) if b not in tabla_final.index]
+        if bodegas_faltantes:
+            tabla_final = tabla_final.reindex(tabla_final.index.append(pd.Index(bodegas_faltantes)))
+        
+        return tabla_final.fillna(0).astype(int)
+    
+
+    def _process_headwear_types(self, df_cat: pd.DataFrame) -> pd.DataFrame:
+        """Procesa tipos de headwear (planas y curvas)"""
+        return df_cat[df_cat['Tipo'].notna()].pivot_table(
+            index='Bodega',
+            columns='Tipo',
+            values='Stock_Actual',
+            aggfunc='sum',
+            fill_value=0,
+            observed=True
+        )
+    
+    def _process_apparel(self, df_cat: pd.DataFrame) -> pd.Series:
+        """Procesa datos de apparel"""
+        return df_cat[df_cat['U_Segmento'] == 'APPAREL'].groupby('Bodega', observed=True)['Stock_Actual'].sum().rename('Apparel')
+    
+    def _process_accessories(self, df: pd.DataFrame) -> pd.Series:
+        """Procesa datos de accessories"""
+        return df[df['U_Segmento'] == 'ACCESSORIES'].groupby('Bodega', observed=True)['Stock_Actual'].sum().rename('TOTAL ACCESSORIES')
+    
+    def _process_accessories_stock(self, df_cat: pd.DataFrame) -> pd.DataFrame:
+        """Procesa datos de stock para ACCESSORIES como columnas independientes"""
+        # Crear DataFrame con Stock para ACCESSORIES
+        accessories_data = df_cat.groupby('Bodega', observed=True)['Stock_Actual'].sum()
+        
+        # Crear DataFrame con columnas Stock y Ventas (USD)
+        result = pd.DataFrame(index=accessories_data.index)
+        result['Stock'] = accessories_data
+        result['Ventas (USD)'] = 0.0  # Inicializar con 0, se llenará con datos reales si están disponibles
+        
+        return result
+    
+    @instrumentacion.etapa("calculate_totals")
+    def _calculate_totals(self, tabla_final: pd.DataFrame, pais: str, selected_league: str = None) -> pd.DataFrame:
+        """Calcula totales y métricas"""
+        
+        
+        # Calcular totales según el filtro aplicado
+        if selected_league:
+            # Para liga específica, calcular totales SOLO de esa liga y SOLO Stock
+            tabla_final['TOTAL PLANAS'] = tabla_final[[col for col in tabla_final.columns if str(col) == f'{selected_league} - Planas']].sum(axis=1)
+            tabla_final['TOTAL CURVAS'] = tabla_final[[col for col in tabla_final.columns if str(col) == f'{selected_league} - Curvas']].sum(axis=1)
+            tabla_final['TOTAL APPAREL'] = tabla_final[[col for col in tabla_final.columns if str(col) == f'{selected_league} - Apparel']].sum(axis=1)
+            logger.info('Calculando totales solo para liga: %s', selected_league)
+        else:
+            # Columnas PLANAS: Buscar solo las que terminan en "Planas" (excluyendo ACCESSORIES y Ventas)
+            columnas_planas = [col for col in tabla_final.columns if str(col).endswith('- Planas') and 'ACCESSORIES' not in str(col) and 'Ventas' not in str(col)]
+            tabla_final['TOTAL PLANAS'] = tabla_final[columnas_planas].sum(axis=1) if columnas_planas else 0
+            
+            # Columnas CURVAS: Buscar solo las que terminan en "Curvas" (excluyendo ACCESSORIES y Ventas)
+            columnas_curvas = [col for col in tabla_final.columns if str(col).endswith('- Curvas') and 'ACCESSORIES' not in str(col) and 'Ventas' not in str(col)]
+            tabla_final['TOTAL CURVAS'] = tabla_final[columnas_curvas].sum(axis=1) if columnas_curvas else 0
+            
+            # Columnas APPAREL: Buscar solo las que terminan en "Apparel" (excluyendo ACCESSORIES y Ventas)
+            columnas_apparel = [col for col in tabla_final.columns if str(col).endswith('- Apparel') and 'ACCESSORIES' not in str(col) and 'Ventas' not in str(col)]
+            tabla_final['TOTAL APPAREL'] = tabla_final[columnas_apparel].sum(axis=1) if columnas_apparel else 0
+        
+        # TOTAL HEADWEAR y TOTAL STOCK se calculan igual en ambos casos
+        tabla_final['TOTAL HEADWEAR'] = tabla_final['TOTAL PLANAS'] + tabla_final['TOTAL CURVAS']
+        tabla_final['TOTAL STOCK'] = tabla_final[['TOTAL HEADWEAR', 'TOTAL APPAREL']].sum(axis=1)
+        
+        # Calcular TOTAL USD sumando todas las columnas de ventas USD
+        # Buscar todas las columnas que contengan 'Ventas (USD)' para sumarlas
+        columnas_usd = [col for col in tabla_final.columns if 'Ventas (USD)' in str(col)]
+        if columnas_usd:
+            tabla_final['TOTAL USD'] = tabla_final[columnas_usd].sum(axis=1)
+        else:
+            # Si no hay columnas de ventas USD, inicializar en 0
+            tabla_final['TOTAL USD'] = 0
+        
+        # Solo calcular capacidad y % cumplimiento cuando NO hay selected_league
+        if not selected_league:
+            # Agregar capacidad
+            capacidades = self.country_manager.get_capacidades(pais)
+            tabla_final['CAPACIDAD EN TIENDA'] = tabla_final.index.map(lambda x: capacidades.get(x, 0))
+            
+            # Calcular % DE CUMPLIMIENTO
+            tabla_final['% DE CUMPLIMIENTO'] = (((tabla_final['TOTAL HEADWEAR'] / tabla_final['CAPACIDAD EN TIENDA']) * 100) - 100).replace([np.inf, -np.inf], 0).fillna(0)
+            tabla_final['% DE CUMPLIMIENTO'] = tabla_final['% DE CUMPLIMIENTO'].apply(lambda x: f"{x:.2f}%" if pd.notnull(x) and x != 0 else "N/A")
+            
+        
+        # Ordenar por TOTAL STOCK
+        tabla_final = tabla_final.sort_values('TOTAL STOCK', ascending=False)
+        
+        # Agregar fila de TOTALES
+        return self._add_totals_row(tabla_final, pais)
+    
+    def _add_totals_row(self, tabla_final: pd.DataFrame, pais: str) -> pd.DataFrame:
+        """Agrega fila de totales"""
+        fila_totales = tabla_final.sum()
+        
+        capacidad_total = self.country_manager.get_country_data(pais).get_total_capacity()
+        total_headwear_suma = fila_totales['TOTAL HEADWEAR']
+        
+        if capacidad_total > 0:
+            porcentaje_total = ((total_headwear_suma / capacidad_total) * 100) - 100
+            fila_totales['% DE CUMPLIMIENTO'] = f"{porcentaje_total:.2f}%"
+        else:
+            fila_totales['% DE CUMPLIMIENTO'] = "N/A"
+        
+        fila_totales['CAPACIDAD EN TIENDA'] = capacidad_total
+        tabla_final.loc['TOTAL'] = fila_totales
+        
+        return tabla_final
+    
+    @instrumentacion.etapa("add_sales_columns")
+    def _add_sales_columns(self, tabla_final: pd.DataFrame, df_ventas: pd.DataFrame, selected_league: str = None, pais: str = "Guatemala") -> pd.DataFrame:
+        """Agrega las columnas de ventas desglosadas por liga y subcategoría"""
+        
+        # Cubo de ventas cacheado por huella (Honduras usa cantidades, igual que su tabla)
+        cubo = None
+        if pais in ["Guatemala", "El Salvador", "Costa Rica", "Honduras", "PANAMA"]:
+            if pais == "PANAMA":
+                logger.debug('Procesando ventas PANAMA - Archivo recibido: %s', df_ventas is not None)
+                if df_ventas is not None:
+                    logger.debug('Filas en archivo ventas PANAMA: %s', len(df_ventas))
+            modo_cubo = "cantidades" if pais == "Honduras" else "ventas"
+            cubo = self.obtener_cubo_ventas(df_ventas, pais, modo_cubo)
+        bodegas_ventas = cubo.bodegas if cubo is not None else []
+        
+        if pais == "PANAMA" and bodegas_ventas:
+            # Verificar si hay bodegas que no coinciden (solo mostrar si hay problema)
+            bodegas_tabla = set(tabla_final.index) - {'TOTAL'}
+            # Para PANAMA, excluir bodegas centrales de la verificación (es normal que no tengan ventas)
+            bodegas_centrales_panama = {'Almacén general', 'Bodega Central Albrook'}
+            bodegas_tabla = bodegas_tabla - bodegas_centrales_panama
+            
+            if not bodegas_tabla.issubset(set(bodegas_ventas)):
+                notificador.aviso("⚠️ **Algunas bodegas no tienen datos de ventas**")
+                notificador.info(f"❌ **Sin datos de ventas**: {list(bodegas_tabla - set(bodegas_ventas))}")
+        
+        # Unión bodega de stock -> bodega de ventas resuelta una sola vez por bodega
+        filas_bodegas = [bodega for bodega in tabla_final.index if bodega != 'TOTAL']
+        asignacion = self._asignar_bodegas_ventas(filas_bodegas, bodegas_ventas, pais)
+        asignacion = asignacion[asignacion.notna()]
+        hay_total = 'TOTAL' in tabla_final.index
+        
+        # Matrices bodega × (liga, subcategoría): USD para ventas y Cantidad (si existe) para el stock de ACCESSORIES
+        if cubo is not None:
+            matriz_usd = cubo.matriz('USD')
+            matriz_stock = cubo.matriz('Cantidad') if 'Cantidad' in cubo.medidas else matriz_usd
+            claves_accessories = cubo.claves_accessories
+        else:
+            matriz_usd = matriz_stock = None
+            claves_accessories = ()
+        
+        def columna_ventas(matriz, clave):
+            """Valores por bodega de la tabla y total de todas las bodegas de ventas para una celda del cubo"""
+            if matriz is None or clave not in matriz.columns:
+                return None, 0
+            serie = matriz[clave]
+            valores = pd.Series(serie.reindex(asignacion.values).to_numpy(), index=asignacion.index)
+            # Suma acumulada: mismo orden de suma que recorrer las bodegas una por una
+            total = serie.cumsum().iloc[-1] if len(serie) else 0
+            return valores, total
+        
+        # SIEMPRE procesar todas las categorías para generar tabla completa
+        categorias_ligas = ["MLB", "NBA", "NFL", "MOTORSPORT", "ENTERTAINMENT", "ACCESSORIES"]
+        logger.info("Agregando columnas de ventas para todas las ligas (tabla completa)")
+        subcategorias = ["Planas", "Curvas", "Apparel"]
+        
+        # Agregar columnas de ventas para cada combinación liga-subcategoría
+        for categoria in categorias_ligas:
+            if categoria == 'ACCESSORIES':
+                clave = (categoria, 'Accessories')
+                
+                # Para ACCESSORIES, solo agregar columnas Stock y Ventas (USD)
+                col_stock = f"{categoria} - Stock"
+                col_ventas = f"{categoria} - Ventas (USD)"
+                # NO sobrescribir la columna Stock si ya existe con datos
+                for col_name in [col_stock, col_ventas]:
+                    if col_name not in tabla_final.columns:
+                        tabla_final[col_name] = 0.0
+                
+                # Stock: solo llenar las celdas en 0 (inicializadas pero sin datos del archivo de stock)
+                valores_stock, total_stock = columna_ventas(matriz_stock if 'Stock' in claves_accessories else None, clave)
+                if valores_stock is not None and not valores_stock.empty:
+                    sin_stock = tabla_final.loc[valores_stock.index, col_stock] == 0
+                    if sin_stock.any():
+                        self._asignar_celdas(tabla_final, sin_stock.index[sin_stock], col_stock, valores_stock[sin_stock].to_numpy())
+                
+                # Ventas (USD): siempre desde los datos de ventas
+                valores_ventas, total_ventas = columna_ventas(matriz_usd if 'Ventas' in claves_accessories else None, clave)
+                if valores_ventas is not None and not valores_ventas.empty:
+                    self._asignar_celdas(tabla_final, valores_ventas.index, col_ventas, valores_ventas.to_numpy())
+                
+                if hay_total:
+                    # Para Stock de ACCESSORIES, NUNCA sobrescribir datos existentes:
+                    # solo calcular desde ventas si NO HAY datos de stock en absoluto
+                    if tabla_final.loc['TOTAL', col_stock] == 0:
+                        has_real_stock_data = (tabla_final.loc[filas_bodegas, col_stock] > 0).any()
+                        if not has_real_stock_data:
+                            self._asignar_celdas(tabla_final, ['TOTAL'], col_stock, [total_stock])
+                    self._asignar_celdas(tabla_final, ['TOTAL'], col_ventas, [total_ventas])
+            else:
+                # Lógica para otras ligas - SIEMPRE generar tabla completa
+                for subcategoria in subcategorias:
+                    col_name = f"{categoria} - {subcategoria} - Ventas"
+                    columna = pd.Series(0.0, index=tabla_final.index)
+                    
+                    valores, total = columna_ventas(matriz_usd, (categoria, subcategoria))
+                    if valores is not None and not valores.empty:
+                        columna.loc[valores.index] = valores.to_numpy()
+                    if hay_total:
+                        columna.loc['TOTAL'] = total
+                    tabla_final[col_name] = columna
+        
+        return tabla_final
+    
+    @staticmethod
+    def _asignar_celdas(tabla: pd.DataFrame, filas, columna: str, valores) -> None:
+        """
+        Escribe valores en una columna de la tabla con el mismo resultado que la asignación
+        celda por celda: una columna entera queda entera si los valores lo son y pasa a float
+        si alguno tiene decimales. El cambio de tipo se hace explícito antes de asignar.
+        """
+        valores = np.asarray(valores)
+        tipo = tabla[columna].dtype
+        if tipo.kind in 'iu' and valores.dtype.kind not in 'iub':
+            valores = valores.astype(float)
+            enteros = np.isfinite(valores).all() and np.array_equal(valores, np.round(valores))
+            if enteros:
+                valores = valores.astype(tipo)
+            else:
+                tabla[columna] = tabla[columna].astype(float)
+        tabla.loc[filas, columna] = valores
+    
+    def _asignar_bodegas_ventas(self, bodegas_tabla: List[str], bodegas_ventas: List[str], pais: str) -> pd.Series:
+        """
+        Asigna a cada bodega de la tabla su bodega en el archivo de ventas (o None) con un índice
+        por nombre canónico construido una sola vez. Si varias bodegas de ventas comparten nombre
+        canónico gana la primera; las bodegas sin mapeo comparten la clave None, como en la
+        búsqueda bodega por bodega que reemplaza.
+        """
+        bodegas_directas = set(bodegas_ventas)
+        usar_canonico = pais in ["Guatemala", "El Salvador", "Honduras", "Costa Rica", "PANAMA"]
+        
+        indice_canonico = {}
+        if usar_canonico:
+            for bodega_ventas in bodegas_ventas:
+                indice_canonico.setdefault(sales_processor.get_canonical_name(bodega_ventas, pais), bodega_ventas)
+        
+        asignacion = {}
+        for bodega in bodegas_tabla:
+            if bodega in bodegas_directas:
+                asignacion[bodega] = bodega
+            elif usar_canonico:
+                asignacion[bodega] = indice_canonico.get(sales_processor.get_canonical_name(bodega, pais))
+            else:
+                asignacion[bodega] = None
+        return pd.Series(asignacion, index=pd.Index(bodegas_tabla, dtype=object), dtype=object)
+    
+    @instrumentacion.etapa("format_table")
+    def _format_table(self, tabla_final: pd.DataFrame, selected_league: str = None, hay_ventas: bool = False) -> pd.DataFrame:
+        """Formatea la tabla final con MultiIndex de 3 niveles: Liga → Subcategoría → Stock/Ventas"""
+        tabla_final.reset_index(inplace=True)
+        tabla_final.rename(columns={'index': 'Bodega'}, inplace=True)
+        
+        # Crear MultiIndex para columnas con 3 niveles
+        columnas_multi = [('INFO', 'INFO', 'Bodega')]
+        
+        # Definir qué categorías incluir según el filtro
+        if selected_league:
+            # Solo incluir la liga seleccionada
+            categorias_para_multiindex = {selected_league: self.league_categories.get_category_values(selected_league)}
+        else:
+            # Incluir todas las categorías
+            categorias_para_multiindex = self.league_categories.get_all_categories()
+            
+        # Para cada liga y subcategoría, crear columnas Stock y Ventas
+        for categoria in categorias_para_multiindex.keys():
+            if categoria == 'ACCESSORIES':
+                # Para ACCESSORIES, crear columna Stock siempre, Ventas solo si hay datos de ventas
+                columnas_multi.append((categoria, 'Accessories', 'Stock'))
+                if hay_ventas:
+                    columnas_multi.append((categoria, 'Accessories', 'Ventas (USD)'))
+            else:
+                for subcategoria in ['Planas', 'Curvas', 'Apparel']:
+                    # Stock y Ventas para cada subcategoría
+                    columnas_multi.extend([
+                        (categoria, subcategoria, 'Stock'),
+                        (categoria, subcategoria, 'Ventas')
+                    ])
+        
+        # Columnas de totales 
+        if selected_league:
+            # Para liga específica, NO incluir CAPACIDAD EN TIENDA ni % DE CUMPLIMIENTO
+            columnas_totales = [
+                ('TOTALES', 'RESUMEN', 'TOTAL PLANAS'),
+                ('TOTALES', 'RESUMEN', 'TOTAL CURVAS'),
+                ('TOTALES', 'RESUMEN', 'TOTAL APPAREL'),
+                ('TOTALES', 'RESUMEN', 'TOTAL HEADWEAR'),
+                ('TOTALES', 'RESUMEN', 'TOTAL STOCK')
+            ]
+            # Solo agregar TOTAL (USD) si hay datos de ventas
+            if hay_ventas:
+                columnas_totales.append(('TOTALES', 'RESUMEN', 'TOTAL (USD)'))
+            columnas_multi.extend(columnas_totales)
+        else:
+            # Para todas las ligas, incluir columnas según disponibilidad
+            columnas_totales = [
+                ('TOTALES', 'RESUMEN', 'TOTAL PLANAS'),
+                ('TOTALES', 'RESUMEN', 'TOTAL CURVAS'),
+                ('TOTALES', 'RESUMEN', 'TOTAL APPAREL'),
+                ('TOTALES', 'RESUMEN', 'TOTAL HEADWEAR'),
+                ('TOTALES', 'RESUMEN', 'CAPACIDAD EN TIENDA'),
+                ('TOTALES', 'RESUMEN', '% DE CUMPLIMIENTO'),
+                ('TOTALES', 'RESUMEN', 'TOTAL STOCK')
+            ]
+            # Solo agregar TOTAL (USD) si hay datos de ventas
+            if hay_ventas:
+                columnas_totales.append(('TOTALES', 'RESUMEN', 'TOTAL (USD)'))
+            columnas_multi.extend(columnas_totales)
+        
+        # Crear diccionario de mapeo de nombres de columnas
+        mapeo_columnas = {'Bodega': ('INFO', 'INFO', 'Bodega')}
+        
+        # Definir qué categorías incluir según el filtro
+        if selected_league:
+            # Solo incluir la liga seleccionada
+            categorias_a_incluir = {selected_league: self.league_categories.get_category_values(selected_league)}
+            logger.info('Filtrando tabla para mostrar solo: %s', selected_league)
+        else:
+            # Incluir todas las categorías
+            categorias_a_incluir = self.league_categories.get_all_categories()
+            logger.info("Mostrando tabla completa con todas las ligas")
+        
+        # Mapear columnas de stock y ventas existentes
+        for categoria in categorias_a_incluir.keys():
+            if categoria == 'ACCESSORIES':
+                # Para ACCESSORIES, mapear columnas Stock y Ventas (USD)
+                nombre_stock = f"{categoria} - Stock"
+                nombre_ventas = f"{categoria} - Ventas (USD)"
+                
+                if nombre_stock in tabla_final.columns:
+                    mapeo_columnas[nombre_stock] = (categoria, 'Accessories', 'Stock')
+                if nombre_ventas in tabla_final.columns:
+                    mapeo_columnas[nombre_ventas] = (categoria, 'Accessories', 'Ventas (USD)')
+            else:
+                for subcategoria in ['Planas', 'Curvas', 'Apparel']:
+                    nombre_stock = f"{categoria} - {subcategoria}"
+                    nombre_ventas = f"{categoria} - {subcategoria} - Ventas"
+                    
+                    if nombre_stock in tabla_final.columns:
+                        mapeo_columnas[nombre_stock] = (categoria, subcategoria, 'Stock')
+                    if nombre_ventas in tabla_final.columns:
+                        mapeo_columnas[nombre_ventas] = (categoria, subcategoria, 'Ventas')
+        
+        # Mapear columnas de totales
+        totales_mapping = {
+            'TOTAL PLANAS': ('TOTALES', 'RESUMEN', 'TOTAL PLANAS'),
+            'TOTAL CURVAS': ('TOTALES', 'RESUMEN', 'TOTAL CURVAS'),
+            'TOTAL APPAREL': ('TOTALES', 'RESUMEN', 'TOTAL APPAREL'),
+            'TOTAL HEADWEAR': ('TOTALES', 'RESUMEN', 'TOTAL HEADWEAR'),
+            'CAPACIDAD EN TIENDA': ('TOTALES', 'RESUMEN', 'CAPACIDAD EN TIENDA'),
+            '% DE CUMPLIMIENTO': ('TOTALES', 'RESUMEN', '% DE CUMPLIMIENTO'),
+            'TOTAL STOCK': ('TOTALES', 'RESUMEN', 'TOTAL STOCK'),
+            'TOTAL (USD)': ('TOTALES', 'RESUMEN', 'TOTAL (USD)')
+        }
+        
+        for col_original, col_multi in totales_mapping.items():
+            if col_original in tabla_final.columns:
+                mapeo_columnas[col_original] = col_multi
+        
+        # Reordenar columnas según el orden esperado
+        columnas_ordenadas = []
+        tuples_ordenadas = []
+        
+        for col_multi in columnas_multi:
+            for col_original, col_mapped in mapeo_columnas.items():
+                if col_mapped == col_multi and col_original in tabla_final.columns:
+                    columnas_ordenadas.append(col_original)
+                    tuples_ordenadas.append(col_multi)
+                    break
+        
+        # Aplicar reordenamiento
+        tabla_final = tabla_final[columnas_ordenadas]
+        
+        # Crear MultiIndex con 3 niveles explícitamente nombrados
+        multi_index = pd.MultiIndex.from_tuples(
+            tuples_ordenadas,
+            names=['Liga', 'Subcategoría', 'Tipo']
+        )
+        tabla_final.columns = multi_index
+        
+        return tabla_final
+
+    def procesar_solo_ventas_guatemala(self, df_ventas: pd.DataFrame, selected_league: str = None) -> Optional[pd.DataFrame]:
+        """Procesa datos solo de ventas (cantidades) para Guatemala sin requerir archivo de stock"""
+        return self.procesar_solo_ventas_pais(df_ventas, "Guatemala", selected_league)
+    
+    def procesar_solo_ventas_el_salvador(self, df_ventas: pd.DataFrame, selected_league: str = None) -> Optional[pd.DataFrame]:
+        """Procesa datos solo de ventas (cantidades) para El Salvador sin requerir archivo de stock"""
+        return self.procesar_solo_ventas_pais(df_ventas, "El Salvador", selected_league)
+    
+    def procesar_solo_ventas_honduras(self, df_ventas: pd.DataFrame, selected_league: str = None) -> Optional[pd.DataFrame]:
+        """Procesa datos solo de ventas (cantidades) para Honduras sin requerir archivo de stock"""
+        return self.procesar_solo_ventas_pais(df_ventas, "Honduras", selected_league)
+    
+    def procesar_solo_ventas_costa_rica(self, df_ventas: pd.DataFrame, selected_league: str = None) -> Optional[pd.DataFrame]:
+        """Procesa datos solo de ventas (cantidades) para Costa Rica sin requerir archivo de stock"""
+        return self.procesar_solo_ventas_pais(df_ventas, "Costa Rica", selected_league)
+    
+    def procesar_solo_ventas_panama(self, df_ventas: pd.DataFrame, selected_league: str = None) -> Optional[pd.DataFrame]:
+        """Procesa datos solo de ventas (cantidades) para Panama sin requerir archivo de stock"""
+        return self.procesar_solo_ventas_pais(df_ventas, "PANAMA", selected_league)
+    
+    def obtener_cubo_ventas(self, df_ventas: pd.DataFrame, pais: str, modo: str = "ventas") -> Optional[CuboVentas]:
+        """Obtiene el cubo de ventas del archivo, cacheado por su huella de contenido"""
+        if df_ventas is None or df_ventas.empty:
+            return None
+        return self._obtener_cubo_ventas_cache(df_ventas, pais, modo, obtener_huella_dataframe(df_ventas))
+    
+    @cache_por_huella
+    def _obtener_cubo_ventas_cache(_self, _df_ventas: pd.DataFrame, pais: str, modo: str, huella_ventas: str) -> Optional[CuboVentas]:
+        """Construcción cacheada del cubo: un cambio de liga reutiliza el cubo sin reprocesar el archivo"""
+        return sales_processor.construir_cubo_ventas(_df_ventas, pais, modo)
+    
+    def _es_bodega_central_solo_ventas(self, bodega: str, pais: str) -> bool:
+        """Bodegas centrales que se excluyen de las tablas solo-ventas"""
+        if pais == "Costa Rica":
+            return "Central" in bodega or "central" in bodega
+        if pais == "PANAMA":
+            return "Central" in bodega or "central" in bodega or "Almacén" in bodega or "Bodega Central" in bodega
+        return bodega == "CENTRAL NEW ERA"
+    
+    def _construir_tabla_solo_ventas(self, cubo: CuboVentas, pais: str) -> pd.DataFrame:
+        """
+        Construye la tabla solo-ventas (una fila por bodega, sin fila TOTAL) cortando el cubo
+        de cantidades: columnas Cantidad/TOTAL USD por liga y subcategoría más los totales por bodega.
+        """
+        bodegas = [bodega for bodega in cubo.bodegas if not self._es_bodega_central_solo_ventas(bodega, pais)]
+        cantidades = cubo.matriz('Cantidad').loc[bodegas]
+        usd = cubo.matriz('USD').loc[bodegas]
+        categorias_principales = [categoria for categoria in cubo.categorias_ligas if categoria != 'ACCESSORIES']
+        
+        columnas = {'Bodega': pd.Series(bodegas, index=cantidades.index, dtype=object)}
+        for categoria in categorias_principales:
+            for subcat in ["Planas", "Curvas", "Apparel"]:
+                columnas[f"{categoria} - {subcat} - Cantidad"] = cantidades[(categoria, subcat)]
+                columnas[f"{categoria} - {subcat} - TOTAL USD"] = usd[(categoria, subcat)]
+        columnas["ACCESSORIES - Cantidad"] = cantidades[('ACCESSORIES', 'Accessories')]
+        columnas["ACCESSORIES - TOTAL USD"] = usd[('ACCESSORIES', 'Accessories')]
+        tabla_final = pd.DataFrame(columnas)
+        
+        # Totales por bodega (solo cantidades, sin USD para totales)
+        total_planas = sum(tabla_final[f"{cat} - Planas - Cantidad"] for cat in categorias_principales)
+        total_curvas = sum(tabla_final[f"{cat} - Curvas - Cantidad"] for cat in categorias_principales)
+        total_apparel = sum(tabla_final[f"{cat} - Apparel - Cantidad"] for cat in categorias_principales)
+        tabla_final['TOTAL PLANAS'] = total_planas
+        tabla_final['TOTAL CURVAS'] = total_curvas
+        tabla_final['TOTAL APPAREL'] = total_apparel
+        tabla_final['TOTAL HEADWEAR'] = total_planas + total_curvas
+        tabla_final['TOTAL STOCK'] = total_planas + total_curvas + total_apparel + tabla_final['ACCESSORIES - Cantidad']
+        
+        # TOTAL USD como suma horizontal de todas las celdas TOTAL USD de la fila (mismo orden de suma)
+        total_usd = 0
+        for categoria in categorias_principales:
+            for subcat in ["Planas", "Curvas", "Apparel"]:
+                total_usd = total_usd + tabla_final[f"{categoria} - {subcat} - TOTAL USD"]
+        tabla_final['TOTAL USD'] = total_usd + tabla_final['ACCESSORIES - TOTAL USD']
+        
+        return tabla_final
+    
+    @instrumentacion.etapa("solo_ventas")
+    def procesar_solo_ventas_pais(self, df_ventas: pd.DataFrame, pais: str, selected_league: str = None) -> Optional[pd.DataFrame]:
+        """
+        Genera la tabla solo-ventas de un país como una proyección del cubo de cantidades.
+        El cubo se construye una vez por archivo; cambiar de liga solo vuelve a cortar la tabla.
+        """
+        logger.debug('Procesando SOLO VENTAS %s - Archivo recibido con %s filas', pais, len(df_ventas))
+        
+        cubo = self.obtener_cubo_ventas(df_ventas, pais, "cantidades")
+        if cubo is None:
+            logger.warning('No se pudieron procesar las cantidades de %s', pais)
+            return None
+        
+        tabla_final = self._construir_tabla_solo_ventas(cubo, pais)
+        
+        if pais in ["Costa Rica", "PANAMA"]:
+            # Costa Rica y PANAMA: conservan la columna Bodega y agrupan totales bajo 'TOTAL'
+            if not tabla_final.empty:
+                fila_totales = {'Bodega': 'TOTAL'}
+                for col in tabla_final.columns:
+                    if col != 'Bodega':
+                        fila_totales[col] = tabla_final[col].sum()
+                tabla_final = pd.concat([tabla_final, pd.DataFrame([fila_totales], index=['TOTAL'])])
+            
+            if selected_league and selected_league != "Todas":
+                columnas_a_mantener = ['Bodega'] + [
+                    col for col in tabla_final.columns
+                    if col != 'Bodega' and (col.startswith(selected_league) or col.startswith('TOTAL'))
+                ]
+                tabla_final = tabla_final[columnas_a_mantener]
+            
+            return self._format_table_solo_ventas_con_bodega(tabla_final)
+        
+        # Calcular fila de totales
+        if not tabla_final.empty:
+            fila_totales = {}
+            for col in tabla_final.columns:
+                if col != 'Bodega':  # Excluir columna de texto
+                    fila_totales[col] = tabla_final[col].sum()
+                else:
+                    fila_totales[col] = 'TOTAL'
+            tabla_final.loc['TOTAL'] = fila_totales
+        
+        # Llenar valores NaN con 0 y convertir columnas apropiadamente
+        tabla_final = tabla_final.fillna(0)
+        
+        # Convertir columnas de cantidad a enteros, mantener USD como float
+        for col in tabla_final.columns:
+            if 'USD' in col:
+                tabla_final[col] = tabla_final[col].astype(float)
+            elif col != 'Bodega':
+                tabla_final[col] = tabla_final[col].astype(int)
+        
+        tabla_final['Bodega'] = tabla_final.index
+        
+        # Aplicar filtro de liga si es necesario
+        if selected_league and selected_league != "Todas":
+            columnas_filtradas = ['TOTAL PLANAS', 'TOTAL CURVAS', 'TOTAL APPAREL', 'TOTAL HEADWEAR', 'TOTAL STOCK']
+            columnas_filtradas += [col for col in tabla_final.columns if selected_league in col]
+            tabla_final = tabla_final[columnas_filtradas]
+        
+        # Formatear tabla con MultiIndex (sin capacidades ni % cumplimiento)
+        tabla_final = self._format_table_solo_ventas(tabla_final, selected_league)
+        
+        logger.debug('Tabla solo-ventas %s generada con %s filas y %s columnas', pais, len(tabla_final), len(tabla_final.columns))
+        return tabla_final
+    
+    def _format_table_solo_ventas_con_bodega(self, tabla_final: pd.DataFrame) -> pd.DataFrame:
+        """Formatea la tabla solo-ventas de Costa Rica y PANAMA (columna Bodega y totales bajo 'TOTAL')"""
+        # Crear mapeo para MultiIndex (igual que Guatemala)
+        mapeo_columnas = {}
+        
+        # Mapeo de columnas regulares a formato MultiIndex
+        categorias_ligas = ["MLB", "NBA", "NFL", "MOTORSPORT", "ENTERTAINMENT", "ACCESSORIES"]
+        for categoria in categorias_ligas:
+            if categoria == "ACCESSORIES":
+                mapeo_columnas[f"{categoria} - Cantidad"] = (categoria, 'Accessories', 'Cantidad')
+                mapeo_columnas[f"{categoria} - TOTAL USD"] = (categoria, 'Accessories', 'TOTAL USD')
+            else:
+                for subcategoria in ["Planas", "Curvas", "Apparel"]:
+                    mapeo_columnas[f"{categoria} - {subcategoria} - Cantidad"] = (categoria, subcategoria, 'Cantidad')
+                    mapeo_columnas[f"{categoria} - {subcategoria} - TOTAL USD"] = (categoria, subcategoria, 'TOTAL USD')
+        
+        # Mapeo de totales
+        totales_mapping = {
+            'Bodega': ('INFO', 'INFO', 'Bodega'),
+            'TOTAL PLANAS': ('TOTAL', 'TOTAL PLANAS', 'Cantidad'),
+            'TOTAL CURVAS': ('TOTAL', 'TOTAL CURVAS', 'Cantidad'),
+            'TOTAL APPAREL': ('TOTAL', 'TOTAL APPAREL', 'Cantidad'),
+            'TOTAL HEADWEAR': ('TOTAL', 'TOTAL HEADWEAR', 'Cantidad'),
+            'TOTAL STOCK': ('TOTAL', 'TOTAL STOCK', 'Cantidad'),
+            'TOTAL USD': ('TOTAL', 'TOTAL USD', 'TOTAL USD')
+        }
+        
+        # Combinar mapeos
+        for col_original, col_multi in totales_mapping.items():
+            if col_original in tabla_final.columns:
+                mapeo_columnas[col_original] = col_multi
+        
+        # Crear MultiIndex
+        columnas_multi = []
+        
+        # Agregar Bodega primero si existe
+        if 'Bodega' in tabla_final.columns:
+            columnas_multi.append(mapeo_columnas['Bodega'])
+        
+        # Luego agregar las demás columnas
+        for col in tabla_final.columns:
+            if col != 'Bodega':  # Excluir Bodega ya que la agregamos primero
+                if col in mapeo_columnas:
+                    columnas_multi.append(mapeo_columnas[col])
+                else:
+                    columnas_multi.append(('OTROS', 'OTROS', col))
+        
+        # Reordenar DataFrame para que Bodega esté primero
+        if 'Bodega' in tabla_final.columns:
+            cols = ['Bodega'] + [col for col in tabla_final.columns if col != 'Bodega']
+            tabla_final = tabla_final[cols]
+        
+        multi_index = pd.MultiIndex.from_tuples(
+            columnas_multi,
+            names=['Liga', 'Subcategoría', 'Tipo']
+        )
+        tabla_final.columns = multi_index
+        
+        return tabla_final
+    
+    def _format_table_solo_ventas(self, tabla_final: pd.DataFrame, selected_league: str = None) -> pd.DataFrame:
+        """Formatea la tabla solo-ventas con MultiIndex sin capacidades ni % cumplimiento"""
+        
+        # Crear mapeo de columnas para MultiIndex
+        mapeo_columnas = {'Bodega': ('INFO', 'INFO', 'Bodega')}
+        
+        # Mapear columnas de ligas y subcategorías
+        categorias_ligas = ["MLB", "NBA", "NFL", "MOTORSPORT", "ENTERTAINMENT", "ACCESSORIES"]
+        for categoria in categorias_ligas:
+            if categoria == "ACCESSORIES":
+                # Para ACCESSORIES, mapear ambas columnas
+                col_cantidad = f"{categoria} - Cantidad"
+                col_usd = f"{categoria} - TOTAL USD"
+                if col_cantidad in tabla_final.columns:
+                    mapeo_columnas[col_cantidad] = (categoria, 'Accessories', 'Cantidad')
+                if col_usd in tabla_final.columns:
+                    mapeo_columnas[col_usd] = (categoria, 'Accessories', 'TOTAL USD')
+            else:
+                subcategorias = ["Planas", "Curvas", "Apparel"]
+                for subcat in subcategorias:
+                    # Para cada subcategoría, mapear ambas columnas
+                    col_cantidad = f"{categoria} - {subcat} - Cantidad"
+                    col_usd = f"{categoria} - {subcat} - TOTAL USD"
+                    if col_cantidad in tabla_final.columns:
+                        mapeo_columnas[col_cantidad] = (categoria, subcat, 'Cantidad')
+                    if col_usd in tabla_final.columns:
+                        mapeo_columnas[col_usd] = (categoria, subcat, 'TOTAL USD')
+        
+        # Mapear columnas de totales
+        totales_mapping = {
+            'TOTAL PLANAS': ('TOTALES', 'RESUMEN', 'TOTAL PLANAS'),
+            'TOTAL CURVAS': ('TOTALES', 'RESUMEN', 'TOTAL CURVAS'),
+            'TOTAL APPAREL': ('TOTALES', 'RESUMEN', 'TOTAL APPAREL'),
+            'TOTAL HEADWEAR': ('TOTALES', 'RESUMEN', 'TOTAL HEADWEAR'),
+            'TOTAL STOCK': ('TOTALES', 'RESUMEN', 'TOTAL STOCK'),
+            'TOTAL USD': ('TOTALES', 'RESUMEN', 'TOTAL USD')
+        }
+        
+        for col_original, col_multi in totales_mapping.items():
+            if col_original in tabla_final.columns:
+                mapeo_columnas[col_original] = col_multi
+        
+        # Crear MultiIndex - IMPORTANTE: Asegurar que Bodega aparezca primero
+        columnas_multi = []
+        
+        # Agregar Bodega primero si existe
+        if 'Bodega' in tabla_final.columns:
+            columnas_multi.append(mapeo_columnas['Bodega'])
+        
+        # Luego agregar las demás columnas
+        for col in tabla_final.columns:
+            if col != 'Bodega':  # Excluir Bodega ya que la agregamos primero
+                if col in mapeo_columnas:
+                    columnas_multi.append(mapeo_columnas[col])
+                else:
+                    columnas_multi.append(('OTROS', 'OTROS', col))
+        
+        # Reordenar DataFrame para que Bodega esté primero
+        if 'Bodega' in tabla_final.columns:
+            cols = ['Bodega'] + [col for col in tabla_final.columns if col != 'Bodega']
+            tabla_final = tabla_final[cols]
+        
+        multi_index = pd.MultiIndex.from_tuples(
+            columnas_multi,
+            names=['Liga', 'Subcategoría', 'Tipo']
+        )
+        tabla_final.columns = multi_index
+        
+        return tabla_final
+
+# Instancia del procesador de datos
+data_processor = DataProcessor(country_manager, league_categories, product_classifier)
+
+def _mapear_tiendas_optimos(valores_por_tienda: Dict[str, Any], mapeo_tiendas: Optional[Dict[str, str]]) -> Dict[str, Any]:
+    """Traduce {tienda_optimos: valor} a {bodega_stock: valor} en el orden del mapeo (sin mapeo = mismos nombres)"""
+    if mapeo_tiendas is None:
+        return dict(valores_por_tienda)
+    return {
+        bodega: valores_por_tienda[tienda]
+        for bodega, tienda in mapeo_tiendas.items()
+        if tienda in valores_por_tienda
+    }
+
+@lru_cache(maxsize=None)
+def cargar_tablas_optimos_mvp(ruta: str = ARCHIVO_OPTIMOS_MVP) -> Dict[str, Dict[str, Dict[str, Dict[str, int]]]]:
+    """
+    Lee el archivo versionado de óptimos MVP una sola vez por proceso y lo compila con los
+    nombres de bodega del archivo de stock:
+    {pais: {'por_codigo': {codigo: {bodega: cantidad}}, 'por_tallas': {bodega: {talla: cantidad}}}}
+    El resultado se comparte entre llamadas y no debe modificarse.
+    """
+    with open(ruta, encoding="utf-8") as archivo:
+        datos = json.load(archivo)
+    
+    version = datos.get("version")
+    if version != VERSION_OPTIMOS_MVP:
+        raise ValueError(
+            f"Versión del archivo de óptimos MVP no soportada: {version} (se esperaba {VERSION_OPTIMOS_MVP})"
+        )
+    
+    tablas = {}
+    for pais, tablas_pais in datos["paises"].items():
+        por_codigo = tablas_pais["por_codigo"]
+        por_tallas = tablas_pais["por_tallas"]
+        tablas[pais] = {
+            "por_codigo": {
+                codigo: _mapear_tiendas_optimos(tiendas_codigo, por_codigo["tiendas"])
+                for codigo, tiendas_codigo in por_codigo["optimos"].items()
+            },
+            "por_tallas": _mapear_tiendas_optimos(por_tallas["optimos"], por_tallas["tiendas"])
+        }
+    logger.info('Óptimos MVP cargados desde %s (versión %s)', ruta, version)
+    return tablas
+
+def obtener_optimos_mvp() -> Dict[str, Dict[str, int]]:
+    """
+    Retorna diccionario con cantidades óptimas por código y bodega
+    {codigo: {bodega: cantidad_optima}}
+    """
+    return cargar_tablas_optimos_mvp()["Guatemala"]["por_codigo"]
+
+
+def obtener_optimos_mvp_elsalvador() -> Dict[str, Dict[str, int]]:
+    """
+    Retorna diccionario con cantidades óptimas por código y bodega para El Salvador
+    {codigo: {bodega: cantidad_optima}}
+    """
+    return cargar_tablas_optimos_mvp()["El Salvador"]["por_codigo"]
+
+
+def obtener_optimos_por_tallas_elsalvador() -> Dict[str, Dict[str, int]]:
+    """
+    Retorna diccionario con cantidades óptimas por talla y tienda para El Salvador
+    {tienda: {talla: cantidad_optima}}
+    """
+    return cargar_tablas_optimos_mvp()["El Salvador"]["por_tallas"]
+
+
+def obtener_optimos_por_tallas() -> Dict[str, Dict[str, int]]:
+    """
+    Retorna diccionario con cantidades óptimas por talla y tienda
+    {tienda: {talla: cantidad_optima}}
+    """
+    return cargar_tablas_optimos_mvp()["Guatemala"]["por_tallas"]
+
+def obtener_optimos_mvp_honduras() -> Dict[str, Dict[str, int]]:
+    """
+    Retorna diccionario con cantidades óptimas por código y tienda para Honduras
+    {codigo: {tienda: cantidad_optima}}
+    """
+    return cargar_tablas_optimos_mvp()["Honduras"]["por_codigo"]
+
+def obtener_optimos_por_tallas_honduras() -> Dict[str, Dict[str, int]]:
+    """
+    Retorna diccionario con cantidades óptimas por talla y tienda para Honduras
+    {tienda: {talla: cantidad_optima}}
+    """
+    return cargar_tablas_optimos_mvp()["Honduras"]["por_tallas"]
+
+def obtener_optimos_mvp_costarica() -> Dict[str, Dict[str, int]]:
+    """
+    Retorna diccionario con cantidades óptimas por código y tienda para Costa Rica
+    {codigo: {tienda: cantidad_optima}}
+    """
+    return cargar_tablas_optimos_mvp()["Costa Rica"]["por_codigo"]
+
+def obtener_optimos_por_tallas_costarica() -> Dict[str, Dict[str, int]]:
+    """
+    Retorna diccionario con cantidades óptimas por talla y tienda para Costa Rica
+    {tienda: {talla: cantidad_optima}}
+    """
+    return cargar_tablas_optimos_mvp()["Costa Rica"]["por_tallas"]
+
+def obtener_optimos_mvp_panama() -> Dict[str, Dict[str, int]]:
+    """
+    Retorna diccionario con cantidades óptimas por código y bodega para Panamá
+    {codigo: {bodega: cantidad_optima}}
+    """
+    return cargar_tablas_optimos_mvp()["PANAMA"]["por_codigo"]
+
+
+def obtener_optimos_por_tallas_panama() -> Dict[str, Dict[str, int]]:
+    """
+    Retorna diccionario con cantidades óptimas por talla y tienda para Panamá
+    {tienda: {talla: cantidad_optima}}
+    """
+    return cargar_tablas_optimos_mvp()["PANAMA"]["por_tallas"]
+
+def validar_cuadre_sm_ml(codigo: str, bodega: str, stock_sm: int, stock_ml: int, stock_optimo_codigo: int) -> bool:
+    """
+    Valida que las tallas SM y ML cuadren exactamente con el stock óptimo por código
+    SM + ML debe ser igual al stock óptimo por código
+    """
+    total_tallas = stock_sm + stock_ml
+    cuadra = total_tallas == stock_optimo_codigo
+    
+    if not cuadra:
+        logger_mvp.warning('⚠️  DESCUADRE - Código: %s, Bodega: %s - SM: %s + ML: %s = %s ≠ Óptimo: %s',
+                           codigo, bodega, stock_sm, stock_ml, total_tallas, stock_optimo_codigo)
+    
+    return cuadra
+
+def calcular_tallas_sm_ml(stock_optimo_codigo: int) -> tuple:
+    """
+    Calcula la distribución para tallas SM y ML según nueva lógica:
+    - Base: SM=3, ML=9
+    - Multiplicadores: 48→x4, 36→x3, 18→x1.5
+    - Para 18: redondeo hacia abajo + 1 unidad extra a ML
+    Retorna (stock_sm, stock_ml)
+    """
+    # Determinar multiplicador según stock óptimo del código
+    if stock_optimo_codigo == 48:
+        # Multiplicador x4
+        stock_sm = 3 * 4  # = 12
+        stock_ml = 9 * 4  # = 36
+    elif stock_optimo_codigo == 36:
+        # Multiplicador x3
+        stock_sm = 3 * 3  # = 9
+        stock_ml = 9 * 3  # = 27
+    elif stock_optimo_codigo == 18:
+        # Multiplicador x1.5 con redondeo especial
+        stock_sm = int(3 * 1.5)  # = 4 (4.5 redondeado hacia abajo)
+        stock_ml = int(9 * 1.5) + 1  # = 14 (13.5 redondeado hacia abajo + 1 extra)
+    else:
+        # Fallback a la lógica original para casos no contemplados
+        if stock_optimo_codigo % 2 == 0:
+            stock_sm = stock_optimo_codigo // 2
+            stock_ml = stock_optimo_codigo // 2
+        else:
+            stock_sm = (stock_optimo_codigo // 2) + 1
+            stock_ml = stock_optimo_codigo // 2
+    
+    return stock_sm, stock_ml
+
+def distribuir_optimo_por_tallas(stock_codigo: np.ndarray, tallas_base: Dict[str, int], regla_residuo: str = "talla_maxima") -> np.ndarray:
+    """
+    Reparte el stock óptimo de varios códigos entre las tallas de una bodega a la vez.
+    Cada fila de la matriz resultante corresponde a un código y cada columna a una talla de
+    tallas_base (en su orden). Se escala la curva base con redondeo hacia abajo y el residuo
+    se reparte según la regla del país:
+    - 'talla_maxima': todo el residuo a la talla con mayor valor calculado (primera en empate)
+    - 'mayores_base': +1 a las tallas con mayor valor base (tantas como unidades de residuo)
+    - 'mayor_base_clave': residuo positivo a la talla de mayor (valor base, talla); el negativo
+      se descuenta de las tallas de menor valor base
+    """
+    stock_codigo = np.asarray(stock_codigo)
+    tallas = list(tallas_base.keys())
+    base = np.array(list(tallas_base.values()))
+    factor = stock_codigo / sum(tallas_base.values())
+    
+    # Multiplicar y redondear hacia abajo (mismo redondeo que int())
+    tallas_calculadas = np.trunc(base[np.newaxis, :] * factor[:, np.newaxis]).astype(np.int64)
+    diferencia = stock_codigo - tallas_calculadas.sum(axis=1)
+    filas = np.arange(len(stock_codigo))
+    
+    if regla_residuo == "talla_maxima":
+        talla_maxima = tallas_calculadas.argmax(axis=1)
+        tallas_calculadas[filas, talla_maxima] += np.where(diferencia > 0, diferencia, 0)
+    elif regla_residuo == "mayores_base":
+        orden = np.argsort(-base, kind='stable')
+        posicion = np.empty(len(tallas), dtype=np.int64)
+        posicion[orden] = np.arange(len(tallas))
+        tallas_calculadas += (posicion[np.newaxis, :] < diferencia[:, np.newaxis]).astype(np.int64)
+    elif regla_residuo == "mayor_base_clave":
+        talla_mayor = tallas.index(max(tallas_base.items(), key=lambda x: (x[1], x[0]))[0])
+        tallas_calculadas[:, talla_mayor] += np.where(diferencia > 0, diferencia, 0)
+        # Residuo negativo (solo con stock negativo): reducir de las tallas de menor valor base
+        orden_ascendente = [tallas.index(talla) for talla, _ in sorted(tallas_base.items(), key=lambda x: (x[1], x[0]))]
+        for fila in np.flatnonzero(diferencia < 0):
+            pendiente = diferencia[fila]
+            for posicion_talla in orden_ascendente:
+                if tallas_calculadas[fila, posicion_talla] > 0 and pendiente < 0:
+                    reduccion = min(tallas_calculadas[fila, posicion_talla], abs(pendiente))
+                    tallas_calculadas[fila, posicion_talla] -= reduccion
+                    pendiente += reduccion
+    else:
+        raise ValueError(f"Regla de residuo desconocida: {regla_residuo}")
+    
+    return tallas_calculadas
+
+def construir_matriz_optimos_mvp(indice: pd.MultiIndex, bodegas: List[str],
+                                 optimos_por_codigo: Dict[str, Dict[str, int]],
+                                 optimos_por_tallas: Dict[str, Dict[str, int]],
+                                 codigos_con_tallas: List[str], tallas_especificas: List[str],
+                                 codigos_con_tallas_sm_ml: List[str], tallas_sm_ml: List[str],
+                                 regla_residuo: str = "talla_maxima") -> np.ndarray:
+    """
+    Calcula de una vez la matriz densa de stock óptimo (filas del índice MVP × bodegas).
+    El cálculo se hace una sola vez por par (código, talla) distinto y se difunde a las filas:
+    - Códigos con tallas numéricas: óptimo del código repartido según la curva de tallas de la bodega
+    - Códigos con tallas SM/ML: óptimo del código dividido con calcular_tallas_sm_ml
+    - Resto: óptimo del código directo
+    """
+    codigos_filas, pares = pd.factorize(pd.MultiIndex.from_arrays([
+        indice.get_level_values(0).astype(str), indice.get_level_values(6).astype(str)
+    ]))
+    codigos = pares.get_level_values(0)
+    tallas = pares.get_level_values(1)
+    
+    # Óptimo por código de cada par (código, talla) en cada bodega, y si la bodega tiene óptimo definido
+    stock_codigo = np.zeros((len(pares), len(bodegas)), dtype=np.int64)
+    tiene_optimo = np.zeros((len(pares), len(bodegas)), dtype=bool)
+    for j, bodega in enumerate(bodegas):
+        for i, codigo in enumerate(codigos):
+            if codigo in optimos_por_codigo and bodega in optimos_por_codigo[codigo]:
+                stock_codigo[i, j] = optimos_por_codigo[codigo][bodega]
+                tiene_optimo[i, j] = True
+    
+    caso_tallas = np.asarray(codigos.isin(codigos_con_tallas) & tallas.isin(tallas_especificas))
+    caso_sm_ml = np.asarray(codigos.isin(codigos_con_tallas_sm_ml) & tallas.isin(tallas_sm_ml)) & ~caso_tallas
+    caso_codigo = ~(caso_tallas | caso_sm_ml)
+    
+    # CASO 3: óptimo por código directo
+    optimos = np.where(caso_codigo[:, np.newaxis] & tiene_optimo, stock_codigo, 0)
+    
+    # CASO 2: división SM/ML, una vez por valor de óptimo distinto
+    if caso_sm_ml.any():
+        division_sm_ml = {valor: calcular_tallas_sm_ml(valor) for valor in np.unique(stock_codigo[caso_sm_ml])}
+        validados = set()
+        for i in np.flatnonzero(caso_sm_ml):
+            for j in np.flatnonzero(tiene_optimo[i]):
+                stock_sm, stock_ml = division_sm_ml[stock_codigo[i, j]]
+                if tallas[i] == 'SM':
+                    optimos[i, j] = stock_sm
+                elif tallas[i] == 'ML':
+                    optimos[i, j] = stock_ml
+                # Validar cuadre una vez por código y bodega
+                if (codigos[i], j) not in validados:
+                    validados.add((codigos[i], j))
+                    validar_cuadre_sm_ml(codigos[i], bodegas[j], stock_sm, stock_ml, stock_codigo[i, j])
+    
+    # CASO 1: curva de tallas por bodega, vectorizada sobre todos los códigos de la bodega
+    if caso_tallas.any():
+        for j, bodega in enumerate(bodegas):
+            tallas_base = optimos_por_tallas.get(bodega)
+            if not tallas_base or sum(tallas_base.values()) <= 0:
+                continue
+            filas = np.flatnonzero(caso_tallas & tiene_optimo[:, j])
+            if len(filas) == 0:
+                continue
+            distribucion = distribuir_optimo_por_tallas(stock_codigo[filas, j], tallas_base, regla_residuo)
+            posiciones = {talla: k for k, talla in enumerate(tallas_base.keys())}
+            for fila_distribucion, i in enumerate(filas):
+                k = posiciones.get(tallas[i])
+                if k is not None:
+                    optimos[i, j] = distribucion[fila_distribucion, k]
+    
+    return optimos[codigos_filas]
+
+def obtener_optimos_mvp_puerto_rico() -> Dict[str, Dict[str, int]]:
+    """
+    Retorna diccionario con cantidades óptimas por código y tienda para Puerto Rico
+    {codigo: {tienda: cantidad_optima}}
+    """
+    return cargar_tablas_optimos_mvp()["Puerto Rico"]["por_codigo"]
+
+def obtener_optimos_por_tallas_puerto_rico() -> Dict[str, Dict[str, int]]:
+    """
+    Retorna diccionario con cantidades óptimas por talla y tienda para Puerto Rico
+    {tienda: {talla: cantidad_optima}}
+    """
+    return cargar_tablas_optimos_mvp()["Puerto Rico"]["por_tallas"]
+
+# CÓDIGOS MVP ESPECÍFICOS - SOLO ESTOS 45 SE EXTRAEN DEL ARCHIVO DE STOCK (IGUAL QUE TODOS LOS PAÍSES)
+CODIGOS_MVP = [
+    '10030708', '10030709', '10047511', '10047531', '10047538', '10112874',
+    '10975804', '10975815', '10975835', '11405605', '11405614',
+    '11591024', '11591025', '11591026', '11591043', '11591046', '11591047',
+    '11591077', '11591078', '11591122', '11591128', '11591150', '11591175',
+    '11941921', '12650335', '12650337', '12650340', '12650342', '12650343',
+    '12650344', '70192970', '70331909', '70331911', '70331962', '70353249',
+    '70353266', '70360899', '70360903', '70428987', '70430338', '70457634',
+    '70556851', '70556867', '70556869', '70558225'
+]
+
+# Códigos que deben tener tallas específicas (678-800)
+CODIGOS_MVP_CON_TALLAS = ['11591122', '11591128', '11591150', '11591175', '70331909', '70331911', '70331962']
+
+# Códigos que deben tener tallas SM y ML
+CODIGOS_MVP_TALLAS_SM_ML = ['10975804', '10975815', '10975835', '70192970', '70353249', '70353266',
+                            '70360899', '70360903', '70428987', '70430338', '70457634']
+
+# Tallas específicas numéricas
+TALLAS_MVP_NUMERICAS = ['678', '700', '718', '714', '738', '712', '758', '734', '778', '800']
+
+# Tallas SM y ML
+TALLAS_MVP_SM_ML = ['SM', 'ML']
+
+COLUMNAS_INDICE_MVP = ['U_Estilo', 'Codigo_SAP', 'U_Segmento', 'U_Silueta', 'U_Coleccion_NE', 'U_Descripcion']
+
+@dataclass(frozen=True)
+class ConfiguracionMVP:
+    """
+    Reglas de la tabla de MVPs de un país para procesar_stock_mvps:
+    - pais: clave del país en optimos_mvp.json
+    - bodegas: bodegas de la tabla, en el orden de sus columnas
+    - regla_residuo: reparto del residuo de la curva de tallas (ver distribuir_optimo_por_tallas)
+    - codigos_faltantes: filas 'N/D' de los códigos MVP que no están en el archivo:
+      'por_bodega' (una por bodega), 'primera_bodega' (una sola, en la primera bodega) o
+      'por_talla' (una por bodega y talla requerida del código)
+    - nombres_bodegas: nombre en el archivo de stock -> nombre en la tabla, si difieren
+    - sap_en_agrupacion: el Codigo_SAP forma parte de la agrupación (las filas agregadas toman
+      el SAP real del código y talla) en lugar de asignarse después de agrupar
+    - limpiar_tallas: quitar espacios a la talla antes de agrupar
+    - nombre_columnas: nombre del eje de columnas de la tabla final
+    """
+    pais: str
+    bodegas: Tuple[str, ...]
+    regla_residuo: str = "talla_maxima"
+    codigos_faltantes: str = "por_bodega"
+    nombres_bodegas: Optional[Dict[str, str]] = None
+    sap_en_agrupacion: bool = False
+    limpiar_tallas: bool = False
+    nombre_columnas: Optional[str] = None
+
+CONFIGURACIONES_MVP = {
+    # Bodegas de Guatemala (sin NE Plaza Videre)
+    "Guatemala": ConfiguracionMVP(
+        pais="Guatemala",
+        bodegas=(
+            "NE Oakland", "NE Cayala", "NE Miraflores", "NE Portales", "NE InterXela",
+            "NE Metronorte", "NE Concepcion", "NE Interplaza Escuintla", "NE Pradera Huehuetenango",
+            "NE Naranjo", "NE Metrocentro Outlet", "NE Vistares", "NE Peri Roosvelt",
+            "NE Outlet Santa clara", "NE Plaza Magdalena", "NE Pradera Chiquimula",
+            "NE Pradera Escuintla", "NE Paseo Antigua", "NE Pradera Xela", "NE Chimaltenango",
+            "NE Metroplaza Jutiapa", "NE Puerto Barrios"
+        ),
+    ),
+    "El Salvador": ConfiguracionMVP(
+        pais="El Salvador",
+        bodegas=(
+            "NE METROCENTRO LOURDES", "NE METROCENTRO SAN MIGUEL", "NE PLAZA MUNDO SOYAPANGO",
+            "NE USULUTÁN", "NEW ERA EL PASEO", "NEW ERA METROCENTRO",
+            "NEW ERA METROCENTRO SANTA ANA", "NEW ERA MULTIPLAZA"
+        ),
+        codigos_faltantes="primera_bodega",
+    ),
+    "Honduras": ConfiguracionMVP(
+        pais="Honduras",
+        bodegas=(
+            "NE – Cascadas Mall Tegucigalpa", "NE – CITY MALL SP", "NE – City Mall Tegucigalpa",
+            "NE – Mega Mall SPS", "NE – Multiplaza Tegucigalpa", "NE –Multiplaza SPS",
+            "NEO – Megaplaza La Ceiba"
+        ),
+        regla_residuo="mayores_base",
+    ),
+    "Costa Rica": ConfiguracionMVP(
+        pais="Costa Rica",
+        bodegas=("NE City Mall",),
+        regla_residuo="mayores_base",
+    ),
+    "PANAMA": ConfiguracionMVP(
+        pais="PANAMA",
+        bodegas=("NE Albrookmall", "NE Metromall", "NE Multiplaza Panamá", "NE Westland"),
+    ),
+    "Puerto Rico": ConfiguracionMVP(
+        pais="Puerto Rico",
+        bodegas=("NE BARCELONETA", "NE CAROLINA"),
+        regla_residuo="mayor_base_clave",
+        codigos_faltantes="por_talla",
+        nombres_bodegas={
+            'NE Barceloneta Premium Outlet': 'NE BARCELONETA',  # Archivo CSV -> Nombre final
+            'NE Plaza Carolina': 'NE CAROLINA'  # Archivo CSV -> Nombre final
+        },
+        sap_en_agrupacion=True,
+        limpiar_tallas=True,
+        nombre_columnas='Bodega',
+    ),
+}
+
+def _claves_texto(estilos, tallas) -> pd.MultiIndex:
+    """Llave (código, talla) como texto, igual que (str(estilo), str(talla))"""
+    return pd.MultiIndex.from_arrays([pd.Index(estilos, dtype=object).astype(str),
+                                      pd.Index(tallas, dtype=object).astype(str)])
+
+def _mapa_sap_mvp(df_mvp: pd.DataFrame, columna_talla: str) -> pd.Series:
+    """Codigo_SAP por (código, talla) tomado solo de los registros REALES (con stock > 0)"""
+    mapa = df_mvp[df_mvp['Stock_Actual'] > 0].groupby(['U_Estilo', columna_talla])['Codigo_SAP'].first()
+    mapa.index = _claves_texto(mapa.index.get_level_values(0), mapa.index.get_level_values(1))
+    # Si dos llaves coinciden como texto queda la última, como al llenar un diccionario
+    return mapa[~mapa.index.duplicated(keep='last')]
+
+def _buscar_sap_mvp(mapa_sap: pd.Series, estilos, tallas) -> np.ndarray:
+    """SAP de cada par (código, talla); "" si el par no tiene registros con stock"""
+    posiciones = mapa_sap.index.get_indexer(_claves_texto(estilos, tallas))
+    resultado = np.full(len(posiciones), "", dtype=object)
+    encontrados = posiciones >= 0
+    resultado[encontrados] = mapa_sap.to_numpy(dtype=object)[posiciones[encontrados]]
+    return resultado
+
+def _filas_tallas_faltantes(df_mvp: pd.DataFrame, columna_talla: str, bodegas: List[str]) -> pd.DataFrame:
+    """
+    Filas con stock 0 para las tallas requeridas (678-800 o SM/ML) que un código presente en el
+    archivo no tiene en una bodega, para que aparezcan en la tabla aunque su óptimo sea 0.
+    Copian los datos del primer registro del código, con SAP vacío (sin stock real).
+    """
+    estilos = df_mvp['U_Estilo'].astype(str)
+    presentes = set(estilos)
+    requeridas = [
+        pd.MultiIndex.from_product([[codigo for codigo in codigos if codigo in presentes], bodegas, tallas])
+        for codigos, tallas in ((CODIGOS_MVP_CON_TALLAS, TALLAS_MVP_NUMERICAS), (CODIGOS_MVP_TALLAS_SM_ML, TALLAS_MVP_SM_ML))
+    ]
+    requeridas = requeridas[0].append(requeridas[1])
+    existentes = pd.MultiIndex.from_arrays([
+        estilos, df_mvp['Bodega'].astype(str), df_mvp[columna_talla].astype(str).str.strip()
+    ])
+    faltantes = requeridas[~requeridas.isin(existentes)]
+    if len(faltantes) == 0:
+        return pd.DataFrame()
+
+    # Primer registro de cada código como datos base
+    es_primero = ~estilos.duplicated().to_numpy()
+    posicion_base = pd.Series(np.flatnonzero(es_primero), index=estilos.to_numpy()[es_primero])
+    filas = df_mvp.iloc[posicion_base.loc[faltantes.get_level_values(0)].to_numpy()].astype(object)
+    filas['Bodega'] = faltantes.get_level_values(1).to_numpy()
+    filas[columna_talla] = faltantes.get_level_values(2).to_numpy()
+    filas['Stock_Actual'] = 0
+    filas['Codigo_SAP'] = ""
+    # Mismos tipos que al armar las filas una por una: texto como object y números inferidos
+    return filas.reset_index(drop=True).infer_objects()
+
+def _filas_codigos_faltantes(faltantes: List[str], configuracion: ConfiguracionMVP, columna_talla: str) -> pd.DataFrame:
+    """Filas "N/D" con stock 0 para los códigos MVP que no están en el archivo"""
+    bodegas = list(configuracion.bodegas)
+    if configuracion.codigos_faltantes == "por_talla":
+        # Una fila por bodega y por cada talla requerida según el tipo de código
+        grupos = [
+            ([codigo for codigo in faltantes if codigo in CODIGOS_MVP_CON_TALLAS], TALLAS_MVP_NUMERICAS),
+            ([codigo for codigo in faltantes if codigo in CODIGOS_MVP_TALLAS_SM_ML and codigo not in CODIGOS_MVP_CON_TALLAS], TALLAS_MVP_SM_ML),
+            ([codigo for codigo in faltantes if codigo not in CODIGOS_MVP_CON_TALLAS and codigo not in CODIGOS_MVP_TALLAS_SM_ML], ['N/D']),
+        ]
+        combinaciones = [pd.MultiIndex.from_product([codigos, bodegas, tallas]) for codigos, tallas in grupos]
+        combinaciones = combinaciones[0].append(combinaciones[1:])
+        codigos = combinaciones.get_level_values(0)
+        return pd.DataFrame({
+            'U_Estilo': [int(codigo) if codigo.isdigit() else codigo for codigo in codigos],  # Mantener tipo correcto
+            'Codigo_SAP': "",  # Vacío para códigos artificiales
+            'U_Marca': 'NEW ERA',
+            'U_Segmento': 'N/D',
+            'U_Silueta': 'N/D',
+            'U_Coleccion_NE': 'N/D',
+            'U_Descripcion': 'N/D',
+            columna_talla: combinaciones.get_level_values(2).astype(str).to_numpy(),
+            'Bodega': combinaciones.get_level_values(1).to_numpy(),
+            'Stock_Actual': 0
+        })
+
+    if configuracion.codigos_faltantes == "primera_bodega":
+        bodegas = bodegas[:1]
+    combinaciones = pd.MultiIndex.from_product([faltantes, bodegas])
+    return pd.DataFrame({
+        'U_Estilo': combinaciones.get_level_values(0).to_numpy(),
+        'Codigo_SAP': '',  # Vacío porque no existe en archivo
+        'U_Segmento': 'N/D',
+        'U_Silueta': 'N/D',
+        'U_Coleccion_NE': 'N/D',
+        'U_Descripcion': 'N/D',
+        columna_talla: 'N/D',
+        'Stock_Actual': 0,  # Sin stock porque no está en archivo
+        'Bodega': combinaciones.get_level_values(1).to_numpy()
+    })
+
+def procesar_stock_mvps(df_stock: pd.DataFrame, configuracion: ConfiguracionMVP) -> pd.DataFrame:
+    """
+    Tabla de stock real vs óptimo de los códigos MVP de un país (bodegas como columnas Real/Óptimo)
+    - Códigos con tallas específicas usan stock óptimo por tallas
+    - Códigos con tallas SM/ML usan la división de calcular_tallas_sm_ml del stock óptimo por código
+    - Otros códigos usan stock óptimo por código general
+    - Agrega filas faltantes para tallas requeridas con stock 0 y filas "N/D" para los códigos
+      que no están en el archivo
+    """
+    etiqueta = configuracion.pais.upper()
+    if df_stock is None or df_stock.empty:
+        return pd.DataFrame()
+
+    # Filtrar por marca NEW ERA y por los códigos MVP
+    df_new_era = df_stock[df_stock['U_Marca'].str.upper() == 'NEW ERA']
+    df_mvp = df_new_era[df_new_era['U_Estilo'].astype(str).isin(CODIGOS_MVP)].copy()
+
+    logger_mvp.debug('MVP %s: Total registros NEW ERA: %s', etiqueta, len(df_new_era))
+    logger_mvp.debug('MVP %s: Códigos MVP filtrados: %s', etiqueta, len(df_mvp))
+    if logger_mvp.isEnabledFor(logging.DEBUG):
+        logger_mvp.debug('MVP %s: Códigos encontrados: %s', etiqueta, sorted(df_mvp['U_Estilo'].astype(str).unique().tolist()))
+
+    if df_mvp.empty:
+        logger_mvp.warning('MVP %s: No se encontraron códigos MVP en el archivo', etiqueta)
+        return pd.DataFrame()
+
+    # Verificar columnas necesarias - SOPORTE PARA AMBAS: 'Talla' y 'U_Talla'
+    if 'U_Talla' in df_mvp.columns:
+        columna_talla = 'U_Talla'
+    elif 'Talla' in df_mvp.columns:
+        columna_talla = 'Talla'
+    else:
+        logger_mvp.error("%s: No se encontró columna de talla ('U_Talla' o 'Talla')", etiqueta)
+        return pd.DataFrame()
+
+    for col in COLUMNAS_INDICE_MVP + [columna_talla, 'Stock_Actual', 'Bodega']:
+        if col not in df_mvp.columns:
+            logger_mvp.error('%s: Columna faltante: %s', etiqueta, col)
+            return pd.DataFrame()
+
+    # Filtrar solo bodegas del país (con el nombre de la tabla si el archivo usa otro)
+    bodegas = list(configuracion.bodegas)
+    if configuracion.nombres_bodegas:
+        df_mvp = df_mvp[df_mvp['Bodega'].isin(list(configuracion.nombres_bodegas))].copy()
+        df_mvp['Bodega'] = df_mvp['Bodega'].map(configuracion.nombres_bodegas)
+    else:
+        df_mvp = df_mvp[df_mvp['Bodega'].isin(bodegas)].copy()
+
+    if df_mvp.empty:
+        logger_mvp.warning('MVP %s: No se encontraron productos en las bodegas del país', etiqueta)
+        return pd.DataFrame()
+
+    tablas_optimos = cargar_tablas_optimos_mvp()[configuracion.pais]
+    mapa_sap = _mapa_sap_mvp(df_mvp, columna_talla)
+
+    # Tallas requeridas que faltan por código y bodega
+    df_adicional = _filas_tallas_faltantes(df_mvp, columna_talla, bodegas)
+    if not df_adicional.empty:
+        if configuracion.sap_en_agrupacion:
+            # Las filas agregadas toman el código SAP real de su código y talla, si lo hay
+            df_adicional['Codigo_SAP'] = _buscar_sap_mvp(mapa_sap, df_adicional['U_Estilo'], df_adicional[columna_talla])
+        df_mvp = pd.concat([df_mvp, df_adicional], ignore_index=True)
+        logger_mvp.debug('MVP %s: Agregadas %s filas para tallas faltantes', etiqueta, len(df_adicional))
+
+    # Códigos MVP que NO están en el archivo: filas con información "N/D"
+    codigos_presentes = set(df_mvp['U_Estilo'].astype(str).unique())
+    codigos_faltantes = [codigo for codigo in CODIGOS_MVP if codigo not in codigos_presentes]
+    if codigos_faltantes:
+        logger_mvp.debug('MVP %s: Agregando %s códigos MVP faltantes', etiqueta, len(codigos_faltantes))
+        df_faltantes = _filas_codigos_faltantes(codigos_faltantes, configuracion, columna_talla)
+        df_mvp = pd.concat([df_mvp, df_faltantes], ignore_index=True)
+
+    if configuracion.limpiar_tallas:
+        df_mvp[columna_talla] = df_mvp[columna_talla].astype(str).str.strip()
+
+    # Agrupar como tabla dinámica; el SAP se asigna por código y talla si no entra en la agrupación
+    columnas_grupo = COLUMNAS_INDICE_MVP[:1] + COLUMNAS_INDICE_MVP[2:] + [columna_talla, 'Bodega']
+    if configuracion.sap_en_agrupacion:
+        columnas_grupo.insert(1, 'Codigo_SAP')
+    df_agrupado = df_mvp.groupby(columnas_grupo)['Stock_Actual'].sum().reset_index()
+    if not configuracion.sap_en_agrupacion:
+        df_agrupado['Codigo_SAP'] = _buscar_sap_mvp(mapa_sap, df_agrupado['U_Estilo'], df_agrupado[columna_talla])
+
+    # Pivotar para tener bodegas como columnas, todas y en el orden de la configuración
+    tabla_pivoteada = df_agrupado.pivot_table(
+        index=COLUMNAS_INDICE_MVP + [columna_talla],
+        columns='Bodega',
+        values='Stock_Actual',
+        fill_value=0,
+        aggfunc='sum'
+    )
+    tabla_pivoteada = tabla_pivoteada.reindex(columns=bodegas, fill_value=0)
+
+    # Matriz de stock óptimo (filas × bodegas) calculada de una vez para todos los códigos/tallas
+    matriz_optimos = construir_matriz_optimos_mvp(
+        tabla_pivoteada.index, bodegas, tablas_optimos["por_codigo"], tablas_optimos["por_tallas"],
+        CODIGOS_MVP_CON_TALLAS, TALLAS_MVP_NUMERICAS, CODIGOS_MVP_TALLAS_SM_ML, TALLAS_MVP_SM_ML,
+        regla_residuo=configuracion.regla_residuo
+    )
+
+    # Columnas intercaladas por bodega: stock actual y stock óptimo
+    columnas_intercaladas = {}
+    for j, bodega in enumerate(bodegas):
+        columnas_intercaladas[f"Real {bodega}"] = tabla_pivoteada[bodega]
+        columnas_intercaladas[f"Óptimo {bodega}"] = matriz_optimos[:, j]
+    tabla_final = pd.DataFrame(columnas_intercaladas, index=tabla_pivoteada.index)
+    tabla_final.columns.name = configuracion.nombre_columnas
+
+    # Agregar fila de totales por columna
+    fila_totales = tabla_final.sum(axis=0)
+    fila_totales.name = ('TOTAL', 'TOTAL', 'TOTAL', 'TOTAL', 'TOTAL', 'TOTAL', 'TOTAL')
+    tabla_final = pd.concat([tabla_final, fila_totales.to_frame().T])
+
+    logger_mvp.debug('MVP %s: %s filas en tabla final', etiqueta, len(tabla_final))
+    return tabla_final
+
+def procesar_stock_mvps_guatemala(df_stock: pd.DataFrame) -> pd.DataFrame:
+    """Tabla de MVPs de Guatemala (ver procesar_stock_mvps)"""
+    return procesar_stock_mvps(df_stock, CONFIGURACIONES_MVP["Guatemala"])
+
+def procesar_stock_mvps_elsalvador(df_stock: pd.DataFrame) -> pd.DataFrame:
+    """Tabla de MVPs de El Salvador: los códigos faltantes van en una sola fila"""
+    return procesar_stock_mvps(df_stock, CONFIGURACIONES_MVP["El Salvador"])
+
+def procesar_stock_mvps_honduras(df_stock: pd.DataFrame) -> pd.DataFrame:
+    """Tabla de MVPs de Honduras: residuo de tallas a las de mayor valor base"""
+    return procesar_stock_mvps(df_stock, CONFIGURACIONES_MVP["Honduras"])
+
+def procesar_stock_mvps_costarica(df_stock: pd.DataFrame) -> pd.DataFrame:
+    """Tabla de MVPs de Costa Rica: residuo de tallas a las de mayor valor base"""
+    return procesar_stock_mvps(df_stock, CONFIGURACIONES_MVP["Costa Rica"])
+
+def procesar_stock_mvps_panama(df_stock: pd.DataFrame) -> pd.DataFrame:
+    """Tabla de MVPs de Panamá (ver procesar_stock_mvps)"""
+    return procesar_stock_mvps(df_stock, CONFIGURACIONES_MVP["PANAMA"])
+
+def procesar_stock_mvps_puerto_rico(df_stock: pd.DataFrame) -> pd.DataFrame:
+    """Tabla de MVPs de Puerto Rico: bodegas renombradas, SAP en la agrupación y filas N/D por talla"""
+    return procesar_stock_mvps(df_stock, CONFIGURACIONES_MVP["Puerto Rico"])
+
+def procesar_archivo_optimos_gt(df_optimos: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+    """
+    Procesa el archivo CSV de cantidades óptimas para Guatemala
+    Retorna: {codigo: {bodega: cantidad_optima}}
+    """
+    if df_optimos is None or df_optimos.empty:
+        logger_mvp.warning('DataFrame de óptimos está vacío o es None')
+        return {}
+    
+    logger_mvp.debug('Archivo de óptimos cargado con %s filas y %s columnas', len(df_optimos), len(df_optimos.columns))
+    logger_mvp.debug('Columnas disponibles: %s', list(df_optimos.columns))
+    
+    # Buscar columna de código
+    codigo_col = None
+    for col in df_optimos.columns:
+        if 'codigo' in col.lower() or 'estilo' in col.lower() or col.lower() in ['u_estilo', 'código']:
+            codigo_col = col
+            break
+    
+    if codigo_col is None:
+        logger_mvp.warning('No se encontró columna de código en archivo de óptimos')
+        logger_mvp.debug('Buscando en la primera columna como código por defecto...')
+        if len(df_optimos.columns) > 0:
+            codigo_col = df_optimos.columns[0]
+            logger_mvp.debug('Usando primera columna como código: %s', codigo_col)
+        else:
+            logger_mvp.warning('No hay columnas disponibles')
+            return {}
+    
+    # Obtener bodegas de Guatemala (sin NE Plaza Videre)
+    bodegas_guatemala = [
+        "NE Oakland", "NE Cayala", "NE Miraflores", "NE Portales", "NE InterXela",
+        "NE Metronorte", "NE Concepcion", "NE Interplaza Escuintla", "NE Pradera Huehuetenango",
+        "NE Naranjo", "NE Metrocentro Outlet", "NE Vistares", "NE Peri Roosvelt",
+        "NE Outlet Santa clara", "NE Plaza Magdalena", "NE Pradera Chiquimula",
+        "NE Pradera Escuintla", "NE Paseo Antigua", "NE Pradera Xela", "NE Chimaltenango",
+        "NE Metroplaza Jutiapa", "NE Puerto Barrios"
+    ]
+
+    # Mapear columnas de archivo con bodegas (nombres similares)
+    def encontrar_bodega_similar(col_name: str) -> str:
+        """Encuentra la bodega más similar basada en nombres"""
+        col_clean = col_name.lower().replace('ne ', '').replace('_', ' ').strip()
+        
+        # Primero buscar coincidencia exacta
+        for bodega in bodegas_guatemala:
+            if col_name == bodega:
+                return bodega
+        
+        # Luego buscar coincidencias parciales
+        for bodega in bodegas_guatemala:
+            bodega_clean = bodega.lower().replace('ne ', '').replace('_', ' ').strip()
+            # Buscar coincidencias parciales
+            if col_clean in bodega_clean or bodega_clean in col_clean:
+                return bodega
+            # Buscar palabras clave
+            col_words = col_clean.split()
+            bodega_words = bodega_clean.split()
+            if len(set(col_words) & set(bodega_words)) >= 1:
+                return bodega
+        
+        # Si no encuentra nada, intentar mapeo más flexible
+        logger_mvp.warning("No se pudo mapear columna '%s' con ninguna bodega", col_name)
+        return None
+    
+    # Debug: Mostrar mapeo de columnas con bodegas
+    logger_mvp.debug('Mapeo de columnas de archivo con bodegas:')
+    bodegas_mapeadas = {}
+    for col in df_optimos.columns:
+        if col != codigo_col:
+            bodega_mapeada = encontrar_bodega_similar(col)
+            bodegas_mapeadas[col] = bodega_mapeada
+            logger_mvp.debug("  '%s' -> '%s'", col, bodega_mapeada)
+    
+    # Crear mapeo de códigos a óptimos por bodega
+    optimos_dict = {}
+    
+    for _, row in df_optimos.iterrows():
+        codigo = str(row[codigo_col]).strip()
+        if not codigo or codigo == 'nan':
+            continue
+            
+        optimos_dict[codigo] = {}
+        
+        # Mapear cada columna con bodegas
+        for col in df_optimos.columns:
+            if col != codigo_col:
+                bodega_mapeada = bodegas_mapeadas[col]
+                if bodega_mapeada:
+                    try:
+                        cantidad = float(row[col]) if pd.notnull(row[col]) else 0
+                        optimos_dict[codigo][bodega_mapeada] = cantidad
+                    except Exception as e:
+                        logger_mvp.error('Error procesando %s-%s: %s', codigo, bodega_mapeada, e)
+                        optimos_dict[codigo][bodega_mapeada] = 0
+    
+    logger_mvp.debug('Procesados %s códigos con cantidades óptimas', len(optimos_dict))
+    
+    if optimos_dict and logger_mvp.isEnabledFor(logging.DEBUG):
+        # Mostrar ejemplo del primer código procesado
+        primer_codigo = next(iter(optimos_dict))
+        logger_mvp.debug('Ejemplo - Código %s: %s', primer_codigo, optimos_dict[primer_codigo])
+    
+    return optimos_dict
+
+# Colores del semáforo MVP indexados por código: 0 = verde, 1 = amarillo, 2 = rojo
+COLORES_SEMAFORO_MVP = np.array(["#d4edda", "#fff3cd", "#f8d7da"])
+NOMBRES_SEMAFORO_MVP = ['verde', 'amarillo', 'rojo']
+
+def clasificar_semaforo_mvp(real, optimo) -> np.ndarray:
+    """
+    Clasifica de una vez arreglos de stock real y óptimo en códigos de semáforo
+    (0 = verde, 1 = amarillo, 2 = rojo):
+    Verde: Stock real >= Stock óptimo, O cuando Óptimo = 0 y Real >= 0
+    Amarillo: Stock real < Stock óptimo pero >= 80% del óptimo
+    Rojo: Stock real < 80% del óptimo (o stock negativo con óptimo 0)
+    """
+    real = np.asarray(real, dtype=float)
+    optimo = np.asarray(optimo, dtype=float)
+    codigos = np.full(np.broadcast(real, optimo).shape, 2, dtype=np.int8)
+    
+    # Cuando óptimo es 0, cualquier valor de stock real >= 0 es verde
+    optimo_cero = optimo == 0
+    codigos[optimo_cero & (real >= 0)] = 0
+    
+    # Lógica basada en cumplimiento cuando óptimo > 0
+    con_optimo = ~optimo_cero
+    codigos[con_optimo & (real >= optimo)] = 0
+    codigos[con_optimo & (real < optimo) & (real >= optimo * 0.8)] = 1
+    return codigos
+
+def calcular_color_semaforo_mvp(real: float, optimo: float) -> str:
+    """
+    Calcula el color del semáforo basado en cumplimiento del óptimo para una sola celda
+    (mismas reglas que clasificar_semaforo_mvp)
+    """
+    return str(COLORES_SEMAFORO_MVP[clasificar_semaforo_mvp(real, optimo)])
+
+def calcular_matriz_semaforo_mvp(tabla_mvp: pd.DataFrame, columnas_real: List[str], columnas_optimo: List[str]) -> np.ndarray:
+    """
+    Calcula la matriz de códigos de semáforo (filas de tabla_mvp × pares Real/Óptimo) una sola vez
+    por tabla; la comparten los contadores, la tabla HTML y la exportación a Excel.
+    Los pares cuyas columnas no existen se tratan como 0.
+    """
+    pares = list(zip(columnas_real, columnas_optimo))
+    real = _valores_columnas_mvp(tabla_mvp, [col_real for col_real, _ in pares])
+    optimo = _valores_columnas_mvp(tabla_mvp, [col_optimo for _, col_optimo in pares])
+    return clasificar_semaforo_mvp(real, optimo)
+
+def _valores_columnas_mvp(tabla_mvp: pd.DataFrame, columnas: List[str]) -> np.ndarray:
+    """Valores numéricos de las columnas indicadas; las que no existen o no son numéricas valen 0."""
+    existentes = tabla_mvp.reindex(columns=columnas)
+    return existentes.apply(pd.to_numeric, errors='coerce').fillna(0).to_numpy(dtype=float)
+
+def formatear_valores_mvp(tabla_mvp: pd.DataFrame, columnas: List[str]) -> np.ndarray:
+    """
+    Textos de las celdas de la tabla MVP (separador de miles; negativos y vacíos como "0"),
+    convertidos una sola vez por tabla en lugar de celda por celda al armar el HTML.
+    """
+    valores = _valores_columnas_mvp(tabla_mvp, columnas)
+    textos = np.full(valores.shape, "0", dtype=object)
+    positivos = valores > 0
+    textos[positivos] = [f"{int(valor):,}" for valor in valores[positivos]]
+    return textos
+
+def contar_celdas_semaforo_mvp(tabla_mvp: pd.DataFrame, columnas_real: List[str], columnas_optimo: List[str],
+                               matriz_semaforo: Optional[np.ndarray] = None) -> dict:
+    """
+    Cuenta las celdas por color de semáforo en la tabla MVP
+    Retorna: {'verde': count, 'amarillo': count, 'rojo': count}
+    """
+    logger_mvp.debug('Iniciando conteo de celdas semáforo. Filas: %s, Columnas Real: %s', len(tabla_mvp), len(columnas_real))
+    if matriz_semaforo is None:
+        matriz_semaforo = calcular_matriz_semaforo_mvp(tabla_mvp, columnas_real, columnas_optimo)
+    
+    # Excluir la fila TOTAL y los pares Real/Óptimo que no existen en la tabla
+    if tabla_mvp.index.nlevels > 1:
+        es_total = np.asarray(tabla_mvp.index.get_level_values(0) == 'TOTAL', dtype=bool)
+    else:
+        es_total = np.zeros(len(tabla_mvp), dtype=bool)
+    pares_existentes = np.array([
+        col_real in tabla_mvp.columns and col_optimo in tabla_mvp.columns
+        for col_real, col_optimo in zip(columnas_real, columnas_optimo)
+    ], dtype=bool)
+    
+    conteo = np.bincount(matriz_semaforo[~es_total][:, pares_existentes].ravel(), minlength=len(NOMBRES_SEMAFORO_MVP))
+    return {nombre: int(conteo[codigo]) for codigo, nombre in enumerate(NOMBRES_SEMAFORO_MVP)}
+
+
+# ============================================================================
+# Histórico de snapshots diarios (stock y ventas por bodega × liga × tipo)
+# ============================================================================
+
+class HistoricoSnapshots:
+    """
+    Histórico local del cubo bodega × liga × tipo (stock y ventas USD) de cada día.
+    
+    Parquet particionado por país y fecha: <directorio>/pais=<país>/fecha=<AAAA-MM-DD>/snapshot_v<N>.parquet.
+    Hay un archivo por país y día; si el mismo día se vuelve a guardar, el archivo se reemplaza.
+    Las consultas por rango eligen los archivos por el nombre de sus carpetas y solo leen las
+    fechas pedidas, así que las tendencias no requieren volver a subir los CSV de días anteriores.
+    """
+    
+    COLUMNAS = ['fecha', 'pais', 'bodega', 'liga', 'tipo', 'stock', 'ventas_usd']
+    
+    def __init__(self, directorio: str):
+        self.directorio = directorio
+        # (país, fecha) -> huellas del último snapshot guardado por este proceso
+        self._huellas_guardadas: Dict[Tuple[str, date], Tuple[Optional[str], Optional[str]]] = {}
+    
+    def _ruta_snapshot(self, pais: str, fecha: date) -> str:
+        return os.path.join(self.directorio, f"pais={pais}", f"fecha={fecha.isoformat()}",
+                            f"snapshot_v{VERSION_HISTORICO}.parquet")
+    
+    @staticmethod
+    def cubo_desde_tabla(tabla: pd.DataFrame) -> pd.DataFrame:
+        """
+        Pasa la tabla consolidada (todas las ligas) a formato largo: una fila por bodega, liga y
+        tipo (Planas, Curvas, Apparel, Accessories) con el stock y las ventas en USD.
+        """
+        es_total = tabla[('INFO', 'INFO', 'Bodega')] == 'TOTAL'
+        columnas = [col for col in tabla.columns if col[0] not in ('INFO', 'TOTALES')]
+        bodegas = tabla.loc[~es_total, ('INFO', 'INFO', 'Bodega')].astype(str).to_numpy()
+        valores = tabla.loc[~es_total, columnas].apply(pd.to_numeric, errors='coerce').fillna(0).to_numpy(dtype=float)
+        
+        largo = pd.DataFrame({
+            'bodega': np.repeat(bodegas, len(columnas)),
+            'liga': np.tile([col[0] for col in columnas], len(bodegas)),
+            'tipo': np.tile([col[1] for col in columnas], len(bodegas)),
+            # 'Ventas' y 'Ventas (USD)' son montos en USD en todos los países
+            'medida': np.tile(['stock' if col[2] == 'Stock' else 'ventas_usd' for col in columnas], len(bodegas)),
+            'valor': valores.ravel(),
+        })
+        cubo = largo.pivot_table(index=['bodega', 'liga', 'tipo'], columns='medida', values='valor',
+                                 aggfunc='sum', fill_value=0, sort=False).reset_index()
+        cubo.columns.name = None
+        for medida in ['stock', 'ventas_usd']:
+            if medida not in cubo.columns:
+                cubo[medida] = 0.0
+        cubo['stock'] = cubo['stock'].round().astype('int64')
+        return cubo[['bodega', 'liga', 'tipo', 'stock', 'ventas_usd']]
+    
+    def guardar_snapshot(self, tabla: pd.DataFrame, pais: str, fecha: Optional[date] = None,
+                         huella_stock: Optional[str] = None, huella_ventas: Optional[str] = None) -> Optional[str]:
+        """
+        Guarda (o reemplaza) el snapshot del día de un país a partir de su tabla consolidada con
+        todas las ligas. Con las mismas huellas que el último guardado del día no se reescribe.
+        Un fallo solo se registra: el histórico nunca interrumpe el procesamiento.
+        """
+        fecha = fecha or date.today()
+        if huella_stock is not None and self.ya_guardado(pais, fecha, huella_stock, huella_ventas):
+            return None
+        
+        ruta = self._ruta_snapshot(pais, fecha)
+        try:
+            cubo = self.cubo_desde_tabla(tabla)
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+            # Escritura atómica: una consulta nunca lee un Parquet a medio escribir
+            ruta_temporal = f"{ruta}.{os.getpid()}.tmp"
+            cubo.to_parquet(ruta_temporal, index=False)
+            os.replace(ruta_temporal, ruta)
+        except Exception as e:
+            logger.warning('No se pudo guardar el snapshot histórico %s: %s', ruta, e)
+            return None
+        
+        self._huellas_guardadas[(pais, fecha)] = (huella_stock, huella_ventas)
+        logger.info('Snapshot histórico guardado: %s %s (%s filas)', pais, fecha.isoformat(), len(cubo))
+        return ruta
+    
+    def ya_guardado(self, pais: str, fecha: date, huella_stock: Optional[str], huella_ventas: Optional[str]) -> bool:
+        """Indica si este proceso ya guardó el snapshot del día con los mismos archivos"""
+        return self._huellas_guardadas.get((pais, fecha)) == (huella_stock, huella_ventas)
+    
+    def _particiones(self, paises: Optional[List[str]] = None, desde: Optional[date] = None,
+                     hasta: Optional[date] = None) -> List[Tuple[str, date, str]]:
+        """(país, fecha, ruta) de los snapshots dentro del rango, sin abrir ningún archivo"""
+        if not os.path.isdir(self.directorio):
+            return []
+        
+        particiones = []
+        for carpeta_pais in sorted(os.listdir(self.directorio)):
+            if not carpeta_pais.startswith("pais="):
+                continue
+            pais = carpeta_pais[len("pais="):]
+            if paises is not None and pais not in paises:
+                continue
+            for carpeta_fecha in sorted(os.listdir(os.path.join(self.directorio, carpeta_pais))):
+                if not carpeta_fecha.startswith("fecha="):
+                    continue
+                try:
+                    fecha = date.fromisoformat(carpeta_fecha[len("fecha="):])
+                except ValueError:
+                    continue
+                if (desde is not None and fecha < desde) or (hasta is not None and fecha > hasta):
+                    continue
+                ruta = self._ruta_snapshot(pais, fecha)
+                if os.path.exists(ruta):
+                    particiones.append((pais, fecha, ruta))
+        return particiones
+    
+    def consultar(self, desde: Optional[date] = None, hasta: Optional[date] = None,
+                  paises: Optional[List[str]] = None, ligas: Optional[List[str]] = None) -> pd.DataFrame:
+        """Snapshots entre desde y hasta (inclusive), opcionalmente solo de algunos países y ligas"""
+        partes = []
+        for pais, fecha, ruta in self._particiones(paises, desde, hasta):
+            try:
+                cubo = pd.read_parquet(ruta)
+            except Exception as e:
+                logger.warning('No se pudo leer el snapshot histórico %s: %s', ruta, e)
+                continue
+            if ligas is not None:
+                cubo = cubo[cubo['liga'].isin(ligas)]
+            cubo.insert(0, 'pais', pais)
+            cubo.insert(0, 'fecha', pd.Timestamp(fecha))
+            partes.append(cubo)
+        
+        if not partes:
+            return pd.DataFrame({col: pd.Series(dtype=object) for col in self.COLUMNAS})
+        return pd.concat(partes, ignore_index=True)[self.COLUMNAS]
+    
+    def totales_por_fecha(self, desde: Optional[date] = None, hasta: Optional[date] = None,
+                          paises: Optional[List[str]] = None, ligas: Optional[List[str]] = None) -> pd.DataFrame:
+        """Stock y ventas USD totales por fecha y país (base de las vistas de tendencia)"""
+        snapshots = self.consultar(desde, hasta, paises, ligas)
+        return snapshots.groupby(['fecha', 'pais'], sort=True)[['stock', 'ventas_usd']].sum().reset_index()
+    
+    def fechas_disponibles(self, pais: Optional[str] = None) -> List[date]:
+        """Fechas con snapshot (de un país o de cualquiera)"""
+        paises = [pais] if pais is not None else None
+        return sorted({fecha for _, fecha, _ in self._particiones(paises)})
+    
+    def ultima_fecha(self, pais: Optional[str] = None) -> Optional[date]:
+        fechas = self.fechas_disponibles(pais)
+        return fechas[-1] if fechas else None
+
+# Instancia del histórico
+historico = HistoricoSnapshots(DIRECTORIO_HISTORICO)
+
+def registrar_snapshot_historico(df_stock: pd.DataFrame, pais: str, df_ventas: Optional[pd.DataFrame] = None,
+                                 fecha: Optional[date] = None) -> Optional[str]:
+    """
+    Agrega al histórico el snapshot del día de un país. Usa la tabla consolidada con todas
+    las ligas (del cache si ya se calculó para la liga "Todas").
+    """
+    if df_stock is None:
+        return None
+    huella_stock = obtener_huella_dataframe(df_stock)
+    huella_ventas = obtener_huella_dataframe(df_ventas)
+    if historico.ya_guardado(pais, fecha or date.today(), huella_stock, huella_ventas):
+        return None
+    
+    tabla = data_processor.procesar_datos_consolidados(df_stock, pais, None, df_ventas)
+    if tabla is None:
+        return None
+    return historico.guardar_snapshot(tabla, pais, fecha, huella_stock, huella_ventas)
+
+
+# ============================================================================
+# Reportes: distribuciones por grupo de tiendas y archivos Excel
+# ============================================================================
+
+def calcular_distribucion_stock(tabla: pd.DataFrame, pais: str) -> Optional[Dict[str, Any]]:
+    """
+    Calcula la distribución porcentual de stock (planas + curvas) por liga en cada bodega
+    de la tabla consolidada, separada en tiendas principales, outlets, secundarias y
+    (El Salvador) tienda outlet especial. Devuelve None si no hay bodegas o columnas de liga.
+    """
+    if tabla is None or len(tabla) == 0:
+        return None
+    
+    logger.info('Generando distribución de ligas por bodega para %s', pais)
+    
+    # DEBUG: Mostrar información de la tabla
+    logger.debug('Columnas disponibles: %s', list(tabla.columns))
+    logger.debug('Índices (bodegas): %s', list(tabla.index))
+    
+    # Buscar la columna que contiene los nombres de las bodegas
+    nombre_columna_bodega = None
+    if isinstance(tabla.columns, pd.MultiIndex):
+        # Para MultiIndex, buscar columna con nombres de bodegas
+        for col in tabla.columns:
+            if len(col) >= 3 and col[2] == 'Bodega':
+                nombre_columna_bodega = col
+                break
+        # Si no encuentra "Bodega" en nivel 2, buscar en otros niveles
+        if nombre_columna_bodega is None:
+            for col in tabla.columns:
+                if 'INFO' in str(col) and 'Bodega' in str(col):
+                    nombre_columna_bodega = col
+                    break
+    
+    logger.info('Columna de nombres de bodega encontrada: %s', nombre_columna_bodega)
+    
+    # Filtrar solo las bodegas (excluir fila TOTAL)
+    df_bodegas = tabla[tabla.index != 'TOTAL'].copy()
+    
+    # Excluir bodegas centrales de las distribuciones
+    if pais == "Costa Rica" and "Bodega Central NEW ERA" in df_bodegas.index:
+        df_bodegas = df_bodegas.drop("Bodega Central NEW ERA")
+    elif pais == "PANAMA":
+        bodegas_panama_excluir = ['Almacén general', 'Bodega Central Albrook']
+        for bodega in bodegas_panama_excluir:
+            if bodega in df_bodegas.index:
+                df_bodegas = df_bodegas.drop(bodega)
+    
+    if len(df_bodegas) == 0:
+        notificador.aviso("No se encontraron bodegas en los datos")
+        return None
+    
+    # Obtener nombres reales de bodegas
+    if nombre_columna_bodega is not None:
+        nombres_reales_bodegas = df_bodegas[nombre_columna_bodega].tolist()
+        logger.debug('Nombres reales de bodegas: %s', nombres_reales_bodegas)
+    else:
+        # Fallback: usar índices si no encuentra la columna de nombres
+        nombres_reales_bodegas = list(df_bodegas.index)
+        logger.debug('Usando índices como nombres de bodegas: %s', nombres_reales_bodegas)
+        notificador.aviso("No se pudo encontrar la columna de nombres de bodegas, usando índices")
+        notificador.info(f"Estructura de columnas: {tabla.columns.tolist()[:5]}")
+    
+    # Definir las ligas a analizar
+    ligas = ['MLB', 'NBA', 'NFL', 'MOTORSPORT', 'ENTERTAINMENT']
+    
+    # Verificar si la tabla tiene columnas MultiIndex
+    es_multiindex = isinstance(df_bodegas.columns, pd.MultiIndex)
+    logger.debug('Es MultiIndex: %s', es_multiindex)
+    
+    # DEBUG: Verificar qué columnas de ligas existen (para MultiIndex)
+    columnas_encontradas = []
+    if es_multiindex:
+        for liga in ligas:
+            # Buscar columnas con estructura (Liga, Tipo, 'Stock')
+            col_planas = (liga, 'Planas', 'Stock')
+            col_curvas = (liga, 'Curvas', 'Stock')
+            
+            if col_planas in df_bodegas.columns:
+                columnas_encontradas.append(col_planas)
+            if col_curvas in df_bodegas.columns:
+                columnas_encontradas.append(col_curvas)
+    else:
+        for liga in ligas:
+            col_planas = f"{liga} - Planas"
+            col_curvas = f"{liga} - Curvas"
+            if col_planas in df_bodegas.columns:
+                columnas_encontradas.append(col_planas)
+            if col_curvas in df_bodegas.columns:
+                columnas_encontradas.append(col_curvas)
+    
+    logger.debug('Columnas de ligas encontradas: %s', columnas_encontradas)
+    
+    if not columnas_encontradas:
+        notificador.aviso("No se encontraron columnas de stock por liga")
+        # Mostrar algunas columnas de ejemplo
+        notificador.info(f"Columnas disponibles en la tabla: {list(tabla.columns)[:10]}")
+        return None
+    
+    # Calcular stock de planas + curvas por liga para cada bodega
+    distribucion_data = []
+    
+    for i, bodega_idx in enumerate(df_bodegas.index):
+        # Usar nombre real de bodega si está disponible
+        nombre_bodega = nombres_reales_bodegas[i] if i < len(nombres_reales_bodegas) else bodega_idx
+        bodega_data = {'Bodega': nombre_bodega}
+        total_stock_bodega = 0
+        
+        # Calcular stock por liga (planas + curvas)
+        for liga in ligas:
+            if es_multiindex:
+                # Para columnas MultiIndex: (Liga, Tipo, 'Stock')
+                col_planas = (liga, 'Planas', 'Stock')
+                col_curvas = (liga, 'Curvas', 'Stock')
+                
+                stock_planas = df_bodegas.loc[bodega_idx, col_planas] if col_planas in df_bodegas.columns else 0
+                stock_curvas = df_bodegas.loc[bodega_idx, col_curvas] if col_curvas in df_bodegas.columns else 0
+            else:
+                # Para columnas simples: "LIGA - Tipo"
+                col_planas = f"{liga} - Planas"
+                col_curvas = f"{liga} - Curvas"
+                
+                stock_planas = df_bodegas.loc[bodega_idx, col_planas] if col_planas in df_bodegas.columns else 0
+                stock_curvas = df_bodegas.loc[bodega_idx, col_curvas] if col_curvas in df_bodegas.columns else 0
+            
+            # Asegurar que son números
+            try:
+                stock_planas = float(stock_planas) if stock_planas != 0 else 0
+                stock_curvas = float(stock_curvas) if stock_curvas != 0 else 0
+            except:
+                stock_planas = 0
+                stock_curvas = 0
+            
+            stock_liga = stock_planas + stock_curvas
+            bodega_data[liga] = stock_liga
+            total_stock_bodega += stock_liga
+            
+            # DEBUG: Mostrar stock por liga y bodega
+            if stock_liga > 0:
+                logger.debug('Bodega %s, Liga %s: Planas=%s, Curvas=%s, Total=%s', nombre_bodega, liga, stock_planas, stock_curvas, stock_liga)
+        
+        # DEBUG: Mostrar totales por bodega
+        logger.debug('Bodega %s: Total stock = %s', nombre_bodega, total_stock_bodega)
+        
+        # Calcular porcentajes
+        if total_stock_bodega > 0:
+            for liga in ligas:
+                bodega_data[f"{liga}_porcentaje"] = (bodega_data[liga] / total_stock_bodega) * 100
+        else:
+            for liga in ligas:
+                bodega_data[f"{liga}_porcentaje"] = 0
+        
+        bodega_data['Total'] = total_stock_bodega
+        distribucion_data.append(bodega_data)
+    
+    # Convertir a DataFrame
+    df_distribucion = pd.DataFrame(distribucion_data)
+    
+    if len(df_distribucion) == 0:
+        return None
+    
+    # Filtrar CENTRAL NEW ERA, New Era Central, Bodega Central NEW ERA y TOTAL del gráfico
+    bodegas_excluir = ['CENTRAL NEW ERA', 'New Era Central', 'TOTAL']
+    
+    # Para Costa Rica, también excluir "Bodega Central NEW ERA"
+    if pais == "Costa Rica":
+        bodegas_excluir.append('Bodega Central NEW ERA')
+    # Para PANAMA, excluir bodegas centrales
+    elif pais == "PANAMA":
+        bodegas_excluir.extend(['Almacén general', 'Bodega Central Albrook'])
+    
+    df_distribucion = df_distribucion[
+        ~df_distribucion['Bodega'].isin(bodegas_excluir)
+    ].copy()
+    
+    if len(df_distribucion) == 0:
+        return None
+    
+    # DEBUG: Verificar contenido del DataFrame
+    logger.info('DataFrame de distribución creado con %s filas (sin CENTRAL NEW ERA y TOTAL)', len(df_distribucion))
+    logger.debug('Bodegas encontradas: %s', df_distribucion['Bodega'].tolist())
+    
+    # Definir nombres dinámicos según el país
+    if pais == "Guatemala":
+        nombre_tiendas_secundarias = "Tiendas Departamentales"
+        nombre_tiendas_principales = "Tiendas de Ciudad"
+    elif pais == "Costa Rica":
+        nombre_tiendas_secundarias = "Tiendas Departamentales"
+        nombre_tiendas_principales = "Tiendas Franquicia"
+    elif pais == "Honduras":
+        nombre_tiendas_secundarias = "Tiendas Departamentales"
+        nombre_tiendas_principales = "Tiendas Franquicia"
+    else:
+        nombre_tiendas_secundarias = "Tiendas Franquicia"
+        nombre_tiendas_principales = "Tiendas de Ciudad"
+    
+    # Definir tiendas de ciudad, outlets y secundarias
+    bodegas_principales = [
+        'NE Oakland', 'NE Cayala', 'NE Miraflores', 'NE Portales', 'NE Concepcion', 
+        'NE Naranjo', 'NE Vistares', 'NE Peri Roosvelt', 'NE Plaza Videre'
+    ]
+    
+    bodegas_outlets = [
+        'NE Metronorte', 'NE Metrocentro Outlet', 'NE Outlet Santa clara'
+    ]
+    
+    # Para El Salvador, separar NE METROCENTRO LOURDES como tienda outlet especial
+    if pais == "El Salvador":
+        bodega_outlet_especial = ['NE METROCENTRO LOURDES']
+        df_outlet_especial = df_distribucion[df_distribucion['Bodega'].isin(bodega_outlet_especial)].copy()
+        
+        # Separar los datos en cuatro grupos para El Salvador
+        df_principales = df_distribucion[df_distribucion['Bodega'].isin(bodegas_principales)].copy()
+        df_outlets = df_distribucion[df_distribucion['Bodega'].isin(bodegas_outlets)].copy()
+        df_secundarias = df_distribucion[
+            ~df_distribucion['Bodega'].isin(bodegas_principales + bodegas_outlets + bodega_outlet_especial)
+        ].copy()
+    else:
+        # Separar los datos en tres grupos para otros países
+        df_principales = df_distribucion[df_distribucion['Bodega'].isin(bodegas_principales)].copy()
+        df_outlets = df_distribucion[df_distribucion['Bodega'].isin(bodegas_outlets)].copy()
+        df_secundarias = df_distribucion[
+            ~df_distribucion['Bodega'].isin(bodegas_principales + bodegas_outlets)
+        ].copy()
+        
+        # Excluir bodegas centrales específicamente de todas las categorías
+        if pais == "Costa Rica":
+            df_secundarias = df_secundarias[df_secundarias['Bodega'] != 'Bodega Central NEW ERA'].copy()
+        elif pais == "PANAMA":
+            df_secundarias = df_secundarias[
+                ~df_secundarias['Bodega'].isin(['Almacén general', 'Bodega Central Albrook'])
+            ].copy()
+        
+        df_outlet_especial = pd.DataFrame()  # DataFrame vacío para otros países
+    
+    # DEBUG: Verificar separación de datos
+    logger.debug('Bodegas principales encontradas: %s', df_principales['Bodega'].tolist() if len(df_principales) > 0 else 'NINGUNA')
+    logger.debug('Total tiendas de ciudad: %s', len(df_principales))
+    logger.debug('Bodegas outlets encontradas: %s', df_outlets['Bodega'].tolist() if len(df_outlets) > 0 else 'NINGUNA')
+    logger.debug('Total bodegas outlets: %s', len(df_outlets))
+    logger.debug('Bodegas secundarias encontradas: %s', df_secundarias['Bodega'].tolist() if len(df_secundarias) > 0 else 'NINGUNA')
+    logger.debug('Total tiendas departamentales: %s', len(df_secundarias))
+    
+    return {
+        'df_bodegas': df_bodegas,
+        'nombres_reales_bodegas': nombres_reales_bodegas,
+        'es_multiindex': es_multiindex,
+        'ligas': ligas,
+        'nombre_tiendas_principales': nombre_tiendas_principales,
+        'nombre_tiendas_secundarias': nombre_tiendas_secundarias,
+        'bodegas_principales': bodegas_principales,
+        'bodegas_outlets': bodegas_outlets,
+        'bodega_outlet_especial': bodega_outlet_especial if pais == "El Salvador" else [],
+        'df_principales': df_principales,
+        'df_outlets': df_outlets,
+        'df_secundarias': df_secundarias,
+        'df_outlet_especial': df_outlet_especial
+    }
+
+def calcular_distribucion_ventas(distribucion: Dict[str, Any], pais: str) -> Dict[str, pd.DataFrame]:
+    """
+    Calcula la distribución porcentual de ventas (USD) por liga en cada bodega a partir del
+    resultado de calcular_distribucion_stock, con los mismos grupos de tiendas
+    (grupos vacíos si la tabla no trae ventas por bodega).
+    """
+    df_bodegas = distribucion['df_bodegas']
+    nombres_reales_bodegas = distribucion['nombres_reales_bodegas']
+    es_multiindex = distribucion['es_multiindex']
+    ligas = distribucion['ligas']
+    bodegas_principales = distribucion['bodegas_principales']
+    bodegas_outlets = distribucion['bodegas_outlets']
+    bodega_outlet_especial = distribucion['bodega_outlet_especial']
+    
+    # Procesar datos de distribución de ventas
+    distribucion_ventas_data = []
+    
+    for i, bodega_idx in enumerate(df_bodegas.index):
+        # Usar nombre real de bodega si está disponible
+        nombre_bodega = nombres_reales_bodegas[i] if i < len(nombres_reales_bodegas) else bodega_idx
+        
+        # Excluir bodegas centrales de las distribuciones de ventas
+        if pais == "Costa Rica" and nombre_bodega == "Bodega Central NEW ERA":
+            continue
+        elif pais == "PANAMA" and nombre_bodega in ['Almacén general', 'Bodega Central Albrook']:
+            continue
+        bodega_data_ventas = {'Bodega': nombre_bodega}
+        total_ventas_bodega = 0
+        
+        # Calcular ventas por liga (planas + curvas)
+        for liga in ligas:
+            if es_multiindex:
+                # Para columnas MultiIndex: (Liga, Tipo, 'Ventas')
+                col_planas_ventas = (liga, 'Planas', 'Ventas')
+                col_curvas_ventas = (liga, 'Curvas', 'Ventas')
+                
+                ventas_planas = df_bodegas.loc[bodega_idx, col_planas_ventas] if col_planas_ventas in df_bodegas.columns else 0
+                ventas_curvas = df_bodegas.loc[bodega_idx, col_curvas_ventas] if col_curvas_ventas in df_bodegas.columns else 0
+            else:
+                # Para columnas simples: "LIGA - Tipo - Ventas"  
+                col_planas_ventas = f"{liga} - Planas - Ventas"
+                col_curvas_ventas = f"{liga} - Curvas - Ventas"
+                
+                ventas_planas = df_bodegas.loc[bodega_idx, col_planas_ventas] if col_planas_ventas in df_bodegas.columns else 0
+                ventas_curvas = df_bodegas.loc[bodega_idx, col_curvas_ventas] if col_curvas_ventas in df_bodegas.columns else 0
+            
+            # Asegurar que son números
+            try:
+                ventas_planas = float(ventas_planas) if ventas_planas != 0 else 0
+                ventas_curvas = float(ventas_curvas) if ventas_curvas != 0 else 0
+            except:
+                ventas_planas = 0
+                ventas_curvas = 0
+            
+            ventas_liga = ventas_planas + ventas_curvas
+            bodega_data_ventas[liga] = ventas_liga
+            total_ventas_bodega += ventas_liga
+        
+        # Calcular porcentajes de ventas
+        if total_ventas_bodega > 0:
+            for liga in ligas:
+                bodega_data_ventas[f"{liga}_porcentaje_ventas"] = (bodega_data_ventas[liga] / total_ventas_bodega) * 100
+        else:
+            for liga in ligas:
+                bodega_data_ventas[f"{liga}_porcentaje_ventas"] = 0
+        
+        bodega_data_ventas['Total_Ventas'] = total_ventas_bodega
+        distribucion_ventas_data.append(bodega_data_ventas)
+    
+    # Convertir a DataFrame  
+    df_distribucion_ventas = pd.DataFrame(distribucion_ventas_data)
+    
+    if len(df_distribucion_ventas) == 0:
+        notificador.aviso("No hay datos de ventas disponibles para mostrar gráficos.")
+        df_distribucion_ventas = pd.DataFrame(columns=['Bodega'])
+    
+    # Filtrar CENTRAL NEW ERA, New Era Central y TOTAL del gráfico
+    bodegas_excluir_ventas = ['CENTRAL NEW ERA', 'New Era Central', 'TOTAL']
+    # Para PANAMA, excluir bodegas centrales
+    if pais == "PANAMA":
+        bodegas_excluir_ventas.extend(['Almacén general', 'Bodega Central Albrook'])
+    
+    df_distribucion_ventas = df_distribucion_ventas[
+        ~df_distribucion_ventas['Bodega'].isin(bodegas_excluir_ventas)
+    ].copy()
+    
+    # Separar los datos para ventas
+    df_principales_ventas = df_distribucion_ventas[df_distribucion_ventas['Bodega'].isin(bodegas_principales)].copy()
+    df_outlets_ventas = df_distribucion_ventas[df_distribucion_ventas['Bodega'].isin(bodegas_outlets)].copy()
+    
+    # Para El Salvador, separar NE METROCENTRO LOURDES como tienda outlet especial
+    if pais == "El Salvador":
+        df_outlet_especial_ventas = df_distribucion_ventas[df_distribucion_ventas['Bodega'].isin(bodega_outlet_especial)].copy()
+        df_secundarias_ventas = df_distribucion_ventas[
+            ~df_distribucion_ventas['Bodega'].isin(bodegas_principales + bodegas_outlets + bodega_outlet_especial)
+        ].copy()
+    else:
+        df_outlet_especial_ventas = pd.DataFrame()
+        df_secundarias_ventas = df_distribucion_ventas[
+            ~df_distribucion_ventas['Bodega'].isin(bodegas_principales + bodegas_outlets)
+        ].copy()
+        
+        # Excluir bodegas centrales específicamente de ventas
+        if pais == "Costa Rica":
+            df_secundarias_ventas = df_secundarias_ventas[df_secundarias_ventas['Bodega'] != 'Bodega Central NEW ERA'].copy()
+        elif pais == "PANAMA":
+            df_secundarias_ventas = df_secundarias_ventas[
+                ~df_secundarias_ventas['Bodega'].isin(['Almacén general', 'Bodega Central Albrook'])
+            ].copy()
+    
+    return {
+        'df_principales_ventas': df_principales_ventas,
+        'df_outlets_ventas': df_outlets_ventas,
+        'df_secundarias_ventas': df_secundarias_ventas,
+        'df_outlet_especial_ventas': df_outlet_especial_ventas
+    }
+
+def armar_tablas_exportacion_distribuciones(distribucion: Dict[str, Any], pais: str,
+                                            distribucion_ventas: Optional[Dict[str, pd.DataFrame]] = None) -> Dict[str, pd.DataFrame]:
+    """Arma el diccionario de tablas que recibe el Excel de distribuciones (stock y, si hay, ventas)"""
+    claves = ['df_principales', 'df_outlets', 'df_secundarias']
+    if distribucion_ventas is not None:
+        claves += ['df_principales_ventas', 'df_outlets_ventas', 'df_secundarias_ventas']
+    
+    # Tienda Outlet especial solo para El Salvador
+    if pais == "El Salvador":
+        claves.append('df_outlet_especial')
+        if distribucion_ventas is not None:
+            claves.append('df_outlet_especial_ventas')
+    
+    tablas = {**distribucion, **(distribucion_ventas or {})}
+    return {clave: tablas[clave] if len(tablas[clave]) > 0 else pd.DataFrame() for clave in claves}
+
+def calcular_tablas_exportacion_distribuciones(tabla: pd.DataFrame, pais: str) -> Optional[Tuple[Dict[str, pd.DataFrame], bool]]:
+    """
+    Tablas del Excel de distribuciones que ofrece la pestaña del país para la tabla
+    consolidada, y si incluyen ventas; None si la pestaña no ofrece ese Excel.
+    """
+    distribucion = calcular_distribucion_stock(tabla, pais)
+    if distribucion is None:
+        return None
+    
+    tiene_ventas = any('Ventas' in str(col) for col in distribucion['df_bodegas'].columns)
+    if tiene_ventas and pais in ["Guatemala", "El Salvador", "Costa Rica", "Honduras", "PANAMA"]:
+        distribucion_ventas = calcular_distribucion_ventas(distribucion, pais)
+        return armar_tablas_exportacion_distribuciones(distribucion, pais, distribucion_ventas), True
+    if not tiene_ventas and pais in ["Guatemala", "El Salvador", "Costa Rica", "Honduras"]:
+        return armar_tablas_exportacion_distribuciones(distribucion, pais), False
+    return None
+
+@instrumentacion.etapa("excel_distribuciones")
+def construir_excel_distribuciones_reales(tablas_reales: Dict[str, pd.DataFrame], pais: str, tiene_ventas: bool) -> bytes:
+    """Arma el Excel de las tablas de distribución por grupo de tiendas tal como aparecen en el tablero"""
+    logger.info('Iniciando exportación de distribuciones reales para %s', pais)
+    
+    # Definir nombres dinámicos según el país
+    if pais == "Guatemala":
+        nombre_tiendas_secundarias = "Tiendas Departamentales"
+        nombre_tiendas_principales = "Tiendas de Ciudad"
+    elif pais == "Costa Rica":
+        nombre_tiendas_secundarias = "Tiendas Departamentales"
+        nombre_tiendas_principales = "Tiendas Franquicia"
+    elif pais == "Honduras":
+        nombre_tiendas_secundarias = "Tiendas Departamentales"
+        nombre_tiendas_principales = "Tiendas Franquicia"
+    else:
+        nombre_tiendas_secundarias = "Tiendas Franquicia"
+        nombre_tiendas_principales = "Tiendas de Ciudad"
+    
+    # Crear archivo Excel en memoria
+    buffer = BytesIO()
+    output = pd.ExcelWriter(buffer, engine='openpyxl')
+    
+    if not tiene_ventas:
+        # Solo hay stock - crear una pestaña con las 3 tablas
+        sheet_name = "Distribución Stock"
+        row_offset = 0
+        
+        # Escribir tabla de Tiendas Principales
+        if 'df_principales' in tablas_reales and len(tablas_reales['df_principales']) > 0:
+            # Agregar título
+            titulo_principales = pd.DataFrame([[f'🏪 {nombre_tiendas_principales.upper()}']], columns=[''])
+            titulo_principales.to_excel(output, sheet_name=sheet_name, startrow=row_offset, index=False, header=False)
+            row_offset += 2
+            
+            tablas_reales['df_principales'].to_excel(output, sheet_name=sheet_name, startrow=row_offset, index=False)
+            row_offset += len(tablas_reales['df_principales']) + 3
+        
+        # Escribir tabla de Outlets
+        if 'df_outlets' in tablas_reales and len(tablas_reales['df_outlets']) > 0:
+            titulo_outlets = pd.DataFrame([['🛒 OUTLETS']], columns=[''])
+            titulo_outlets.to_excel(output, sheet_name=sheet_name, startrow=row_offset, index=False, header=False)
+            row_offset += 2
+            
+            tablas_reales['df_outlets'].to_excel(output, sheet_name=sheet_name, startrow=row_offset, index=False)
+            row_offset += len(tablas_reales['df_outlets']) + 3
+        
+        # Escribir tabla de Tiendas Departamentales
+        if 'df_secundarias' in tablas_reales and len(tablas_reales['df_secundarias']) > 0:
+            titulo_secundarias = pd.DataFrame([[f'🏬 {nombre_tiendas_secundarias.upper()}']], columns=[''])
+            titulo_secundarias.to_excel(output, sheet_name=sheet_name, startrow=row_offset, index=False, header=False)
+            row_offset += 2
+            
+            tablas_reales['df_secundarias'].to_excel(output, sheet_name=sheet_name, startrow=row_offset, index=False)
+            row_offset += len(tablas_reales['df_secundarias']) + 3
+        
+        # Escribir tabla de Tienda Outlet (solo para El Salvador)
+        if 'df_outlet_especial' in tablas_reales and len(tablas_reales['df_outlet_especial']) > 0:
+            titulo_outlet_especial = pd.DataFrame([['🏪 TIENDA OUTLET']], columns=[''])
+            titulo_outlet_especial.to_excel(output, sheet_name=sheet_name, startrow=row_offset, index=False, header=False)
+            row_offset += 2
+            
+            tablas_reales['df_outlet_especial'].to_excel(output, sheet_name=sheet_name, startrow=row_offset, index=False)
+    
+    else:
+        # Hay stock y ventas - crear 3 pestañas
+        
+        # PESTAÑA 1: Distribución Stock
+        sheet_name_stock = "Distribución Stock"
+        row_offset = 0
+        
+        if 'df_principales' in tablas_reales and len(tablas_reales['df_principales']) > 0:
+            titulo = pd.DataFrame([[f'🏪 {nombre_tiendas_principales.upper()}']], columns=[''])
+            titulo.to_excel(output, sheet_name=sheet_name_stock, startrow=row_offset, index=False, header=False)
+            row_offset += 2
+            tablas_reales['df_principales'].to_excel(output, sheet_name=sheet_name_stock, startrow=row_offset, index=False)
+            row_offset += len(tablas_reales['df_principales']) + 3
+        
+        if 'df_outlets' in tablas_reales and len(tablas_reales['df_outlets']) > 0:
+            titulo = pd.DataFrame([['🛒 OUTLETS']], columns=[''])
+            titulo.to_excel(output, sheet_name=sheet_name_stock, startrow=row_offset, index=False, header=False)
+            row_offset += 2
+            tablas_reales['df_outlets'].to_excel(output, sheet_name=sheet_name_stock, startrow=row_offset, index=False)
+            row_offset += len(tablas_reales['df_outlets']) + 3
+        
+        if 'df_secundarias' in tablas_reales and len(tablas_reales['df_secundarias']) > 0:
+            titulo = pd.DataFrame([[f'🏬 {nombre_tiendas_secundarias.upper()}']], columns=[''])
+            titulo.to_excel(output, sheet_name=sheet_name_stock, startrow=row_offset, index=False, header=False)
+            row_offset += 2
+            tablas_reales['df_secundarias'].to_excel(output, sheet_name=sheet_name_stock, startrow=row_offset, index=False)
+            row_offset += len(tablas_reales['df_secundarias']) + 3
+        
+        # Escribir tabla de Tienda Outlet en pestaña de stock (solo para El Salvador)
+        if 'df_outlet_especial' in tablas_reales and len(tablas_reales['df_outlet_especial']) > 0:
+            titulo = pd.DataFrame([['🏪 TIENDA OUTLET']], columns=[''])
+            titulo.to_excel(output, sheet_name=sheet_name_stock, startrow=row_offset, index=False, header=False)
+            row_offset += 2
+            tablas_reales['df_outlet_especial'].to_excel(output, sheet_name=sheet_name_stock, startrow=row_offset, index=False)
+        
+        # PESTAÑA 2: Distribución Ventas
+        sheet_name_ventas = "Distribución Ventas"
+        row_offset = 0
+        
+        if 'df_principales_ventas' in tablas_reales and len(tablas_reales['df_principales_ventas']) > 0:
+            titulo = pd.DataFrame([[f'🏪 {nombre_tiendas_principales.upper()} - VENTAS']], columns=[''])
+            titulo.to_excel(output, sheet_name=sheet_name_ventas, startrow=row_offset, index=False, header=False)
+            row_offset += 2
+            tablas_reales['df_principales_ventas'].to_excel(output, sheet_name=sheet_name_ventas, startrow=row_offset, index=False)
+            row_offset += len(tablas_reales['df_principales_ventas']) + 3
+        
+        if 'df_outlets_ventas' in tablas_reales and len(tablas_reales['df_outlets_ventas']) > 0:
+            titulo = pd.DataFrame([['🛒 OUTLETS - VENTAS']], columns=[''])
+            titulo.to_excel(output, sheet_name=sheet_name_ventas, startrow=row_offset, index=False, header=False)
+            row_offset += 2
+            tablas_reales['df_outlets_ventas'].to_excel(output, sheet_name=sheet_name_ventas, startrow=row_offset, index=False)
+            row_offset += len(tablas_reales['df_outlets_ventas']) + 3
+        
+        if 'df_secundarias_ventas' in tablas_reales and len(tablas_reales['df_secundarias_ventas']) > 0:
+            titulo = pd.DataFrame([[f'🏬 {nombre_tiendas_secundarias.upper()} - VENTAS']], columns=[''])
+            titulo.to_excel(output, sheet_name=sheet_name_ventas, startrow=row_offset, index=False, header=False)
+            row_offset += 2
+            tablas_reales['df_secundarias_ventas'].to_excel(output, sheet_name=sheet_name_ventas, startrow=row_offset, index=False)
+            row_offset += len(tablas_reales['df_secundarias_ventas']) + 3
+        
+        # Escribir tabla de Tienda Outlet - Ventas (solo para El Salvador)
+        if 'df_outlet_especial_ventas' in tablas_reales and len(tablas_reales['df_outlet_especial_ventas']) > 0:
+            titulo = pd.DataFrame([['🏪 TIENDA OUTLET - VENTAS']], columns=[''])
+            titulo.to_excel(output, sheet_name=sheet_name_ventas, startrow=row_offset, index=False, header=False)
+            row_offset += 2
+            tablas_reales['df_outlet_especial_ventas'].to_excel(output, sheet_name=sheet_name_ventas, startrow=row_offset, index=False)
+        
+        # Nota: Se removió la pestaña de comparación como se solicitó
+    
+    # Aplicar formato básico a todas las pestañas
+    workbook = output.book
+    header_fill = PatternFill(start_color='4a7a8c', end_color='4a7a8c', fill_type='solid')
+    header_font = Font(color='FFFFFF', bold=True, size=12)
+    titulo_fill = PatternFill(start_color='2d3748', end_color='2d3748', fill_type='solid')
+    titulo_font = Font(color='FFFFFF', bold=True, size=14)
+    border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'), bottom=Side(style='thin'))
+    center_alignment = Alignment(horizontal='center', vertical='center')
+    
+    for sheet_name in workbook.sheetnames:
+        worksheet = workbook[sheet_name]
+        
+        # Aplicar formato a todas las celdas
+        for row in worksheet.iter_rows():
+            for cell in row:
+                cell.border = border
+                cell.alignment = center_alignment
+                
+                # Formato numérico con 2 decimales
+                if isinstance(cell.value, (int, float)) and cell.value != 0:
+                    cell.number_format = '0.00'
+                
+                # Formato para títulos de secciones (🏪, 🛒, 🏬)
+                if cell.value and isinstance(cell.value, str) and any(emoji in str(cell.value) for emoji in ['🏪', '🛒', '🏬']):
+                    cell.fill = titulo_fill
+                    cell.font = titulo_font
+                # Formato para headers de tablas
+                elif cell.row > 1 and cell.value and isinstance(cell.value, str) and 'Bodega' in str(cell.value):
+                    cell.fill = header_fill
+                    cell.font = header_font
+        
+        # Ajustar ancho de columnas
+        for column in worksheet.columns:
+            max_length = 0
+            column_letter = get_column_letter(column[0].column)
+            for cell in column:
+                try:
+                    if len(str(cell.value)) > max_length:
+                        max_length = len(cell.value)
+                except:
+                    pass
+            adjusted_width = min(max_length + 2, 20)
+            worksheet.column_dimensions[column_letter].width = adjusted_width
+    
+    output.close()
+    return buffer.getvalue()
+
+@instrumentacion.etapa("excel_consolidado")
+def construir_excel_consolidado(tabla: pd.DataFrame, nombre_archivo: str, pais: str,
+                                selected_league: Optional[str] = None) -> bytes:
+    """Arma el Excel de la tabla consolidada con formato profesional y semáforo; devuelve el archivo en bytes"""
+    if selected_league:
+        logger.info('Iniciando exportación a Excel para %s - %s', selected_league, pais)
+    else:
+        logger.info('Iniciando exportación a Excel para %s', pais)
+    
+    # Crear copia del DataFrame para exportación
+    df_export = tabla.copy()
+    df_export.columns = [' - '.join(col).strip(' - ') for col in df_export.columns.values]
+    
+    # Crear archivo Excel en memoria
+    buffer = BytesIO()
+    output = pd.ExcelWriter(buffer, engine='openpyxl')
+    
+    if selected_league:
+        sheet_name = f"{selected_league} {pais}"
+    else:
+        sheet_name = f"Stock {pais}"
+    
+    df_export.to_excel(output, sheet_name=sheet_name, index=False)
+    
+    # Aplicar formato
+    worksheet = output.sheets[sheet_name]
+    
+    # Estilos
+    header_fill = PatternFill(start_color='4a7a8c', end_color='4a7a8c', fill_type='solid')
+    header_font = Font(color='FFFFFF', bold=True, size=14)
+    
+    total_fill = PatternFill(start_color='d35400', end_color='d35400', fill_type='solid')
+    total_font = Font(color='FFFFFF', bold=True, size=14)
+    
+    normal_font = Font(color='000000', size=10)
+    
+    # Colores para el semáforo
+    verde_fill = PatternFill(start_color='28a745', end_color='28a745', fill_type='solid')
+    amarillo_fill = PatternFill(start_color='ffc107', end_color='ffc107', fill_type='solid')
+    rojo_fill = PatternFill(start_color='dc3545', end_color='dc3545', fill_type='solid')
+    gris_fill = PatternFill(start_color='6c757d', end_color='6c757d', fill_type='solid')
+    semaforo_font = Font(color='FFFFFF', bold=True, size=10)
+    
+    border = Border(
+        left=Side(style='thin'), 
+        right=Side(style='thin'), 
+        top=Side(style='thin'), 
+        bottom=Side(style='thin')
+    )
+    center_alignment = Alignment(horizontal='center', vertical='center')
+    
+    # Aplicar formatos
+    for row in worksheet.iter_rows():
+        for cell in row:
+            cell.border = border
+            cell.alignment = center_alignment
+            
+            if cell.row == 1:
+                cell.fill = header_fill
+                cell.font = header_font
+            elif cell.row == worksheet.max_row:
+                cell.fill = total_fill
+                cell.font = total_font
+            else:
+                cell.font = normal_font
+    
+    # Aplicar semáforo a la columna "% DE CUMPLIMIENTO"
+    col_cumplimiento = None
+    col_total_headwear = None
+    
+    # Buscar columnas por nombre que contenga las palabras clave
+    for col in range(1, worksheet.max_column + 1):
+        cell_value = worksheet.cell(row=1, column=col).value
+        if cell_value:
+            if "% DE CUMPLIMIENTO" in str(cell_value):
+                col_cumplimiento = col
+            elif "TOTAL HEADWEAR" in str(cell_value):
+                col_total_headwear = col
+    
+    if col_cumplimiento and col_total_headwear:
+        logger.info('Aplicando semáforo - Col cumplimiento: %s, Col total headwear: %s', col_cumplimiento, col_total_headwear)
+        capacidades = country_manager.get_capacidades(pais)
+        
+        for row in range(2, worksheet.max_row + 1):
+            bodega = worksheet.cell(row=row, column=1).value
+            
+            # Obtener total_headwear de la columna encontrada
+            total_headwear = worksheet.cell(row=row, column=col_total_headwear).value or 0
+            
+            if bodega == 'TOTAL':
+                capacidad = country_manager.get_country_data(pais).get_total_capacity()
+            else:
+                capacidad = capacidades.get(bodega, 0)
+            
+            cell = worksheet.cell(row=row, column=col_cumplimiento)
+            
+            if capacidad > 0:
+                color = stock_analyzer.obtener_color_semaforo(total_headwear, capacidad)
+                if color == "verde":
+                    cell.fill = verde_fill
+                elif color == "amarillo":
+                    cell.fill = amarillo_fill
+                else:
+                    cell.fill = rojo_fill
+            else:
+                cell.fill = gris_fill
+            
+            if row == worksheet.max_row:
+                cell.font = Font(color='FFFFFF', bold=True, size=14)
+            else:
+                cell.font = semaforo_font
+    else:
+        logger.warning('No se pudieron encontrar las columnas para el semáforo - Col cumplimiento: %s, Col total headwear: %s', col_cumplimiento, col_total_headwear)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Columnas disponibles en Excel:")
+            for col in range(1, worksheet.max_column + 1):
+                cell_value = worksheet.cell(row=1, column=col).value
+                logger.debug('  Columna %s: %s', col, cell_value)
+    
+    # Autoajustar columnas
+    for column in worksheet.columns:
+        max_length = max(len(str(cell.value)) for cell in column)
+        adjusted_width = (max_length + 2) * 1.1
+        worksheet.column_dimensions[get_column_letter(column[0].column)].width = adjusted_width
+    
+    # Agregar información adicional
+    info_row = worksheet.max_row + 2
+    worksheet.cell(row=info_row, column=1, value="Fecha:").font = Font(bold=True)
+    worksheet.cell(row=info_row, column=2, value=datetime.now().strftime('%d/%m/%Y %H:%M:%S'))
+    
+    worksheet.cell(row=info_row+1, column=1, value="Archivo origen:").font = Font(bold=True)
+    worksheet.cell(row=info_row+1, column=2, value=nombre_archivo)
+    
+    worksheet.cell(row=info_row+2, column=1, value="País:").font = Font(bold=True)
+    worksheet.cell(row=info_row+2, column=2, value=pais)
+    
+    # Agregar leyenda del semáforo
+    worksheet.cell(row=info_row+4, column=1, value="Leyenda Semáforo:").font = Font(bold=True)
+    worksheet.cell(row=info_row+5, column=1, value="Verde: 0%-15%").fill = verde_fill
+    worksheet.cell(row=info_row+5, column=1).font = semaforo_font
+    worksheet.cell(row=info_row+6, column=1, value="Amarillo: >15%").fill = amarillo_fill
+    worksheet.cell(row=info_row+6, column=1).font = semaforo_font
+    worksheet.cell(row=info_row+7, column=1, value="Rojo: <0%").fill = rojo_fill
+    worksheet.cell(row=info_row+7, column=1).font = semaforo_font
+    worksheet.cell(row=info_row+8, column=1, value="Gris: Sin capacidad definida").fill = gris_fill
+    worksheet.cell(row=info_row+8, column=1).font = semaforo_font
+    
+    output.close()
+    return buffer.getvalue()
+
+@instrumentacion.etapa("excel_mvp")
+def exportar_mvp_excel_con_colores(tabla_mvp: pd.DataFrame, columnas_real: List[str], columnas_optimo: List[str], pais: str = "Guatemala",
+                                   matriz_semaforo: Optional[np.ndarray] = None) -> bytes:
+    """
+    Exporta la tabla MVP a Excel con formato profesional y colores de semáforo.
+    Reutiliza la matriz de semáforo de la vista si se recibe; si no, la calcula.
+    """
+    try:
+        if matriz_semaforo is None:
+            matriz_semaforo = calcular_matriz_semaforo_mvp(tabla_mvp, columnas_real, columnas_optimo)
+        
+        from io import BytesIO
+        from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+        from openpyxl.utils import get_column_letter
+        
+        # Crear archivo Excel en memoria
+        output = BytesIO()
+        
+        # Resetear índice para tener las columnas de información como columnas normales
+        df_export = tabla_mvp.reset_index()
+
+        # Renombrar columnas de información
+        columnas_info = ['Código', 'Codigo_SAP', 'Segmento', 'Silueta', 'Colección', 'Descripción', 'Talla']
+        df_export.columns = columnas_info + list(df_export.columns[7:])
+
+        # Agregar columnas de Necesidad (Real - Óptimo) y Despacho para cada bodega
+        # Primero, obtener lista de bodegas desde columnas_real
+        bodegas_list = [col.replace('Real ', '') for col in columnas_real]
+
+        # Crear nuevo DataFrame con columnas reorganizadas (Real, Óptimo, Necesidad, Despacho por cada bodega)
+        columnas_nuevas = columnas_info.copy()
+        for bodega in bodegas_list:
+            col_real = f'Real {bodega}'
+            col_optimo = f'Óptimo {bodega}'
+            col_necesidad = f'Necesidad {bodega}'
+            col_despacho = f'Despacho {bodega}'
+
+            # Calcular Necesidad = Real - Óptimo
+            if col_real in df_export.columns and col_optimo in df_export.columns:
+                df_export[col_necesidad] = df_export[col_real] - df_export[col_optimo]
+
+            # Agregar columna Despacho vacía
+            df_export[col_despacho] = ''
+
+            columnas_nuevas.extend([col_real, col_optimo, col_necesidad, col_despacho])
+
+        # Reordenar columnas
+        df_export = df_export[columnas_nuevas]
+
+        # Crear workbook y worksheet
+        sheet_name = f'MVP_{pais}'
+        with pd.ExcelWriter(output, engine='openpyxl') as writer:
+            df_export.to_excel(writer, sheet_name=sheet_name, index=False)
+            
+            # Obtener worksheet para formatear
+            worksheet = writer.sheets[sheet_name]
+            
+            # Ocultar líneas de cuadrícula en celdas no utilizadas
+            worksheet.sheet_view.showGridLines = False
+            
+            # Configurar estilos
+            # Fuentes
+            font_header = Font(name='Arial', size=11, bold=True, color='FFFFFF')
+            font_subheader = Font(name='Arial', size=10, bold=True, color='FFFFFF')
+            font_normal = Font(name='Arial', size=10)
+            font_total = Font(name='Arial', size=10, bold=True, color='FFFFFF')
+            
+            # Alineación
+            align_center = Alignment(horizontal='center', vertical='center')
+            align_left = Alignment(horizontal='left', vertical='center')
+            
+            # Colores de fondo
+            fill_header = PatternFill(start_color='000000', end_color='000000', fill_type='solid')
+            fill_subheader_real = PatternFill(start_color='28A745', end_color='28A745', fill_type='solid')  # Verde
+            fill_subheader_optimo = PatternFill(start_color='007BFF', end_color='007BFF', fill_type='solid')  # Azul
+            fill_total = PatternFill(start_color='000000', end_color='000000', fill_type='solid')
+            
+            # Colores semáforo
+            fill_semaforo_verde = PatternFill(start_color='D4EDDA', end_color='D4EDDA', fill_type='solid')
+            fill_semaforo_amarillo = PatternFill(start_color='FFF3CD', end_color='FFF3CD', fill_type='solid')
+            fill_semaforo_rojo = PatternFill(start_color='F8D7DA', end_color='F8D7DA', fill_type='solid')
+            fill_optimo = PatternFill(start_color='F8F9FA', end_color='F8F9FA', fill_type='solid')
+            # Relleno por código de semáforo (0 = verde, 1 = amarillo, 2 = rojo)
+            fills_semaforo = [fill_semaforo_verde, fill_semaforo_amarillo, fill_semaforo_rojo]
+            
+            # Bordes
+            border = Border(
+                left=Side(style='thin'),
+                right=Side(style='thin'),
+                top=Side(style='thin'),
+                bottom=Side(style='thin')
+            )
+            
+            # Obtener bodegas y crear mapeo de columnas
+            bodegas = []
+            col_mapping = {}
+            col_idx = 8  # Las primeras 7 son información (Código, Codigo_SAP, Segmento, Silueta, Colección, Descripción, Talla)
+
+            for col_real in columnas_real:
+                bodega = col_real.replace('Real ', '')
+                bodegas.append(bodega)
+                col_mapping[col_real] = col_idx
+                col_mapping[f'Óptimo {bodega}'] = col_idx + 1
+                col_mapping[f'Necesidad {bodega}'] = col_idx + 2
+                col_mapping[f'Despacho {bodega}'] = col_idx + 3
+                col_idx += 4  # Ahora son 4 columnas por bodega: Real, Óptimo, Necesidad, Despacho
+            
+            # 1. FORMATEAR ENCABEZADOS PRINCIPALES
+            # Fila 1: Información + Bodegas
+            for col_num in range(1, 8):  # Columnas de información (incluye Codigo_SAP)
+                cell = worksheet.cell(row=1, column=col_num)
+                cell.font = font_header
+                cell.fill = fill_header
+                cell.alignment = align_center
+                cell.border = border
+            
+            # Agregar encabezados de bodegas (fusionar celdas para Real + Óptimo + Necesidad + Despacho)
+            for i, bodega in enumerate(bodegas):
+                start_col = 8 + (i * 4)  # Ahora son 4 columnas por bodega
+                end_col = start_col + 3  # Abarcar 4 columnas
+
+                # Fusionar celdas para la bodega
+                worksheet.merge_cells(start_row=1, start_column=start_col, end_row=1, end_column=end_col)
+
+                # Formatear celda fusionada
+                cell = worksheet.cell(row=1, column=start_col)
+                cell.value = bodega
+                cell.font = font_header
+                cell.fill = fill_header
+                cell.alignment = align_center
+                cell.border = border
+
+                # Aplicar bordes a la celda fusionada
+                for col in range(start_col, end_col + 1):
+                    worksheet.cell(row=1, column=col).border = border
+            
+            # 2. AGREGAR FILA DE SUB-ENCABEZADOS (Real / Óptimo)
+            worksheet.insert_rows(2)
+            
+            # Sub-encabezados para información (vacíos)
+            for col_num in range(1, 8):
+                cell = worksheet.cell(row=2, column=col_num)
+                cell.font = font_subheader
+                cell.fill = fill_header
+                cell.alignment = align_center
+                cell.border = border
+            
+            # Color de fondo para columna Necesidad y Despacho
+            fill_subheader_necesidad = PatternFill(start_color='6C757D', end_color='6C757D', fill_type='solid')  # Gris
+            fill_subheader_despacho = PatternFill(start_color='FFC107', end_color='FFC107', fill_type='solid')  # Amarillo/Naranja
+
+            # Sub-encabezados Real/Óptimo/Necesidad/Despacho
+            for i, bodega in enumerate(bodegas):
+                start_col = 8 + (i * 4)  # Ahora son 4 columnas por bodega
+
+                # Columna Real
+                cell_real = worksheet.cell(row=2, column=start_col)
+                cell_real.value = "Real"
+                cell_real.font = font_subheader
+                cell_real.fill = fill_subheader_real
+                cell_real.alignment = align_center
+                cell_real.border = border
+
+                # Columna Óptimo
+                cell_optimo = worksheet.cell(row=2, column=start_col + 1)
+                cell_optimo.value = "Óptimo"
+                cell_optimo.font = font_subheader
+                cell_optimo.fill = fill_subheader_optimo
+                cell_optimo.alignment = align_center
+                cell_optimo.border = border
+
+                # Columna Necesidad
+                cell_necesidad = worksheet.cell(row=2, column=start_col + 2)
+                cell_necesidad.value = "Necesidad"
+                cell_necesidad.font = font_subheader
+                cell_necesidad.fill = fill_subheader_necesidad
+                cell_necesidad.alignment = align_center
+                cell_necesidad.border = border
+
+                # Columna Despacho
+                cell_despacho = worksheet.cell(row=2, column=start_col + 3)
+                cell_despacho.value = "Despacho"
+                cell_despacho.font = font_subheader
+                cell_despacho.fill = fill_subheader_despacho
+                cell_despacho.alignment = align_center
+                cell_despacho.border = border
+            
+            # 3. FORMATEAR DATOS Y APLICAR SEMÁFORO
+            total_rows = worksheet.max_row
+            
+            for row_num in range(3, total_rows + 1):  # Empezar desde fila 3 (datos)
+                # Verificar si es fila TOTAL
+                codigo_cell = worksheet.cell(row=row_num, column=1)
+                es_fila_total = str(codigo_cell.value) == 'TOTAL'
+                
+                # Formatear columnas de información
+                for col_num in range(1, 8):  # Corregido: incluir las 7 columnas de información
+                    cell = worksheet.cell(row=row_num, column=col_num)
+                    
+                    if es_fila_total:
+                        cell.font = font_total
+                        cell.fill = fill_total
+                    else:
+                        cell.font = font_normal
+                    
+                    # Alineación según tipo de columna
+                    if col_num in [5, 6]:  # Colección y Descripción (columnas E y F)
+                        cell.alignment = align_left
+                    else:
+                        cell.alignment = align_center
+                    
+                    cell.border = border
+                
+                # Formatear columnas de bodegas con semáforo
+                for i, bodega in enumerate(bodegas):
+                    col_real = 8 + (i * 4)  # Ahora son 4 columnas por bodega
+                    col_optimo = col_real + 1
+                    col_necesidad = col_real + 2
+                    col_despacho = col_real + 3
+
+                    cell_real = worksheet.cell(row=row_num, column=col_real)
+                    cell_optimo = worksheet.cell(row=row_num, column=col_optimo)
+                    cell_necesidad = worksheet.cell(row=row_num, column=col_necesidad)
+                    cell_despacho = worksheet.cell(row=row_num, column=col_despacho)
+
+                    if es_fila_total:
+                        # Fila TOTAL: fondo negro
+                        cell_real.font = font_total
+                        cell_real.fill = fill_total
+                        cell_optimo.font = font_total
+                        cell_optimo.fill = fill_total
+                        cell_necesidad.font = font_total
+                        cell_necesidad.fill = fill_total
+                        cell_despacho.font = font_total
+                        cell_despacho.fill = fill_total
+
+                        # Fórmulas SUBTOTALES (109 = SUMA ignorando filtros)
+                        # La fórmula abarca desde fila 3 hasta la fila anterior al TOTAL
+                        col_letter_real = get_column_letter(col_real)
+                        col_letter_optimo = get_column_letter(col_optimo)
+                        col_letter_necesidad = get_column_letter(col_necesidad)
+
+                        cell_real.value = f'=SUBTOTAL(109,{col_letter_real}3:{col_letter_real}{row_num - 1})'
+                        cell_optimo.value = f'=SUBTOTAL(109,{col_letter_optimo}3:{col_letter_optimo}{row_num - 1})'
+                        cell_necesidad.value = f'=SUBTOTAL(109,{col_letter_necesidad}3:{col_letter_necesidad}{row_num - 1})'
+                        cell_despacho.value = ''  # Columna Despacho vacía en TOTAL
+                    else:
+                        # Datos normales: aplicar semáforo solo a columna Real
+                        try:
+                            valor_real = float(str(cell_real.value).replace(',', '')) if cell_real.value else 0
+                            valor_optimo = float(str(cell_optimo.value).replace(',', '')) if cell_optimo.value else 0
+
+                            # Aplicar semáforo a columna Real (fila de datos = fila de la tabla MVP)
+                            cell_real.fill = fills_semaforo[matriz_semaforo[row_num - 3, i]]
+
+                            # Columna Óptimo: fondo gris claro
+                            cell_optimo.fill = fill_optimo
+
+                            # Columna Necesidad: calcular REAL - ÓPTIMO
+                            necesidad = int(valor_real - valor_optimo)
+                            cell_necesidad.value = necesidad
+                            cell_necesidad.fill = fill_optimo  # Fondo gris claro
+
+                            # Columna Despacho: vacía con fondo gris claro
+                            cell_despacho.value = ''
+                            cell_despacho.fill = fill_optimo
+
+                        except:
+                            # En caso de error, usar colores por defecto
+                            cell_necesidad.value = 0
+                            cell_necesidad.fill = fill_optimo
+                            cell_despacho.value = ''
+                            cell_despacho.fill = fill_optimo
+
+                        cell_real.font = font_normal
+                        cell_optimo.font = font_normal
+                        cell_necesidad.font = font_normal
+                        cell_despacho.font = font_normal
+
+                    cell_real.alignment = align_center
+                    cell_optimo.alignment = align_center
+                    cell_necesidad.alignment = align_center
+                    cell_despacho.alignment = align_center
+                    cell_real.border = border
+                    cell_optimo.border = border
+                    cell_necesidad.border = border
+                    cell_despacho.border = border
+
+                    # Aplicar formato de miles a columnas numéricas
+                    cell_real.number_format = '#,##0'
+                    cell_optimo.number_format = '#,##0'
+                    cell_necesidad.number_format = '#,##0'
+            
+            # 4. AGREGAR FILAS DE MÉTRICAS (FALTANTE y % CUMPLIMIENTO)
+            # Fila FALTANTE (suma de valores negativos de Necesidad); queda una fila vacía después de TOTAL
+            fila_faltante = total_rows + 2
+            cell_label_faltante = worksheet.cell(row=fila_faltante, column=1, value="FALTANTE")
+            cell_label_faltante.font = Font(name='Arial', size=10, bold=True)
+            cell_label_faltante.alignment = align_left
+
+            # Fila % CUMPLIMIENTO
+            fila_cumplimiento = total_rows + 3
+            cell_label_cumplimiento = worksheet.cell(row=fila_cumplimiento, column=1, value="% CUMPLIMIENTO")
+            cell_label_cumplimiento.font = Font(name='Arial', size=10, bold=True)
+            cell_label_cumplimiento.alignment = align_left
+
+            # Agregar fórmulas para cada bodega
+            for i, bodega in enumerate(bodegas):
+                col_real = 8 + (i * 4)  # Ahora son 4 columnas por bodega
+                col_optimo = col_real + 1
+                col_necesidad = col_real + 2
+                col_despacho = col_real + 3
+
+                col_letter_real = get_column_letter(col_real)
+                col_letter_optimo = get_column_letter(col_optimo)
+                col_letter_necesidad = get_column_letter(col_necesidad)
+
+                # Celda FALTANTE: suma de valores negativos de columna Necesidad (en columna Necesidad)
+                cell_faltante = worksheet.cell(row=fila_faltante, column=col_necesidad)
+                cell_faltante.value = f'=SUMIF({col_letter_necesidad}3:{col_letter_necesidad}{total_rows - 1},"<0")'
+                cell_faltante.font = Font(name='Arial', size=10, bold=True, color='FF0000')
+                cell_faltante.alignment = align_center
+                cell_faltante.border = border
+                cell_faltante.number_format = '#,##0'
+
+                # Celda % CUMPLIMIENTO: (Celdas verdes / Total celdas) (en columna Necesidad)
+                # Lógica del semáforo:
+                # - Verde: (Real >= Óptimo Y Óptimo > 0) O (Óptimo = 0 Y Real >= 0)
+                # - Total: todas las celdas
+                cell_cumplimiento = worksheet.cell(row=fila_cumplimiento, column=col_necesidad)
+                rango_real = f'{col_letter_real}3:{col_letter_real}{total_rows - 1}'
+                rango_optimo = f'{col_letter_optimo}3:{col_letter_optimo}{total_rows - 1}'
+                # Fórmula: Celdas verdes / Total celdas
+                # Verde = (Real >= Óptimo Y Óptimo > 0) + (Óptimo = 0 Y Real >= 0)
+                # Como Real siempre es >= 0, cuando Óptimo = 0 siempre es verde
+                formula_verde = f'SUMPRODUCT((({rango_real}>={rango_optimo})*({rango_optimo}>0)+({rango_optimo}=0))*1)'
+                formula_total = f'COUNTA({rango_real})'
+                cell_cumplimiento.value = f'=IF({formula_total}>0,{formula_verde}/{formula_total},0)'
+                cell_cumplimiento.font = Font(name='Arial', size=10, bold=True, color='0066CC')
+                cell_cumplimiento.alignment = align_center
+                cell_cumplimiento.border = border
+                cell_cumplimiento.number_format = '0.0%'
+
+            # 5. AJUSTAR ANCHOS DE COLUMNAS
+            # Columnas de información
+            column_widths = {
+                'A': 15,  # Código (aumentado para "% CUMPLIMIENTO")
+                'B': 12,  # Codigo_SAP
+                'C': 12,  # Segmento
+                'D': 12,  # Silueta
+                'E': 20,  # Colección
+                'F': 25,  # Descripción
+                'G': 8,   # Talla
+            }
+
+            for col_letter, width in column_widths.items():
+                worksheet.column_dimensions[col_letter].width = width
+
+            # Columnas de bodegas (más estrechas) - ahora empiezan desde columna 8
+            # Ahora son 4 columnas por bodega: Real, Óptimo, Necesidad, Despacho
+            for i in range(len(bodegas) * 4):
+                col_letter = get_column_letter(8 + i)
+                worksheet.column_dimensions[col_letter].width = 10
+
+            # 6. AGREGAR INFORMACIÓN DE LEYENDA
+            leyenda_row = total_rows + 6
+            
+            # Título de leyenda
+            worksheet.cell(row=leyenda_row, column=1, value="LEYENDA DEL SEMÁFORO (Solo columna Real):")
+            worksheet.cell(row=leyenda_row, column=1).font = Font(name='Arial', size=11, bold=True)
+            
+            # Elementos de leyenda
+            leyenda_items = [
+                ("Verde: Stock real >= Stock óptimo", fill_semaforo_verde),
+                ("Amarillo: Stock real entre 80%-99% del óptimo", fill_semaforo_amarillo), 
+                ("Rojo: Stock real < 80% del óptimo", fill_semaforo_rojo)
+            ]
+            
+            for i, (texto, fill) in enumerate(leyenda_items):
+                row = leyenda_row + i + 1
+                cell = worksheet.cell(row=row, column=1, value=texto)
+                cell.font = Font(name='Arial', size=10)
+                cell.fill = fill
+                cell.border = border
+
+            # 7. AGREGAR TABLA RESUMEN POR BODEGA
+            # Ubicar tabla resumen después de la leyenda (con espacio de separación)
+            tabla_resumen_row = leyenda_row + 6  # 2 filas de espacio después de la leyenda
+
+            # Título de la tabla resumen
+            cell_titulo_resumen = worksheet.cell(row=tabla_resumen_row, column=1, value="TABLA RESUMEN POR BODEGA")
+            cell_titulo_resumen.font = Font(name='Arial', size=12, bold=True, color='FFFFFF')
+            cell_titulo_resumen.fill = PatternFill(start_color='000000', end_color='000000', fill_type='solid')
+            cell_titulo_resumen.alignment = align_center
+            worksheet.merge_cells(start_row=tabla_resumen_row, start_column=1, end_row=tabla_resumen_row, end_column=3)
+            for col in range(1, 4):
+                worksheet.cell(row=tabla_resumen_row, column=col).border = border
+
+            # Encabezados de la tabla resumen
+            headers_resumen = ['Bodega', 'FALTANTE', '% CUMPLIMIENTO']
+            header_row_resumen = tabla_resumen_row + 1
+
+            for col_idx, header in enumerate(headers_resumen, start=1):
+                cell = worksheet.cell(row=header_row_resumen, column=col_idx, value=header)
+                cell.font = Font(name='Arial', size=10, bold=True, color='FFFFFF')
+                cell.fill = PatternFill(start_color='333333', end_color='333333', fill_type='solid')
+                cell.alignment = align_center
+                cell.border = border
+
+            # Datos de la tabla resumen (una fila por bodega)
+            for i, bodega in enumerate(bodegas):
+                data_row = header_row_resumen + 1 + i
+                col_necesidad = 8 + (i * 4) + 2  # Columna Necesidad de esta bodega (ahora son 4 columnas por bodega)
+                col_letter_necesidad = get_column_letter(col_necesidad)
+
+                # Columna 1: Nombre de la bodega
+                cell_bodega = worksheet.cell(row=data_row, column=1, value=bodega)
+                cell_bodega.font = Font(name='Arial', size=10, bold=True)
+                cell_bodega.alignment = align_left
+                cell_bodega.border = border
+
+                # Columna 2: FALTANTE (referencia a la celda ya calculada)
+                cell_faltante_resumen = worksheet.cell(row=data_row, column=2)
+                cell_faltante_resumen.value = f'={col_letter_necesidad}{fila_faltante}'
+                cell_faltante_resumen.font = Font(name='Arial', size=10, bold=True, color='FF0000')
+                cell_faltante_resumen.alignment = align_center
+                cell_faltante_resumen.border = border
+                cell_faltante_resumen.number_format = '#,##0'
+
+                # Columna 3: % CUMPLIMIENTO (referencia a la celda ya calculada)
+                cell_cumplimiento_resumen = worksheet.cell(row=data_row, column=3)
+                cell_cumplimiento_resumen.value = f'={col_letter_necesidad}{fila_cumplimiento}'
+                cell_cumplimiento_resumen.font = Font(name='Arial', size=10, bold=True, color='0066CC')
+                cell_cumplimiento_resumen.alignment = align_center
+                cell_cumplimiento_resumen.border = border
+                cell_cumplimiento_resumen.number_format = '0.0%'
+
+            # Fila TOTAL de la tabla resumen
+            total_row_resumen = header_row_resumen + 1 + len(bodegas)
+
+            # Columna 1: Etiqueta "TOTAL"
+            cell_total_label = worksheet.cell(row=total_row_resumen, column=1, value="TOTAL")
+            cell_total_label.font = Font(name='Arial', size=11, bold=True, color='FFFFFF')
+            cell_total_label.fill = PatternFill(start_color='000000', end_color='000000', fill_type='solid')
+            cell_total_label.alignment = align_center
+            cell_total_label.border = border
+
+            # Columna 2: TOTAL FALTANTE (suma de todos los faltantes)
+            primera_fila_datos = header_row_resumen + 1
+            ultima_fila_datos = header_row_resumen + len(bodegas)
+            cell_total_faltante = worksheet.cell(row=total_row_resumen, column=2)
+            cell_total_faltante.value = f'=SUM(B{primera_fila_datos}:B{ultima_fila_datos})'
+            cell_total_faltante.font = Font(name='Arial', size=11, bold=True, color='FFFFFF')
+            cell_total_faltante.fill = PatternFill(start_color='C00000', end_color='C00000', fill_type='solid')
+            cell_total_faltante.alignment = align_center
+            cell_total_faltante.border = border
+            cell_total_faltante.number_format = '#,##0'
+
+            # Columna 3: TOTAL % CUMPLIMIENTO (celdas verdes / total celdas de columnas Real)
+            # Construir fórmula que abarque todas las columnas Real y Óptimo
+            partes_numerador = []
+            partes_denominador = []
+
+            for i in range(len(bodegas)):
+                col_real = 8 + (i * 4)  # Ahora son 4 columnas por bodega
+                col_optimo = col_real + 1
+                col_letter_real = get_column_letter(col_real)
+                col_letter_optimo = get_column_letter(col_optimo)
+
+                rango_real = f'{col_letter_real}3:{col_letter_real}{total_rows - 1}'
+                rango_optimo = f'{col_letter_optimo}3:{col_letter_optimo}{total_rows - 1}'
+
+                # Numerador: celdas verdes (Real >= Óptimo AND Óptimo > 0) OR (Óptimo = 0 AND Real >= 0)
+                # Como Real siempre es >= 0, cuando Óptimo = 0 siempre es verde
+                parte_verde = f'SUMPRODUCT((({rango_real}>={rango_optimo})*({rango_optimo}>0)+({rango_optimo}=0))*1)'
+                partes_numerador.append(parte_verde)
+
+                # Denominador: total de celdas en columna Real
+                parte_total = f'COUNTA({rango_real})'
+                partes_denominador.append(parte_total)
+
+            formula_numerador = '+'.join(partes_numerador)
+            formula_denominador = '+'.join(partes_denominador)
+            formula_total_cumplimiento = f'=IF(({formula_denominador})>0,({formula_numerador})/({formula_denominador}),0)'
+
+            cell_total_cumplimiento = worksheet.cell(row=total_row_resumen, column=3)
+            cell_total_cumplimiento.value = formula_total_cumplimiento
+            cell_total_cumplimiento.font = Font(name='Arial', size=11, bold=True, color='FFFFFF')
+            cell_total_cumplimiento.fill = PatternFill(start_color='0066CC', end_color='0066CC', fill_type='solid')
+            cell_total_cumplimiento.alignment = align_center
+            cell_total_cumplimiento.border = border
+            cell_total_cumplimiento.number_format = '0.0%'
+
+            # Ajustar anchos de columnas para la tabla resumen
+            worksheet.column_dimensions['A'].width = 25  # Bodega necesita más espacio
+            worksheet.column_dimensions['B'].width = 15  # FALTANTE
+            worksheet.column_dimensions['C'].width = 18  # % CUMPLIMIENTO
+
+        # Retornar datos del archivo
+        output.seek(0)
+        return output.getvalue()
+        
+    except Exception as e:
+        notificador.error(f"Error al generar Excel: {str(e)}")
+        return None
+
+# ============================================================================
+# API del motor: uso sin interfaz (procesos por lotes, perfiles, benchmarks)
+# ============================================================================
+
+# Países del tablero: clave del archivo de stock en nombres_permitidos y procesador de MVPs.
+# Puerto Rico solo tiene vista de MVPs (sin tabla consolidada ni ventas).
+PAISES_MOTOR = {
+    "Guatemala": {"archivo": "GUATEMALA", "ventas": "GUATEMALA", "mvps": procesar_stock_mvps_guatemala, "etiqueta_mvp": "Guatemala"},
+    "El Salvador": {"archivo": "EL_SALVADOR", "ventas": "EL_SALVADOR", "mvps": procesar_stock_mvps_elsalvador, "etiqueta_mvp": "ElSalvador"},
+    "Honduras": {"archivo": "HONDURAS", "ventas": "HONDURAS", "mvps": procesar_stock_mvps_honduras, "etiqueta_mvp": "Honduras"},
+    "Costa Rica": {"archivo": "COSTA_RICA", "ventas": "COSTA_RICA", "mvps": procesar_stock_mvps_costarica, "etiqueta_mvp": "CostaRica"},
+    "PANAMA": {"archivo": "PANAMA", "ventas": "PANAMA", "mvps": procesar_stock_mvps_panama, "etiqueta_mvp": "Panama"},
+    "Puerto Rico": {"archivo": "PUERTO_RICO_TEMP", "ventas": None, "mvps": procesar_stock_mvps_puerto_rico, "etiqueta_mvp": "Puerto Rico"},
+}
+
+def _datos_pais(pais: str) -> Dict[str, Any]:
+    if pais not in PAISES_MOTOR:
+        raise ValueError(f"País no soportado: {pais}. Opciones: {list(PAISES_MOTOR)}")
+    return PAISES_MOTOR[pais]
+
+def cargar_stock(ruta: str, pais: str) -> pd.DataFrame:
+    """Carga un archivo de stock desde disco igual que la pestaña del país en el tablero"""
+    return data_loader.procesar_archivo_stock(ruta, _datos_pais(pais)["archivo"])
+
+def cargar_ventas(ruta: str, pais: str) -> pd.DataFrame:
+    """Carga un archivo de ventas desde disco igual que la pestaña del país en el tablero"""
+    clave = _datos_pais(pais)["ventas"]
+    if clave is None:
+        raise ValueError(f"{pais} no tiene archivo de ventas")
+    return data_loader.procesar_archivo_ventas(ruta, clave)
+
+def tabla_consolidada(df_stock: pd.DataFrame, pais: str, liga: Optional[str] = None,
+                      df_ventas: Optional[pd.DataFrame] = None) -> Optional[pd.DataFrame]:
+    """Tabla consolidada bodega × liga (con columnas de ventas si se pasa df_ventas)"""
+    _datos_pais(pais)
+    return data_processor.procesar_datos_consolidados(df_stock, pais, liga, df_ventas)
+
+def tabla_solo_ventas(df_ventas: pd.DataFrame, pais: str, liga: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """Tabla de cantidades vendidas por bodega cuando no hay archivo de stock"""
+    _datos_pais(pais)
+    return data_processor.procesar_solo_ventas_pais(df_ventas, pais, liga)
+
+def tabla_mvps(df_stock: pd.DataFrame, pais: str) -> pd.DataFrame:
+    """Tabla de stock real vs óptimo de los MVPs del país"""
+    _datos_pais(pais)
+    return data_processor.obtener_tabla_mvps(df_stock, pais)
+
+def actualizar_stock_con_delta(df_stock: pd.DataFrame, contenido_delta: bytes, pais: str) -> pd.DataFrame:
+    """
+    Aplica un delta de stock (filas cambiadas por Bodega y Codigo_SAP) y deja en cache la tabla
+    consolidada y la de MVPs del resultado, actualizadas solo donde el delta las afecta
+    """
+    df_nuevo, delta = data_loader.aplicar_delta_stock(df_stock, contenido_delta, _datos_pais(pais)["archivo"])
+    data_processor.aplicar_delta_stock(df_stock, df_nuevo, delta, pais)
+    return df_nuevo
+
+def aplicar_delta(df_stock: pd.DataFrame, ruta: str, pais: str) -> pd.DataFrame:
+    """Aplica un archivo delta desde disco sobre un stock cargado con cargar_stock"""
+    with open(ruta, 'rb') as archivo:
+        contenido = archivo.read()
+    return actualizar_stock_con_delta(df_stock, contenido, pais)
+
+# ============================================================================
+# Vista regional: todos los países en paralelo (un proceso por país)
+# ============================================================================
+
+def _procesar_pais_regional(pais: str, stock: Optional[OrigenArchivo], ventas: Optional[OrigenArchivo],
+                            deltas: Tuple[bytes, ...] = ()) -> Dict[str, Any]:
+    """
+    Lee los archivos de un país (aplicando en orden los deltas de stock) y calcula su tabla
+    consolidada (con ventas) y su tabla de MVPs.
+    Se ejecuta en un proceso del pool; la tabla consolidada queda guardada como precalculada
+    para que la pestaña del país la muestre sin recalcular.
+    """
+    inicio = time.time()
+    datos = _datos_pais(pais)
+    resultado = {'pais': pais, 'tabla': None, 'tabla_mvp': None, 'error': None}
+    
+    try:
+        df_stock = None
+        df_ventas = None
+        if stock is not None:
+            df_stock = data_loader.procesar_archivo_stock(stock, datos['archivo'])
+            for contenido_delta in deltas:
+                df_stock = actualizar_stock_con_delta(df_stock, contenido_delta, pais)
+        if ventas is not None and datos['ventas'] is not None:
+            df_ventas = data_loader.procesar_archivo_ventas(ventas, datos['ventas'])
+        
+        if df_stock is not None and datos['ventas'] is not None:
+            tabla = data_processor.procesar_datos_consolidados(df_stock, pais, None, df_ventas)
+            if tabla is not None:
+                data_processor.guardar_tabla_precalculada(tabla, pais, None, obtener_huella_dataframe(df_stock),
+                                                          obtener_huella_dataframe(df_ventas))
+            resultado['tabla'] = tabla
+        
+        if df_stock is not None:
+            resultado['tabla_mvp'] = data_processor.obtener_tabla_mvps(df_stock, pais)
+    
+    except Exception as e:
+        logger.exception('Error procesando %s para la vista regional', pais)
+        resultado['error'] = str(e)
+    
+    resultado['segundos'] = round(time.time() - inicio, 2)
+    return resultado
+
+def _iniciar_proceso_regional(configuracion: StockAnalysisConfig, directorio_cache_cargas: str,
+                              directorio_tablas: str) -> None:
+    """
+    Prepara un proceso del pool regional. Los procesos arrancan limpios (forkserver o spawn, nunca
+    una copia del servidor de Streamlit), así que reciben la configuración y las carpetas de cache
+    del proceso principal y notifican solo al log con el Notificador base.
+    """
+    global DIRECTORIO_CACHE_CARGAS, DIRECTORIO_TABLAS_PRECALCULADAS
+    vars(config).update(vars(configuracion))
+    DIRECTORIO_CACHE_CARGAS = directorio_cache_cargas
+    DIRECTORIO_TABLAS_PRECALCULADAS = directorio_tablas
+    configurar_notificador(Notificador())
+
+def _contexto_procesos_regionales():
+    """
+    forkserver donde exista (con el motor precargado, cada proceso nace sin volver a importar pandas);
+    si no, spawn. fork no: copiaría un proceso con varios hilos (el servidor de Streamlit), con sus
+    locks tomados por otros hilos y el notificador de la interfaz instalado.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        contexto = multiprocessing.get_context("forkserver")
+        # Sin '__main__': el servidor de procesos no vuelve a ejecutar el script principal (ppp.py)
+        contexto.set_forkserver_preload([__name__])
+        return contexto
+    return multiprocessing.get_context("spawn")
+
+@contextmanager
+def _sin_script_principal():
+    """
+    Oculta el script principal mientras se crean los procesos del pool: con forkserver o spawn cada
+    proceso volvería a ejecutarlo, y en el tablero Streamlit instala ppp.py como __main__
+    """
+    principal = sys.modules.get('__main__')
+    sys.modules['__main__'] = types.ModuleType('__main__')
+    try:
+        yield
+    finally:
+        sys.modules['__main__'] = principal
+
+def resumen_pais_regional(resultado: Dict[str, Any]) -> Dict[str, Any]:
+    """Fila del resumen regional a partir de la tabla consolidada y la tabla de MVPs de un país"""
+    fila = {'País': resultado['pais']}
+    tabla = resultado.get('tabla')
+    
+    if tabla is not None and not tabla.empty:
+        es_total = tabla[('INFO', 'INFO', 'Bodega')] == 'TOTAL'
+        totales = tabla[es_total].iloc[0]
+        
+        def total_resumen(nombre):
+            columna = ('TOTALES', 'RESUMEN', nombre)
+            return float(pd.to_numeric(totales.get(columna, 0), errors='coerce') or 0)
+        
+        def total_por_tipo(tipo):
+            columnas = [col for col in tabla.columns if col[2] == tipo]
+            return float(pd.to_numeric(totales[columnas], errors='coerce').fillna(0).sum()) if columnas else 0.0
+        
+        fila['Tiendas'] = int((~es_total).sum())
+        fila['Total Stock'] = total_resumen('TOTAL STOCK')
+        fila['Total Headwear'] = total_resumen('TOTAL HEADWEAR')
+        fila['Capacidad en Tienda'] = total_resumen('CAPACIDAD EN TIENDA')
+        fila['Total (USD)'] = total_resumen('TOTAL (USD)')
+        fila['Ventas'] = total_por_tipo('Ventas')
+        fila['Ventas (USD)'] = total_por_tipo('Ventas (USD)')
+    
+    tabla_mvp = resultado.get('tabla_mvp')
+    if tabla_mvp is not None and not tabla_mvp.empty:
+        columnas_real = [col for col in tabla_mvp.columns if col.startswith('Real ')]
+        columnas_optimo = [col for col in tabla_mvp.columns if col.startswith('Óptimo ')]
+        es_total_mvp = np.asarray(tabla_mvp.index.get_level_values(0) == 'TOTAL', dtype=bool)
+        fila['MVP Stock Real'] = float(tabla_mvp.loc[es_total_mvp, columnas_real].to_numpy(dtype=float).sum())
+        fila['MVP Stock Óptimo'] = float(tabla_mvp.loc[es_total_mvp, columnas_optimo].to_numpy(dtype=float).sum())
+        
+        contadores = contar_celdas_semaforo_mvp(tabla_mvp, columnas_real, columnas_optimo)
+        celdas_cumplen = contadores['verde'] + contadores['amarillo']
+        total_celdas = celdas_cumplen + contadores['rojo']
+        fila['MVP % Cumplimiento'] = (celdas_cumplen / total_celdas) * 100 if total_celdas > 0 else 0.0
+    
+    fila['Segundos'] = resultado.get('segundos', 0)
+    fila['Error'] = resultado.get('error')
+    return fila
+
+def combinar_resumen_regional(resultados: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Tabla regional: una fila por país (en el orden de PAISES_MOTOR) y la fila REGIÓN con las sumas.
+    El % de cumplimiento usa la misma fórmula que la fila TOTAL de cada país (headwear / capacidad - 100).
+    """
+    orden = {pais: posicion for posicion, pais in enumerate(PAISES_MOTOR)}
+    filas = [resumen_pais_regional(resultado) for resultado in sorted(resultados, key=lambda r: orden.get(r['pais'], len(orden)))]
+    resumen = pd.DataFrame(filas).set_index('País')
+    
+    columnas_suma = [col for col in ['Tiendas', 'Total Stock', 'Total Headwear', 'Capacidad en Tienda', 'Total (USD)',
+                                     'Ventas', 'Ventas (USD)', 'MVP Stock Real', 'MVP Stock Óptimo'] if col in resumen.columns]
+    for columna in columnas_suma:
+        resumen[columna] = pd.to_numeric(resumen[columna], errors='coerce')
+    
+    fila_region = resumen[columnas_suma].sum(min_count=1)
+    # Segundos de la región = el país más lento (los países corren en paralelo)
+    fila_region['Segundos'] = resumen['Segundos'].max() if not resumen.empty else 0
+    resumen.loc['REGIÓN'] = fila_region
+    
+    if 'Capacidad en Tienda' in resumen.columns:
+        capacidad = resumen['Capacidad en Tienda']
+        resumen.insert(resumen.columns.get_loc('Capacidad en Tienda') + 1, '% de Cumplimiento',
+                       ((resumen['Total Headwear'] / capacidad.where(capacidad > 0)) * 100) - 100)
+    
+    return resumen
+
+def procesar_region(entradas: Dict[str, Tuple[Optional[OrigenArchivo], Optional[OrigenArchivo]]],
+                    procesos: Optional[int] = None) -> Tuple[pd.DataFrame, Dict[str, Dict[str, Any]]]:
+    """
+    Procesa varios países en paralelo y arma el resumen regional.
+    
+    entradas: {país de PAISES_MOTOR: (CSV de stock o None, CSV de ventas o None)}, cada archivo como ruta
+    en disco (lo más liviano de enviar a los procesos) o como contenido,
+    opcionalmente con un tercer elemento: la lista de deltas de stock a aplicar en orden.
+    Devuelve (tabla regional, {país: resultado con 'tabla', 'tabla_mvp', 'segundos' y 'error'}).
+    El tiempo total queda cerca del país más lento en lugar de la suma de todos.
+    """
+    for pais in entradas:
+        _datos_pais(pais)
+    if not entradas:
+        return pd.DataFrame(), {}
+    
+    procesos = max(1, min(procesos or os.cpu_count() or 1, len(entradas)))
+    resultados = {}
+    inicio = time.time()
+    
+    with ProcessPoolExecutor(max_workers=procesos, mp_context=_contexto_procesos_regionales(),
+                             initializer=_iniciar_proceso_regional,
+                             initargs=(config, DIRECTORIO_CACHE_CARGAS, DIRECTORIO_TABLAS_PRECALCULADAS)) as pool:
+        # Los procesos se crean al enviar los trabajos
+        with _sin_script_principal():
+            futuros = {
+                pool.submit(_procesar_pais_regional, pais, *archivos): pais
+                for pais, archivos in entradas.items()
+            }
+        for futuro in as_completed(futuros):
+            resultado = futuro.result()
+            resultados[resultado['pais']] = resultado
+            logger.info('Vista regional - %s procesado en %.2fs', resultado['pais'], resultado['segundos'])
+    
+    logger.info('Vista regional completada en %.2fs con %s procesos', time.time() - inicio, procesos)
+    return combinar_resumen_regional(list(resultados.values())), resultados